@@ -10,6 +10,9 @@ var TEAM_MAP_PROP = 'TEAM_MAP'; // Script Properties에 저장된 팀 키 → 
 var LOCK_WAIT_MS = 10000; // 동시 저장 방지를 위한 락 대기 시간
 var PROP_LAST_REVISION_PREFIX = 'LAST_REVISION_'; // 문서별 리비전 키 prefix
 var PROP_LAST_UPDATED_PREFIX = 'LAST_UPDATED_'; // 문서별 최근 동기화 시간
+var BLOCK_INDEX_PREFIX = 'BLOCK_INDEX_'; // 문서+리비전별 파싱된 블록 인덱스 캐시 키 prefix
+var BLOCK_INDEX_TTL_SEC = 600; // 인덱스 캐시 유효 시간(초). 문서를 직접 수정한 경우 최대 이 시간 뒤에 반영
+var BLOCK_INDEX_MAX_CHARS = 90000; // CacheService 값 한도(100KB)를 넘지 않도록 여유를 둔 크기
 var DEFAULT_SCOPE = 'personal';
 var SCOPE_PERSONAL = 'personal';
 var SCOPE_TEAM = 'team';
@@ -101,8 +104,8 @@ function ensureRevisionForDoc(docId) {
   return current;
 }
 
-function bumpRevisionForDoc(docId) {
-  var nextRevision = Utilities.getUuid();
+function bumpRevisionForDoc(docId, nextRevision) {
+  nextRevision = nextRevision || Utilities.getUuid();
   getScriptProperties().setProperty(getRevisionKey(docId), nextRevision);
   return nextRevision;
 }
@@ -183,29 +186,126 @@ function splitBlocks(rawText) {
   return blocks;
 }
 
-// 카테고리 필터가 있으면 해당 블록, 없으면 최신 블록을 선택
-function selectBlock(blocks, categoryFilter) {
-  if (!blocks.length) {
+// ==========================================================
+//  Block Index Cache (docId + revision 단위)
+// ==========================================================
+
+function getBlockIndexKey(docId, revisionId) {
+  return BLOCK_INDEX_PREFIX + (docId || 'default') + '_' + (revisionId || 'init');
+}
+
+function createIndexEntry(block) {
+  return {
+    text: block.text,
+    categories: block.categories,
+    sections: parseHandoffSections(block.text)
+  };
+}
+
+// 최신 블록 + 카테고리별 최신 블록만 남기고 나머지 항목은 버립니다.
+function compactBlockIndex(index) {
+  var used = {};
+  if (index.latest >= 0) used[index.latest] = true;
+  for (var cat in index.byCategory) {
+    if (index.byCategory.hasOwnProperty(cat)) used[index.byCategory[cat]] = true;
+  }
+
+  var remap = {};
+  var entries = [];
+  for (var i = 0; i < index.entries.length; i++) {
+    if (!used[i]) continue;
+    remap[i] = entries.length;
+    entries.push(index.entries[i]);
+  }
+  index.entries = entries;
+  index.latest = index.latest >= 0 ? remap[index.latest] : -1;
+  for (var key in index.byCategory) {
+    if (index.byCategory.hasOwnProperty(key)) index.byCategory[key] = remap[index.byCategory[key]];
+  }
+  return index;
+}
+
+// 블록을 인덱스 끝(최신)에 추가합니다.
+function addBlockToIndex(index, block) {
+  var position = index.entries.length;
+  index.entries.push(createIndexEntry(block));
+  index.latest = position;
+  block.categories.forEach(function(category) {
+    index.byCategory[category] = position;
+  });
+  return index;
+}
+
+function buildBlockIndex(blocks, docName) {
+  var index = { docName: docName || '', entries: [], latest: -1, byCategory: {} };
+  blocks.forEach(function(block) {
+    addBlockToIndex(index, block);
+  });
+  return compactBlockIndex(index);
+}
+
+function readBlockIndex(docId, revisionId) {
+  var raw = CacheService.getScriptCache().get(getBlockIndexKey(docId, revisionId));
+  if (!raw) return null;
+  try {
+    return JSON.parse(raw);
+  } catch (err) {
+    return null;
+  }
+}
+
+function writeBlockIndex(docId, revisionId, index) {
+  var raw = JSON.stringify(index);
+  if (raw.length > BLOCK_INDEX_MAX_CHARS) return false;
+  try {
+    CacheService.getScriptCache().put(getBlockIndexKey(docId, revisionId), raw, BLOCK_INDEX_TTL_SEC);
+    return true;
+  } catch (err) {
+    return false;
+  }
+}
+
+// 캐시된 인덱스를 반환하고, 없으면 문서를 한 번 읽어 새로 만듭니다.
+function loadBlockIndex(context, revisionId) {
+  var cached = readBlockIndex(context.docId, revisionId);
+  if (cached) return cached;
+
+  var doc = DocumentApp.openById(context.docId);
+  var index = buildBlockIndex(splitBlocks(doc.getBody().getText()), doc.getName());
+  writeBlockIndex(context.docId, revisionId, index);
+  return index;
+}
+
+// 이전 리비전의 인덱스에 새로 추가된 블록만 반영해 다음 리비전 키로 저장합니다.
+function extendBlockIndex(docId, revisionIds, blockText, docName) {
+  var index = readBlockIndex(docId, revisionIds.from);
+  if (!index) return false; // 기준 인덱스가 없으면 다음 GET에서 새로 만듭니다.
+  splitBlocks(blockText).forEach(function(block) {
+    addBlockToIndex(index, block);
+  });
+  index.docName = docName || index.docName;
+  return writeBlockIndex(docId, revisionIds.to, compactBlockIndex(index));
+}
+
+// 인덱스에서 블록을 선택: 카테고리 필터가 있으면 그 카테고리의 가장 최근 블록, 없거나 일치하는 블록이 없으면 최신 블록
+function selectIndexedBlock(index, categoryFilter) {
+  if (!index || index.latest < 0) {
     return {
-      block: { text: '', categories: [] },
+      entry: createIndexEntry({ text: '', categories: [] }),
       matchedCategory: ''
     };
   }
 
   var normalizedFilter = normalizeCategoryName(categoryFilter);
-  if (normalizedFilter) {
-    for (var i = blocks.length - 1; i >= 0; i--) {
-      if (blocks[i].categories.indexOf(normalizedFilter) !== -1) {
-        return {
-          block: blocks[i],
-          matchedCategory: normalizedFilter
-        };
-      }
-    }
+  if (normalizedFilter && index.byCategory.hasOwnProperty(normalizedFilter)) {
+    return {
+      entry: index.entries[index.byCategory[normalizedFilter]],
+      matchedCategory: normalizedFilter
+    };
   }
 
   return {
-    block: blocks[blocks.length - 1],
+    entry: index.entries[index.latest],
     matchedCategory: ''
   };
 }
@@ -290,20 +390,19 @@ function parseHandoffSections(blockText) {
 }
 
 function getLatestAsJSON(context, categoryFilter) {
-  var doc = DocumentApp.openById(context.docId);
-  var body = doc.getBody().getText();
-  var blocks = splitBlocks(body);
-  var selection = selectBlock(blocks, categoryFilter);
-  var parsed = parseHandoffSections(selection.block.text);
+  // 리비전이 같으면 문서를 다시 읽지 않고 캐시된 블록 인덱스를 사용합니다.
+  var revisionId = ensureRevisionForDoc(context.docId);
+  var index = loadBlockIndex(context, revisionId);
+  var selection = selectIndexedBlock(index, categoryFilter);
 
-  var meta = getDocumentMeta(context, doc);
-  var result = Object.assign({}, parsed, {
+  var meta = getDocumentMeta(context, null, index.docName);
+  var result = Object.assign({}, selection.entry.sections, {
     parsed_at: new Date().toISOString(),
     revision_id: meta.revisionId,
     last_updated: meta.lastUpdated,
     doc_url: meta.url,
     scope: context.scope,
-    categories: selection.block.categories,
+    categories: selection.entry.categories,
     team_key: context.teamKey || ''
   });
   if (selection.matchedCategory) {
@@ -312,7 +411,8 @@ function getLatestAsJSON(context, categoryFilter) {
   return result;
 }
 
-function appendHandoff(text, context) {
+// revisionIds({from, to})가 주어지면 블록 인덱스 캐시를 증분 갱신합니다.
+function appendHandoff(text, context, revisionIds) {
   text = (text || '').trim();
   if (!text) return { status: 'NO_TEXT' };
 
@@ -320,18 +420,22 @@ function appendHandoff(text, context) {
   var doc = DocumentApp.openById(context.docId);
   var docName = doc.getName();
   var body = doc.getBody();
+  var lines = text.split(/\r?\n/);
 
   body.appendParagraph('---');
   if (!/^\s*\[HANDOFF\]/.test(text)) {
-    body.appendParagraph('[HANDOFF] ' + now + ' KST');
+    lines.unshift('[HANDOFF] ' + now + ' KST');
   }
 
-  text.split(/\r?\n/).forEach(function(line) {
+  lines.forEach(function(line) {
     body.appendParagraph(line);
   });
 
   doc.saveAndClose();
   setLastUpdatedForDoc(context.docId, new Date());
+  if (revisionIds) {
+    extendBlockIndex(context.docId, revisionIds, lines.join('\n'), docName);
+  }
   return {
     status: 'OK',
     url: 'https://docs.google.com/document/d/' + context.docId + '/edit',
@@ -339,15 +443,16 @@ function appendHandoff(text, context) {
   };
 }
 
-function getDocumentMeta(context, cachedDoc) {
+// cachedName이 있으면 문서를 열지 않고 메타데이터를 구성합니다.
+function getDocumentMeta(context, cachedDoc, cachedName) {
   if (!context || !context.docId) {
     throw new Error('DOC_CONTEXT_MISSING');
   }
-  var doc = cachedDoc || DocumentApp.openById(context.docId);
+  var name = cachedName || (cachedDoc || DocumentApp.openById(context.docId)).getName();
   var updatedAt = getLastUpdatedForDoc(context.docId) || new Date();
   return {
     id: context.docId,
-    name: doc.getName(),
+    name: name,
     url: 'https://docs.google.com/document/d/' + context.docId + '/edit',
     lastUpdated: formatISO(updatedAt),
     revisionId: ensureRevisionForDoc(context.docId),
@@ -423,17 +528,29 @@ function syncHandoff(text, revisionId, scope, teamKey) {
 
   var categories = deriveCategories(text);
   var preparedText = injectAutoCategoryLine(text, categories);
+  var nextRevision = Utilities.getUuid();
   var appendResult;
   try {
-    appendResult = appendHandoff(preparedText, context);
+    var lockedRevision = ensureRevisionForDoc(context.docId); // 락 획득 후 기준 리비전 재확인
+    if (lockedRevision !== revisionId) {
+      // 락을 기다리는 동안 다른 저장이 먼저 끝났음 (finally에서 락 해제)
+      return {
+        status: 'CONFLICT',
+        revisionId: lockedRevision,
+        providedRevision: revisionId,
+        scope: context.scope,
+        teamKey: context.teamKey || ''
+      };
+    }
+    appendResult = appendHandoff(preparedText, context, { from: lockedRevision, to: nextRevision });
     if (appendResult.status === 'OK') {
-      bumpRevisionForDoc(context.docId);
+      bumpRevisionForDoc(context.docId, nextRevision);
     }
   } finally {
     lock.releaseLock();
   }
 
-  var meta = getDocumentMeta(context);
+  var meta = getDocumentMeta(context, null, appendResult.name);
   return Object.assign({}, appendResult, {
     revisionId: meta.revisionId,
     last_updated: meta.lastUpdated,
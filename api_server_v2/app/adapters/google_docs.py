@@ -1,11 +1,22 @@
-"""Google Docs adapter (실제 구현)."""
+"""Google Docs adapter (실제 구현).
 
+Google 클라이언트 라이브러리는 임포트 비용이 크므로 어댑터를 처음 만들 때 불러옵니다.
+"""
+from __future__ import annotations
+
+import functools
 import json
+import logging
 from dataclasses import dataclass
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build, Resource
-from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
+from typing import TYPE_CHECKING, Set, Tuple
+
+from ..config import settings
+from ..metrics import record_google_error, stage, timed
+
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+
+logger = logging.getLogger(__name__)
 
 # (3단계의 SCOPES와 동일)
 SCOPES = [
@@ -13,6 +24,42 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive.metadata.readonly"
 ]
 
+# GOOGLE_API_ENDPOINT 재정의 시 서비스별 기본 경로 (실제 API의 servicePath와 동일)
+SERVICE_PATHS = {"docs": "/", "drive": "/drive/v3/"}
+
+# Apps Script appendHandoff와 같은 블록 구분선 (역방향 동기화가 이 줄로 핸드오프를 나눕니다)
+BLOCK_SEPARATOR = "---"
+CHANGES_PAGE_SIZE = 100
+
+
+def _client_options(service: str) -> dict:
+    if not settings.google_api_endpoint:
+        return {}
+    return {"client_options": {"api_endpoint": settings.google_api_endpoint.rstrip("/") + SERVICE_PATHS[service]}}
+
+
+@functools.lru_cache(maxsize=None)
+def _discovery_document(service: str, version: str) -> str:
+    """라이브러리에 포함된 정적 discovery 문서 (요청마다 파일을 다시 읽지 않도록 캐시)."""
+    from googleapiclient import discovery_cache
+
+    return discovery_cache.get_static_doc(service, version)
+
+
+def _build_service(service: str, version: str, credentials):
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(
+        _discovery_document(service, version), credentials=credentials, **_client_options(service)
+    )
+
+
+def _http_error():
+    from googleapiclient.errors import HttpError
+
+    return HttpError
+
+
 @dataclass
 class DocumentMeta:
     """C님이 정의한 기존 DocumentMeta 데이터 클래스 (유지)"""
@@ -28,6 +75,7 @@ class GoogleDocsAdapter:
     초기화(__init__) 시점에 토큰을 받아 서비스 객체를 생성합니다.
     """
     
+    @timed("google.adapter_init")
     def __init__(self, token_json: str):
         """
         어댑터 초기화 및 Google 서비스 인증.
@@ -38,6 +86,9 @@ class GoogleDocsAdapter:
         self.drive_service: Resource | None = None
         self.current_token_json: str = token_json # (갱신될 수 있음)
 
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+
         try:
             # 1. JSON 문자열을 딕셔너리로 변환
             token_info = json.loads(token_json)
@@ -48,21 +99,24 @@ class GoogleDocsAdapter:
             # 3. (가장 중요) 토큰 갱신 처리
             if not creds.valid:
                 if creds.expired and creds.refresh_token:
-                    print("토큰 갱신 시도...")
-                    creds.refresh(Request())
+                    logger.info("토큰 갱신 시도")
+                    with stage("google.token_refresh"):
+                        creds.refresh(Request())
                     # 4. 갱신된 토큰 정보를 다시 JSON 문자열로 저장
                     self.current_token_json = creds.to_json() 
-                    print("토큰 갱신 성공.")
+                    logger.info("토큰 갱신 성공")
                 else:
                     # 리프레시 토큰이 없거나 만료되면 재인증 필요
                     raise Exception("Refresh token failed. Re-authentication required.")
 
             # 5. API 서비스 객체 빌드
-            self.docs_service = build('docs', 'v1', credentials=creds)
-            self.drive_service = build('drive', 'v3', credentials=creds)
+            with stage("google.discovery_build"):
+                self.docs_service = _build_service('docs', 'v1', creds)
+                self.drive_service = _build_service('drive', 'v3', creds)
 
         except Exception as e:
-            print(f"Google 서비스 생성 오류: {e}")
+            record_google_error("adapter_init")
+            logger.error("Google 서비스 생성 오류: %s", e)
             # 서비스 생성 실패 시, 메서드 호출이 실패하도록 None을 유지
             raise  # 오류를 호출자(MemoryService)에게 다시 전달
 
@@ -73,15 +127,20 @@ class GoogleDocsAdapter:
         """
         return self.current_token_json
 
+    @timed("google.append_handoff")
     def append_handoff(self, doc_id: str, content: str) -> None:
         """[기능 1] Google 문서 끝에 내용을 추가합니다."""
         
         if not self.docs_service:
             raise Exception("Google Docs service가 초기화되지 않았습니다.")
 
+        # 컬렉션 객체는 생성 비용(메서드 docstring 생성 등)이 커서 get/batchUpdate에 함께 씁니다.
+        documents = self.docs_service.documents()
+
         try:
             # 1. 먼저 문서를 읽어옵니다.
-            document = self.docs_service.documents().get(documentId=doc_id).execute()
+            with stage("google.docs.get", doc_id=doc_id):
+                document = documents.get(documentId=doc_id).execute()
             
             # 2. 문서 본문(body)의 끝 인덱스(endIndex)를 찾습니다.
             body = document.get('body')
@@ -94,22 +153,25 @@ class GoogleDocsAdapter:
                         'location': {
                             'index': end_index - 1, # 본문 마지막 위치
                         },
-                        'text': f"\n{content}\n" # (새 줄 추가)
+                        'text': f"\n{BLOCK_SEPARATOR}\n{content}\n" # (구분선 + 새 줄 추가)
                     }
                 }
             ]
 
             # 4. 'batchUpdate'로 쓰기 요청 실행
-            self.docs_service.documents().batchUpdate(
-                documentId=doc_id, body={'requests': requests}
-            ).execute()
+            with stage("google.docs.batch_update", doc_id=doc_id, payload_bytes=len(content.encode("utf-8"))):
+                documents.batchUpdate(
+                    documentId=doc_id, body={'requests': requests}
+                ).execute()
             
-            print(f"문서 '{doc_id}'에 내용 추가 성공.")
+            logger.info("문서 내용 추가 성공", extra={"doc_id": doc_id})
 
-        except HttpError as e:
-            print(f"Google Docs API 오류 (append_handoff): {e}")
+        except _http_error() as e:
+            record_google_error("append_handoff")
+            logger.error("Google Docs API 오류 (append_handoff): %s", e, extra={"doc_id": doc_id})
             raise # 오류를 호출자(MemoryService)에게 다시 전달
 
+    @timed("google.fetch_meta")
     def fetch_meta(self, doc_id: str) -> DocumentMeta:
         """[기능 2] Google Drive API로 실제 메타데이터를 가져옵니다."""
         
@@ -119,12 +181,13 @@ class GoogleDocsAdapter:
         try:
             # 1. Drive API로 파일 메타데이터 요청
             # (이름, 수정 시간, 그리고 문서 URL)
-            file_meta = self.drive_service.files().get(
-                fileId=doc_id,
-                fields='name, modifiedTime, webViewLink'
-            ).execute()
+            with stage("google.drive.files_get", doc_id=doc_id):
+                file_meta = self.drive_service.files().get(
+                    fileId=doc_id,
+                    fields='name, modifiedTime, webViewLink'
+                ).execute()
             
-            print(f"문서 '{doc_id}' 메타데이터 조회 성공.")
+            logger.info("문서 메타데이터 조회 성공", extra={"doc_id": doc_id})
             
             # 2. C님의 DocumentMeta 형식에 맞춰 반환
             return DocumentMeta(
@@ -134,6 +197,71 @@ class GoogleDocsAdapter:
                 last_updated=file_meta.get('modifiedTime', '1970-01-01T00:00:00Z'),
             )
 
-        except HttpError as e:
-            print(f"Google Drive API 오류 (fetch_meta): {e}")
-            raise # 오류를 호출자(MemoryService)에게 다시 전달
\ No newline at end of file
+        except _http_error() as e:
+            record_google_error("fetch_meta")
+            logger.error("Google Drive API 오류 (fetch_meta): %s", e, extra={"doc_id": doc_id})
+            raise # 오류를 호출자(MemoryService)에게 다시 전달
+
+    @timed("google.read_text")
+    def read_text(self, doc_id: str) -> str:
+        """[기능 3] 문서 본문을 일반 텍스트로 읽습니다 (문단 텍스트만, 줄 바꿈은 `\n`)."""
+
+        if not self.docs_service:
+            raise Exception("Google Docs service가 초기화되지 않았습니다.")
+
+        try:
+            with stage("google.docs.get", doc_id=doc_id):
+                document = self.docs_service.documents().get(documentId=doc_id).execute()
+        except _http_error() as e:
+            record_google_error("read_text")
+            logger.error("Google Docs API 오류 (read_text): %s", e, extra={"doc_id": doc_id})
+            raise
+
+        parts = []
+        for element in document.get("body", {}).get("content", []):
+            for run in element.get("paragraph", {}).get("elements", []):
+                parts.append(run.get("textRun", {}).get("content", ""))
+        # Docs는 문단 안 줄 바꿈(Shift+Enter)을 \x0b로 돌려줍니다.
+        return "".join(parts).replace("\x0b", "\n")
+
+    @timed("google.start_page_token")
+    def start_page_token(self) -> str:
+        """Drive changes 커서의 현재 위치. 이후 변경만 `list_changes`로 받습니다."""
+
+        if not self.drive_service:
+            raise Exception("Google Drive service가 초기화되지 않았습니다.")
+
+        try:
+            with stage("google.drive.changes_start"):
+                return self.drive_service.changes().getStartPageToken().execute()["startPageToken"]
+        except _http_error() as e:
+            record_google_error("start_page_token")
+            logger.error("Google Drive API 오류 (start_page_token): %s", e)
+            raise
+
+    @timed("google.list_changes")
+    def list_changes(self, page_token: str) -> Tuple[Set[str], str]:
+        """`page_token` 이후 바뀐 파일 id들과 다음 호출에 쓸 page token을 반환합니다."""
+
+        if not self.drive_service:
+            raise Exception("Google Drive service가 초기화되지 않았습니다.")
+
+        changes = self.drive_service.changes()
+        changed: Set[str] = set()
+        try:
+            while True:
+                with stage("google.drive.changes_list"):
+                    page = changes.list(
+                        pageToken=page_token,
+                        pageSize=CHANGES_PAGE_SIZE,
+                        spaces="drive",
+                        fields="nextPageToken, newStartPageToken, changes(fileId, removed)",
+                    ).execute()
+                changed.update(change["fileId"] for change in page.get("changes", []) if not change.get("removed"))
+                if "newStartPageToken" in page:
+                    return changed, page["newStartPageToken"]
+                page_token = page["nextPageToken"]
+        except _http_error() as e:
+            record_google_error("list_changes")
+            logger.error("Google Drive API 오류 (list_changes): %s", e)
+            raise
@@ -0,0 +1,197 @@
+"""캐시: 프로세스 내 LRU(`LRUCache`)와 워커 프로세스 간 공유 캐시.
+
+`uvicorn --workers N`에서는 프로세스마다 메모리가 따로라 인메모리 캐시가 N번 차갑게 시작합니다.
+`SHARED_CACHE=sqlite`이면 같은 호스트의 워커들이 `SHARED_CACHE_PATH`의 SQLite 파일(WAL)을
+함께 읽고 씁니다. 값은 JSON으로 저장하고 항목마다 만료 시각을 둡니다.
+
+사용처
+- doc_meta: Drive 메타데이터(`DocumentMeta`). 조회 시 Drive 호출과 어댑터 생성을 건너뜁니다.
+- google_token: 워크스페이스별 Google OAuth 토큰 JSON. 저장/갱신 시 함께 갱신합니다.
+
+`SHARED_CACHE=none`(기본)이면 `NullCache`가 항상 miss를 반환합니다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from .config import settings
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    ) WITHOUT ROWID
+"""
+
+
+class LRUCache(Generic[V]):
+    """크기 제한(+선택적 TTL)이 있는 스레드 안전 LRU. 조회 결과를 hits/misses와 `record_cache(name, ...)`에 기록합니다.
+
+    maxsize가 0이면 아무것도 저장하지 않습니다 (캐시 비활성화).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: Optional[float] = None):
+        self.name = name
+        self.maxsize = max(0, maxsize)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[Hashable, Tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and self.ttl is not None and item[1] <= time.monotonic():
+                del self._items[key]
+                item = None
+            if item is None:
+                self.misses += 1
+            else:
+                self._items.move_to_end(key)
+                self.hits += 1
+        record_cache(self.name, item is not None)
+        return item[0] if item is not None else None
+
+    def set(self, key: Hashable, value: V) -> None:
+        if not self.maxsize:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class NullCache:
+    name = "none"
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    def delete(self, namespace: str, key: str) -> None:
+        pass
+
+    def purge_expired(self) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCache:
+    """SQLite 파일 기반 TTL 캐시. 캐시 오류는 기록만 하고 miss로 처리합니다 (원본은 항상 DB/API)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path | str, busy_timeout_ms: int = 2000):
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conn: sqlite3.Connection | None = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # fork(gunicorn --preload) 이후에는 부모의 연결을 쓰지 않고 새로 엽니다.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                    (namespace, key, time.time()),
+                ).fetchone()
+        except sqlite3.Error:
+            logger.warning("공유 캐시 조회 실패", exc_info=True, extra={"namespace": namespace})
+            row = None
+        record_cache(f"shared.{namespace}", row is not None)
+        return json.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        try:
+            with self._lock:
+                self._connection().execute(
+                    """
+                    INSERT INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+                    """,
+                    (namespace, key, json.dumps(value, ensure_ascii=False), time.time() + ttl),
+                )
+        except sqlite3.Error:
+            logger.warning("공유 캐시 저장 실패", exc_info=True, extra={"namespace": namespace})
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            with self._lock:
+                self._connection().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+        except sqlite3.Error:
+            logger.warning("공유 캐시 삭제 실패", exc_info=True, extra={"namespace": namespace})
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._connection().execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def create_cache(settings):
+    if settings.shared_cache == "sqlite":
+        return SQLiteCache(settings.shared_cache_path)
+    return NullCache()
+
+
+shared_cache = create_cache(settings)
@@ -0,0 +1,361 @@
+"""HTTP 압축 (응답 gzip/brotli, 압축된 요청 본문 해제).
+
+- 응답: 클라이언트가 `Accept-Encoding`으로 허용하고 본문이 `COMPRESSION_MIN_BYTES` 이상인 JSON/텍스트 응답을
+  br(`pip install brotli` 필요) 또는 gzip으로 압축합니다. 같은 본문을 반복해서 보내는 GET 응답
+  (`/sessions/latest` 등)은 압축 결과를 `COMPRESSION_CACHE_SIZE`개까지 재사용합니다.
+  여러 메시지로 나눠 보내는 스트리밍 응답은 조각마다 압축해 바로 내보냅니다.
+- 요청: `Content-Encoding: gzip | deflate | br` 본문을 풀어서 라우트에 넘깁니다 (`POST /sessions` 등).
+  푼 크기가 `MAX_REQUEST_BODY_BYTES`를 넘으면 413, 지원하지 않는 인코딩은 415, 깨진 본문은 400입니다.
+  NDJSON 본문(`POST /workspaces/{id}/import`)은 모아 두지 않고 조각마다 풀어 넘기며 (전체 크기 제한 없음),
+  깨진 본문은 라우트가 읽는 도중 `BodyError`로 알립니다.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from .cache import LRUCache
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/problem+json")
+STREAMED_REQUEST_TYPES = ("application/x-ndjson",)
+STREAM_PIECE_BYTES = 1024 * 1024  # 스트림 요청 본문을 풀 때 한 번에 넘기는 최대 크기
+# 스트림 요청의 br 본문은 출력 상한(brotli >= 1.2)이 있어야 조각마다 풀 수 있습니다. 없으면 415.
+BROTLI_STREAMING = brotli is not None and hasattr(brotli.Decompressor, "can_accept_more_data")
+
+
+class BodyError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def available_encodings() -> List[str]:
+    """서버가 응답에 쓸 수 있는 인코딩 (선호 순서)."""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """`Accept-Encoding` 헤더에서 q값이 가장 높은 지원 인코딩 (같으면 br 우선). 없으면 None."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().lower().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in available_encodings():
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(coding: str, data: bytes) -> bytes:
+    if coding == "br":
+        return brotli.compress(data, quality=settings.brotli_quality)
+    compressor = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress(coding: str, data: bytes, limit: int) -> bytes:
+    """요청 본문을 풉니다. 결과가 `limit`을 넘으면 413, 깨졌으면 400 `BodyError`."""
+    try:
+        if coding == "br":
+            if brotli is None:
+                raise BodyError(415, "UNSUPPORTED_CONTENT_ENCODING")
+            decompressor = brotli.Decompressor()
+            try:
+                body = decompressor.process(data, output_buffer_limit=limit + 1)
+            except TypeError:  # brotli < 1.2: 출력 상한 인자 없음
+                body = decompressor.process(data)
+            finished = decompressor.is_finished()
+        else:
+            # gzip: 헤더 포함(31), deflate: zlib 스트림(15). 원시 deflate(-15)를 보내는 클라이언트도 받습니다.
+            wbits = 31 if coding == "gzip" else (15 if data[:1] == b"x" else -15)
+            decompressor = zlib.decompressobj(wbits)
+            body = decompressor.decompress(data, limit + 1)
+            finished = decompressor.eof
+    except (zlib.error, getattr(brotli, "error", zlib.error)) as exc:
+        raise BodyError(400, "INVALID_COMPRESSED_BODY") from exc
+    if len(body) > limit:
+        raise BodyError(413, "REQUEST_BODY_TOO_LARGE")
+    if not finished:
+        raise BodyError(400, "INVALID_COMPRESSED_BODY")
+    return body
+
+
+class _StreamDecompressor:
+    """요청 본문을 조각마다 풉니다. 압축률이 높은 본문도 `piece_bytes`씩 나눠 내보냅니다."""
+
+    def __init__(self, coding: str, piece_bytes: int):
+        self.coding = coding
+        self.piece_bytes = piece_bytes
+        self._pending = b""
+        self._inflater = brotli.Decompressor() if coding == "br" else None
+
+    def feed(self, data: bytes) -> None:
+        self._pending += data
+
+    def read(self) -> bytes:
+        """푼 본문 조각. 입력이 더 필요하면 b""."""
+        try:
+            if self.coding == "br":
+                # 출력 상한에 걸리면 남은 입력은 brotli가 들고 있고, 빈 입력으로 이어서 풉니다.
+                # (상한은 출력 버퍼 단위라 조각이 piece_bytes를 조금 넘을 수 있습니다.)
+                data = b""
+                if self._pending and self._inflater.can_accept_more_data():
+                    data, self._pending = self._pending, b""
+                if not data and self._inflater.is_finished():
+                    return b""
+                return self._inflater.process(data, output_buffer_limit=self.piece_bytes)
+            if not self._pending:
+                return b""
+            if self._inflater is None:
+                wbits = 31 if self.coding == "gzip" else (15 if self._pending[:1] == b"x" else -15)
+                self._inflater = zlib.decompressobj(wbits)
+            body = self._inflater.decompress(self._pending, self.piece_bytes)
+            self._pending = self._inflater.unconsumed_tail
+            return body
+        except (zlib.error, getattr(brotli, "error", zlib.error)) as exc:
+            raise BodyError(400, "INVALID_COMPRESSED_BODY") from exc
+
+    @property
+    def finished(self) -> bool:
+        if self.coding == "br":
+            return self._inflater.is_finished()
+        return self._inflater is not None and self._inflater.eof
+
+
+class _StreamCompressor:
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._br = brotli.Compressor(quality=settings.brotli_quality)
+            self._gzip = None
+        else:
+            self._br = None
+            self._gzip = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # 조각마다 flush해서 클라이언트가 스트림을 바로 읽을 수 있게 합니다.
+        if self._br is not None:
+            return self._br.process(data) + self._br.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._br.finish() if self._br is not None else self._gzip.flush()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _without(headers: List[Tuple[bytes, bytes]], *names: bytes) -> List[Tuple[bytes, bytes]]:
+    return [(key, value) for key, value in headers if key.lower() not in names]
+
+
+class CompressionMiddleware:
+    """응답 압축과 압축된 요청 본문 해제를 맡는 ASGI 미들웨어."""
+
+    def __init__(self, app, minimum_size: int = 1024, max_request_bytes: int = 16 * 1024 * 1024, cache_size: int = 32):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_request_bytes = max_request_bytes
+        # (coding, hash(본문)) → (본문, 압축 본문). 해시 충돌에 대비해 본문이 같은지 확인합니다.
+        self._compressed: LRUCache[Tuple[bytes, bytes]] = LRUCache("compressed_body", cache_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = list(scope["headers"])
+        content_encoding = (_header(headers, b"content-encoding") or "identity").strip().lower()
+        if content_encoding != "identity":
+            streamed = (_header(headers, b"content-type") or "").startswith(STREAMED_REQUEST_TYPES)
+            try:
+                if streamed:
+                    receive = self._inflating(receive, content_encoding)
+                else:
+                    body = await self._read_body(receive, content_encoding)
+                    receive = self._replay(body, receive)
+            except BodyError as exc:
+                await self._error(send, exc)
+                return
+            headers_out = _without(headers, b"content-encoding", b"content-length")
+            if not streamed:
+                headers_out.append((b"content-length", str(len(body)).encode("latin-1")))
+            # 복사본이 아니라 원래 scope를 고칩니다. 라우터가 여기에 남기는 scope["route"]를 바깥 미들웨어
+            # (메트릭, 트레이싱 루트 span)가 읽습니다.
+            scope["headers"] = headers_out
+
+        coding = negotiate(_header(headers, b"accept-encoding") or "")
+        if coding is None or self.minimum_size <= 0:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _ResponseCompressor(self, coding, scope["method"], send))
+
+    async def _read_body(self, receive, coding: str) -> bytes:
+        if coding not in ("gzip", "deflate", "br"):
+            raise BodyError(415, "UNSUPPORTED_CONTENT_ENCODING")
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise BodyError(400, "CLIENT_DISCONNECTED")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_request_bytes:
+                raise BodyError(413, "REQUEST_BODY_TOO_LARGE")
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return decompress(coding, b"".join(chunks), self.max_request_bytes)
+
+    @staticmethod
+    def _inflating(receive, coding: str):
+        """본문을 모으지 않고 `receive` 메시지마다 풀어서 넘기는 래퍼 (NDJSON 스트림 요청)."""
+        if coding not in ("gzip", "deflate", "br") or (coding == "br" and not BROTLI_STREAMING):
+            raise BodyError(415, "UNSUPPORTED_CONTENT_ENCODING")
+        decompressor = _StreamDecompressor(coding, STREAM_PIECE_BYTES)
+        more_body = True
+        done = False
+
+        async def inflate():
+            nonlocal more_body, done
+            if done:
+                return await receive()
+            while True:
+                piece = decompressor.read()
+                if piece:
+                    return {"type": "http.request", "body": piece, "more_body": True}
+                if not more_body:
+                    if not decompressor.finished:
+                        raise BodyError(400, "INVALID_COMPRESSED_BODY")
+                    done = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                decompressor.feed(message.get("body", b""))
+                more_body = message.get("more_body", False)
+
+        return inflate
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()  # 본문 이후에는 연결 종료(http.disconnect)를 그대로 전달
+
+        return replay
+
+    @staticmethod
+    async def _error(send, exc: BodyError) -> None:
+        body = json.dumps({"detail": exc.detail}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": exc.status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def compressed(self, coding: str, body: bytes, cacheable: bool) -> bytes:
+        if not cacheable:
+            return compress(coding, body)
+        key = (coding, len(body), hash(body))
+        cached = self._compressed.get(key)
+        if cached is not None and cached[0] == body:
+            return cached[1]
+        data = compress(coding, body)
+        self._compressed.set(key, (body, data))
+        return data
+
+
+class _ResponseCompressor:
+    """`send` 래퍼: 시작 메시지를 첫 본문 조각이 올 때까지 잡아 두고 압축 여부를 정합니다."""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, method: str, send):
+        self.middleware = middleware
+        self.coding = coding
+        self.cacheable = method in ("GET", "HEAD")
+        self.send = send
+        self.start = None
+        self.stream: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = message.get("headers", [])
+            content_type = _header(headers, b"content-type") or ""
+            self.passthrough = (
+                _header(headers, b"content-encoding") is not None
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or message["status"] in (204, 304)
+            )
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is not None:
+            data = self.stream.chunk(body) if more_body else self.stream.chunk(body) + self.stream.finish()
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        headers = _without(self.start.get("headers", []), b"content-length")
+        if not more_body:
+            if len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            data = self.middleware.compressed(self.coding, body, self.cacheable)
+            headers += [(b"content-length", str(len(data)).encode("latin-1"))]
+        else:
+            self.stream = _StreamCompressor(self.coding)
+            data = self.stream.chunk(body)
+        headers += [(b"content-encoding", self.coding.encode("latin-1")), (b"vary", b"Accept-Encoding")]
+        await self.send({**self.start, "headers": headers})
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+def install(app) -> None:
+    """압축 미들웨어를 등록합니다. `COMPRESSION_MIN_BYTES=0`이면 응답 압축만 끄고 요청 본문 해제는 유지합니다."""
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_bytes,
+        max_request_bytes=settings.max_request_body_bytes,
+        cache_size=settings.compression_cache_size,
+    )
@@ -1,9 +1,104 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
+BASE_DIR = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     app_name: str = "Memory Hub v2"
     workspace_default: str = "default"
 
+    # 저장소 백엔드: sqlite(기본, 단일 호스트) | postgres(여러 레플리카 공유)
+    storage_backend: Literal["sqlite", "postgres"] = "sqlite"
+    sqlite_path: Path = BASE_DIR / "memory.db"
+    postgres_dsn: str = ""
+    postgres_pool_min: int = 1
+    postgres_pool_max: int = 10
+
+    # 세션 본문 압축: zlib(기본, 표준 라이브러리) | zstd(`pip install zstandard` 필요)
+    blob_codec: Literal["zlib", "zstd"] = "zlib"
+    blob_dictionary: bool = True  # [HANDOFF] 템플릿 공유 사전 사용 여부
+    # 리비전 체인에서 N번째마다 전체 스냅샷 저장 (1이면 델타 미사용)
+    delta_snapshot_interval: int = 16
+
+    # 보관 정책 기본값 (워크스페이스별 정책이 없을 때). 0이면 해당 조건 미사용
+    retention_keep_last_per_category: int = 0
+    retention_max_age_days: int = 0
+    archive_dir: Path = BASE_DIR / "archive"
+    archive_codec: Literal["gzip", "zstd"] = "gzip"
+    compaction_interval_seconds: int = 0  # 0이면 백그라운드 압축 작업 비활성화
+    vacuum_pages_per_step: int = 256
+
+    # 멀티 워커(`uvicorn --workers N`, gunicorn): 스키마 생성/압축 작업 조정용 파일 락 위치
+    run_dir: Path = BASE_DIR / "run"
+    # 워커 간 공유 캐시: none | sqlite (같은 호스트의 워커가 SHARED_CACHE_PATH 파일을 함께 사용)
+    shared_cache: Literal["none", "sqlite"] = "none"
+    shared_cache_path: Path = BASE_DIR / "cache.db"
+    doc_meta_ttl_seconds: float = 30.0  # Drive 메타데이터(수정 시각, URL) 캐시 유지 시간
+    google_token_ttl_seconds: float = 300.0
+
+    # MemoryService 프로세스 내 LRU (0이면 비활성화). 토큰은 다른 워커가 갱신한 값을 늦어도 TTL 뒤에 읽습니다.
+    workspace_cache_size: int = 1024
+    google_token_cache_size: int = 1024
+    google_token_cache_ttl_seconds: float = 30.0
+    session_body_cache_size: int = 64  # GET /sessions/latest 응답 JSON bytes (핸드오프 본문 크기만큼 메모리 사용)
+
+    # HTTP 압축 (app/compression.py): 이 크기(bytes) 이상인 응답을 gzip/br로 보냅니다 (0이면 응답 압축 끔)
+    compression_min_bytes: int = 1024
+    compression_cache_size: int = 32  # 반복되는 GET 응답의 압축 결과 재사용 개수
+    gzip_level: int = 6
+    brotli_quality: int = 5  # `pip install brotli`가 있을 때만 사용
+    max_request_body_bytes: int = 16 * 1024 * 1024  # 압축된 요청 본문을 푼 뒤의 상한
+
+    # POST /sessions 멱등성 키 유지 시간 (0이면 비활성화)과 처리 중 키를 버려진 것으로 볼 시간
+    idempotency_ttl_seconds: int = 24 * 3600
+    idempotency_pending_timeout_seconds: int = 300
+
+    # 근접 중복 push (app/storage/simhash.py): 체인의 최근 세션과 SimHash 해밍 거리가 상한 이하이면
+    # delta: 새 세션을 그 본문에 대한 델타로 저장 | merge: 체인 최신 세션이면 새 세션/Docs 추가 없이 병합 | off
+    near_duplicate_mode: Literal["off", "delta", "merge"] = "delta"
+    near_duplicate_max_distance: int = 3  # 64비트 중 다른 비트 수
+    near_duplicate_window: int = 8  # 비교할 체인의 최근 세션 수
+
+    # POST /sessions/related 관련도 색인 (app/related.py, numpy 필요): 벡터 차원과 메모리에 둘 워크스페이스 수
+    # 세션 10만 개 기준 행렬 크기는 차원 256에서 약 100MB입니다.
+    related_index_dim: int = 256
+    related_index_workspaces: int = 8
+
+    # GET /sessions/context: 섹션을 고를 최근 세션 수와 (리비전, 예산, 필터)별 묶음 LRU 크기
+    context_history: int = 5
+    context_cache_size: int = 128
+
+    # Google Docs 역방향 동기화 주기 (app/services/doc_sync.py, 0이면 비활성화). Docs에서 직접 고친 블록을 세션으로 가져옵니다.
+    doc_sync_interval_seconds: int = 0
+
+    # Google Docs/Drive API 주소 재정의 (비우면 실제 API, 벤치마크에서는 benchmarks/google_stub.py)
+    google_api_endpoint: str = ""
+
+    # Prometheus `/metrics` (prometheus_client 필요)
+    metrics_enabled: bool = False
+
+    # OpenTelemetry 트레이싱 (opentelemetry-sdk 필요): memory | file | console | otlp
+    tracing_enabled: bool = False
+    tracing_exporter: Literal["memory", "file", "console", "otlp"] = "file"
+    tracing_file: Path = BASE_DIR / "traces.jsonl"
+    tracing_otlp_endpoint: str = ""
+
+    # 요청 프로파일링: 관리자 헤더(X-Profile + X-Admin-Token) 또는 샘플 비율로 선택
+    profiling_enabled: bool = False
+    profiling_mode: Literal["cprofile", "sampling"] = "cprofile"
+    profiling_sample_rate: float = 0.0
+    profiling_sample_interval_ms: float = 2.0
+    profiling_admin_token: str = ""
+    profiling_dir: Path = BASE_DIR / "profiles"
+    profiling_max_captures: int = 50
+
+    # 로그: json | text, 모듈별 레벨 예) "adapters.google_docs=WARNING,db=WARNING"
+    log_format: Literal["json", "text"] = "json"
+    log_level: str = "INFO"
+    log_levels: str = ""
+
 
 settings = Settings()
@@ -0,0 +1,156 @@
+"""토큰 예산에 맞춘 컨텍스트 묶음 (GET /sessions/context).
+
+최신 핸드오프를 먼저 넣고, 남은 예산은 최근 핸드오프들의 섹션을 가치(섹션 종류 가중치 × 최신일수록 높은 감쇠)
+순서로 채웁니다. 이미 넣은 섹션과 본문이 같은 섹션은 건너뜁니다.
+토큰 수는 토크나이저 없이 추정합니다: ASCII는 4자당 1토큰, 그 외(한글 등)는 1자당 1토큰 (실제보다 약간 크게 잡음).
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+# `## 제목` (examples/handoff_*.md) 또는 `[제목] 본문` (LLM 핸드오프 프롬프트) 형식의 섹션 머리
+_HEADING = re.compile(r"^(?:#{2,3}\s+(?P<md>.+?)\s*$|\[(?P<tag>[^\]\n]+)\]\s?(?P<rest>.*)$)")
+# 섹션이 아니라 블록 표시인 태그
+_MARKERS = {"handoff", "auto_category"}
+
+SECTION_WEIGHTS = {
+    "tl;dr": 1.0,
+    "next actions": 0.9,
+    "open questions": 0.8,
+    "startup decisions": 0.7,
+    "memory updates": 0.6,
+    "personal learnings": 0.5,
+    "keywords": 0.3,
+}
+DEFAULT_WEIGHT = 0.4
+RECENCY_DECAY = 0.6  # 한 세션 이전으로 갈수록 곱하는 값
+
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+@dataclass
+class Section:
+    title: str  # 머리 앞부분은 ""
+    body: str
+
+
+def split_sections(text: str) -> List[Section]:
+    sections = [Section("", "")]
+    lines: List[str] = []
+    for line in text.splitlines():
+        match = _HEADING.match(line)
+        title = match and (match.group("md") or match.group("tag")).strip()
+        if title and title.lower() not in _MARKERS:
+            sections[-1].body = "\n".join(lines).strip()
+            sections.append(Section(title, ""))
+            lines = [match.group("rest")] if match.group("rest") else []
+        else:
+            lines.append(line)
+    sections[-1].body = "\n".join(lines).strip()
+    return [section for section in sections if section.title or section.body]
+
+
+def _truncate(text: str, budget: int) -> str:
+    """줄 단위로 `budget` 토큰까지 자릅니다."""
+    kept: List[str] = []
+    used = estimate_tokens("…")
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept + ["…"]) if kept else ""
+
+
+@dataclass
+class SessionText:
+    revision_id: str
+    last_updated: str
+    content: str
+
+
+@dataclass
+class Part:
+    revision_id: str
+    section: str
+    tokens: int
+
+
+def build_bundle(sessions: Sequence[SessionText], budget: int) -> Tuple[str, List[Part], bool]:
+    """(묶음 본문, 넣은 섹션 목록, 잘라낸 내용이 있는지). `sessions`는 최신 순서."""
+    if not sessions:
+        return "", [], False
+    latest, earlier = sessions[0], sessions[1:]
+    head = f"# Latest handoff ({latest.revision_id}, {latest.last_updated[:16]})"
+    remaining = budget - estimate_tokens(head) - 1
+    parts: List[Part] = []
+    seen = set()
+    truncated = False
+
+    full = estimate_tokens(latest.content)
+    if full <= remaining:
+        latest_text = latest.content.strip()
+        parts.append(Part(latest.revision_id, "ALL", full))
+        remaining -= full
+        seen.update(section.body for section in split_sections(latest.content))
+    else:
+        # 최신 핸드오프도 다 들어가지 않으면 가치가 높은 섹션부터 넣고 (원래 순서로 출력) 첫 섹션은 잘라서라도 넣습니다.
+        truncated = True
+        sections = split_sections(latest.content)
+        chosen = {}
+        for index in sorted(range(len(sections)), key=lambda i: -_weight(sections[i].title)):
+            text = _render(sections[index])
+            cost = estimate_tokens(text) + 1
+            if cost > remaining:
+                if chosen:
+                    continue
+                text = _truncate(text, remaining)
+                if not text:
+                    break
+                cost = estimate_tokens(text) + 1
+            chosen[index] = text
+            parts.append(Part(latest.revision_id, sections[index].title, cost))
+            seen.add(sections[index].body)
+            remaining -= cost
+        latest_text = "\n\n".join(chosen[index] for index in sorted(chosen))
+    blocks = [head + "\n" + latest_text]
+
+    earlier_head = "# Earlier handoffs"
+    remaining -= estimate_tokens(earlier_head) + 1
+    candidates = []
+    for age, session in enumerate(earlier, start=1):
+        for order, section in enumerate(split_sections(session.content)):
+            if section.title and section.body:
+                score = _weight(section.title) * RECENCY_DECAY**age
+                candidates.append((score, age, order, section, session))
+    picked = []
+    for score, age, order, section, session in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+        if section.body in seen:
+            continue
+        text = f"## {section.title} ({session.revision_id}, {session.last_updated[:10]})\n{section.body}"
+        cost = estimate_tokens(text) + 1
+        if cost > remaining:
+            truncated = True
+            continue
+        seen.add(section.body)
+        picked.append((age, order, text))
+        parts.append(Part(session.revision_id, section.title, cost))
+        remaining -= cost
+    if picked:
+        blocks.append(earlier_head + "\n" + "\n\n".join(text for _, _, text in sorted(picked)))
+    return "\n\n".join(blocks) + "\n", parts, truncated
+
+
+def _weight(title: str) -> float:
+    return SECTION_WEIGHTS.get(title.lower(), DEFAULT_WEIGHT) if title else DEFAULT_WEIGHT / 2
+
+
+def _render(section: Section) -> str:
+    return f"## {section.title}\n{section.body}" if section.title else section.body
+
@@ -1,77 +1,65 @@
 from __future__ import annotations
 
 import json
-import sqlite3
+import logging
 import uuid
 from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Optional
+from itertools import islice
+from typing import Iterable, List, Optional, Set, Tuple
 
+from .cache import LRUCache, shared_cache
+from .config import settings
+from .doc_blocks import BASELINE_MARK
+from .metrics import timed
+from .migrations import migrate
 from .schemas import TokenResponse, Workspace
+from .storage import StorageBackend, create_backend
+from .storage.base import Row
+from .storage.blobs import compress, content_hash, decompress
+from .storage.deltas import apply_delta, make_delta
+from .workers import file_lock
 
-DB_PATH = Path(__file__).resolve().parent.parent / "memory.db"
-conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-conn.row_factory = sqlite3.Row
+logger = logging.getLogger(__name__)
 
+DB_PATH = settings.sqlite_path
 
-def init_db() -> None:
-    with conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS workspaces (
-                id TEXT PRIMARY KEY,
-                name TEXT,
-                doc_personal_id TEXT,
-                team_map TEXT,
-                categories TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS sessions (
-                id TEXT PRIMARY KEY,
-                workspace_id TEXT,
-                scope TEXT,
-                team_key TEXT,
-                revision_id TEXT,
-                content TEXT,
-                categories TEXT,
-                last_updated TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tokens (
-                token TEXT PRIMARY KEY,
-                workspace_id TEXT,
-                scopes TEXT,
-                expires_at TEXT
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS revisions (
-                workspace_id TEXT PRIMARY KEY,
-                revision_id TEXT
-            )
-            """
-        )
-        
-        # [추가] Google OAuth 토큰을 저장할 테이블
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS google_tokens (
-                workspace_id TEXT PRIMARY KEY,
-                token_json TEXT NOT NULL
-            )
-            """
-        )
+# 델타가 전체 본문 대비 이 비율 이상이면 스냅샷으로 저장합니다.
+DELTA_MAX_RATIO = 0.5
+# 최근에 복원한 본문 캐시 크기 (같은 체인의 다음 델타 계산/복원에 재사용)
+TEXT_CACHE_SIZE = 128
+
+# content 본문은 session_content()에서 필요할 때만 읽습니다.
+SESSION_COLUMNS = "id, workspace_id, scope, team_key, revision_id, categories, last_updated, content_hash, seq"
+
+INSERT_SESSION_SQL = """
+    INSERT INTO sessions (id, workspace_id, scope, team_key, revision_id, content_hash, categories, last_updated, seq, simhash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
+# 워크스페이스의 다음 세션 순번 (migrations 10: idx_sessions_seq_unique 사용)
+NEXT_SEQ_SQL = "SELECT COALESCE(MAX(seq), 0) + 1 AS next_seq FROM sessions WHERE workspace_id = ?"
+# seq 배정 전에 워크스페이스의 revisions 행을 잠급니다 (PostgreSQL 행 잠금, SQLite 쓰기 잠금).
+# READ COMMITTED에서 MAX(seq)만 읽으면 동시 push가 같은 seq를 받으므로 트랜잭션이 끝날 때까지 직렬화합니다.
+LOCK_SEQ_SQL = """
+    INSERT INTO revisions (workspace_id, revision_id) VALUES (?, 'init')
+    ON CONFLICT(workspace_id) DO UPDATE SET revision_id = revisions.revision_id
+"""
 
-init_db()
+INSERT_BLOB_SQL = """
+    INSERT INTO blobs (hash, codec, size, body, base_hash, depth) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(hash) DO NOTHING
+"""
+
+# bulk_insert_sessions에서 digest를 기억해 둘 본문 수 (메모리 상한)
+BULK_DIGEST_MEMO = 100_000
+
+# bulk_insert_sessions 입력: (workspace_id, scope, team_key, revision_id, content, categories, last_updated)
+SessionSeed = Tuple[str, str, Optional[str], str, str, List[str], Optional[str]]
+
+UPSERT_REVISION_SQL = """
+    INSERT INTO revisions (workspace_id, revision_id) VALUES (?, ?)
+    ON CONFLICT(workspace_id) DO UPDATE SET revision_id = excluded.revision_id
+"""
 
 
 def json_dump(data) -> str:
@@ -88,18 +76,43 @@ def json_load(value: Optional[str], default):
 
 
 class MemoryRepository:
+    """Workspace/session/token 저장소. SQL 실행은 StorageBackend에 위임합니다."""
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        blob_codec: str = "zlib",
+        blob_dictionary: bool = True,
+        snapshot_interval: int = 16,
+    ):
+        self.backend = backend
+        self.blob_codec = blob_codec
+        self.blob_dictionary = blob_dictionary
+        self.snapshot_interval = snapshot_interval
+        self._texts: LRUCache[str] = LRUCache("blob_text", TEXT_CACHE_SIZE)
+
+    def init_db(self) -> None:
+        """남은 스키마 마이그레이션을 적용합니다 (`app/migrations.py`)."""
+        migrate(self.backend)
+
+    @staticmethod
+    def _session_order(direction: str) -> str:
+        """히스토리 순서: last_updated, 같은 시각(대량 적재)은 seq (migrations 12: idx_sessions_history).
+
+        seq는 저장 순서라서 가져오기로 들어온 과거 세션은 seq가 커도 시각대로 끼워집니다.
+        """
+        return f"last_updated {direction}, seq {direction}"
+
+    @timed("db.create_workspace")
     def create_workspace(self, name: str, doc_personal_id: str, team_map: dict) -> Workspace:
         workspace_id = str(uuid.uuid4())
         categories = ["GENERAL"]
-        with conn:
-            conn.execute(
+        with self.backend.transaction() as tx:
+            tx.execute(
                 "INSERT INTO workspaces (id, name, doc_personal_id, team_map, categories) VALUES (?, ?, ?, ?, ?)",
                 (workspace_id, name, doc_personal_id, json_dump(team_map or {}), json_dump(categories)),
             )
-            conn.execute(
-                "INSERT OR REPLACE INTO revisions (workspace_id, revision_id) VALUES (?, ?)",
-                (workspace_id, "init"),
-            )
+            tx.execute(UPSERT_REVISION_SQL, (workspace_id, "init"))
         return Workspace(
             id=workspace_id,
             name=name,
@@ -108,9 +121,9 @@ class MemoryRepository:
             categories=categories,
         )
 
+    @timed("db.list_workspaces")
     def list_workspaces(self) -> List[Workspace]:
-        cur = conn.execute("SELECT * FROM workspaces")
-        rows = cur.fetchall()
+        rows = self.backend.fetchall("SELECT * FROM workspaces")
         return [
             Workspace(
                 id=row["id"],
@@ -122,9 +135,9 @@ class MemoryRepository:
             for row in rows
         ]
 
+    @timed("db.get_workspace")
     def get_workspace(self, workspace_id: str) -> Optional[Workspace]:
-        cur = conn.execute("SELECT * FROM workspaces WHERE id = ?", (workspace_id,))
-        row = cur.fetchone()
+        row = self.backend.fetchone("SELECT * FROM workspaces WHERE id = ?", (workspace_id,))
         if not row:
             return None
         return Workspace(
@@ -135,20 +148,176 @@ class MemoryRepository:
             categories=json_load(row["categories"], []),
         )
 
-    def get_latest_session(self, workspace_id: str) -> Optional[sqlite3.Row]:
-        cur = conn.execute(
-            "SELECT * FROM sessions WHERE workspace_id = ? ORDER BY datetime(last_updated) DESC LIMIT 1",
+    # last_updated는 항상 datetime.isoformat() 문자열이므로 문자열 정렬이 시간 순서와 같습니다.
+    @timed("db.get_latest_session")
+    def get_latest_session(self, workspace_id: str) -> Optional[Row]:
+        return self.backend.fetchone(
+            f"SELECT {SESSION_COLUMNS} FROM sessions WHERE workspace_id = ? ORDER BY {self._session_order('DESC')} LIMIT 1",
             (workspace_id,),
         )
-        return cur.fetchone()
 
-    def list_sessions(self, workspace_id: str) -> List[sqlite3.Row]:
-        cur = conn.execute(
-            "SELECT * FROM sessions WHERE workspace_id = ? ORDER BY datetime(last_updated) ASC",
+    @timed("db.list_sessions")
+    def list_sessions(self, workspace_id: str) -> List[Row]:
+        return self.backend.fetchall(
+            f"SELECT {SESSION_COLUMNS} FROM sessions WHERE workspace_id = ? ORDER BY {self._session_order('ASC')}",
             (workspace_id,),
         )
-        return cur.fetchall()
 
+    @timed("db.recent_sessions")
+    def recent_sessions(
+        self,
+        workspace_id: str,
+        limit: int,
+        scope: Optional[str] = None,
+        team_key: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> List[Row]:
+        """최근 세션 `limit`개 (최신 순). scope/team/category를 주면 그 조건에 맞는 세션만."""
+        where, params = ["workspace_id = ?"], [workspace_id]
+        if scope:
+            where.append("scope = ?")
+            params.append(scope)
+        if team_key:
+            where.append("COALESCE(team_key, '') = ?")
+            params.append(team_key)
+        if category:
+            where.append("categories LIKE ?")  # JSON 배열 문자열: ["MEETING", ...]
+            params.append(f'%"{category.upper()}"%')
+        return self.backend.fetchall(
+            f"SELECT {SESSION_COLUMNS} FROM sessions WHERE {' AND '.join(where)} "
+            f"ORDER BY {self._session_order('DESC')} LIMIT ?",
+            (*params, limit),
+        )
+
+    @timed("db.sessions_since")
+    def sessions_since(self, workspace_id: str, after_seq: Optional[int], limit: int) -> List[Row]:
+        """seq가 `after_seq`보다 큰 세션 (seq 순서, None이면 처음부터). 관련도 색인 갱신/내보내기의 keyset 페이지입니다.
+
+        seq 백필(마이그레이션 5)로 번호를 받은 이전 세션은 seq가 0 이하일 수 있습니다.
+        """
+        if after_seq is None:
+            return self.backend.fetchall(
+                f"SELECT {SESSION_COLUMNS} FROM sessions WHERE workspace_id = ? ORDER BY seq ASC LIMIT ?",
+                (workspace_id, limit),
+            )
+        return self.backend.fetchall(
+            f"SELECT {SESSION_COLUMNS} FROM sessions WHERE workspace_id = ? AND seq > ? ORDER BY seq ASC LIMIT ?",
+            (workspace_id, after_seq, limit),
+        )
+
+    @timed("db.get_sessions")
+    def get_sessions(self, session_ids: List[str]) -> List[Row]:
+        if not session_ids:
+            return []
+        placeholders = ", ".join("?" for _ in session_ids)
+        return self.backend.fetchall(
+            f"SELECT {SESSION_COLUMNS} FROM sessions WHERE id IN ({placeholders})", tuple(session_ids)
+        )
+
+    @timed("db.session_content")
+    def session_content(self, row: Row) -> str:
+        """세션 행의 본문을 blob에서 읽어 압축 해제합니다 (content_hash 이전 행은 content 컬럼 사용)."""
+        if row["content_hash"]:
+            return self.get_blob(row["content_hash"])
+        legacy = self.backend.fetchone("SELECT content FROM sessions WHERE id = ?", (row["id"],))
+        return (legacy["content"] if legacy else None) or ""
+
+    @timed("db.session_contents")
+    def session_contents(self, rows: List[Row]) -> List[str]:
+        """여러 세션의 본문 (행 순서). 스냅샷 blob은 한 번에 읽고, 델타/이전 행만 하나씩 복원합니다."""
+        digests = list({row["content_hash"] for row in rows if row["content_hash"]})
+        texts: dict[str, str] = {}
+        if digests:
+            placeholders = ", ".join("?" for _ in digests)
+            for blob in self.backend.fetchall(
+                f"SELECT hash, codec, body FROM blobs WHERE hash IN ({placeholders}) AND base_hash IS NULL", tuple(digests)
+            ):
+                texts[blob["hash"]] = decompress(blob["codec"], blob["body"])
+        return [
+            texts[row["content_hash"]] if row["content_hash"] in texts else self.session_content(row) for row in rows
+        ]
+
+    @timed("db.existing_revisions")
+    def existing_revisions(self, workspace_id: str, revision_ids: List[str]) -> Set[str]:
+        if not revision_ids:
+            return set()
+        placeholders = ", ".join("?" for _ in revision_ids)
+        rows = self.backend.fetchall(
+            f"SELECT revision_id FROM sessions WHERE workspace_id = ? AND revision_id IN ({placeholders})",
+            (workspace_id, *revision_ids),
+        )
+        return {row["revision_id"] for row in rows}
+
+    @timed("db.get_session_by_revision")
+    def get_session_by_revision(self, workspace_id: str, revision_id: str) -> Optional[Row]:
+        return self.backend.fetchone(
+            f"SELECT {SESSION_COLUMNS} FROM sessions WHERE workspace_id = ? AND revision_id = ? LIMIT 1",
+            (workspace_id, revision_id),
+        )
+
+    def get_blob(self, digest: str) -> str:
+        return self._read_blob(self.backend.fetchall, digest)
+
+    def _read_blob(self, fetchall, digest: str) -> str:
+        """스냅샷부터 델타를 순서대로 적용해 본문을 복원합니다."""
+        cached = self._cached_text(digest)
+        if cached is not None:
+            return cached
+        chain = fetchall(
+            """
+            WITH RECURSIVE chain(hash, codec, body, base_hash, depth) AS (
+                SELECT hash, codec, body, base_hash, depth FROM blobs WHERE hash = ?
+                UNION ALL
+                SELECT b.hash, b.codec, b.body, b.base_hash, b.depth FROM blobs b JOIN chain c ON b.hash = c.base_hash
+            )
+            SELECT codec, body, base_hash FROM chain ORDER BY depth ASC
+            """,
+            (digest,),
+        )
+        if not chain or chain[0]["base_hash"]:
+            raise KeyError(f"BLOB_NOT_FOUND: {digest}")
+        text = decompress(chain[0]["codec"], chain[0]["body"])
+        for link in chain[1:]:
+            text = apply_delta(text, decompress(link["codec"], link["body"]))
+        self._remember_text(digest, text)
+        return text
+
+    def _cached_text(self, digest: str) -> Optional[str]:
+        return self._texts.get(digest)
+
+    def _remember_text(self, digest: str, text: str) -> None:
+        self._texts.set(digest, text)
+
+    def _put_blob(self, tx, text: str, base_hash: Optional[str] = None) -> str:
+        digest = content_hash(text)
+        # 이미 있는 본문이면 압축을 건너뜁니다 (동시 삽입은 ON CONFLICT로 무시).
+        if tx.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone():
+            return digest
+
+        stored, stored_base, depth = text, None, 0
+        if base_hash:
+            base = tx.execute("SELECT depth FROM blobs WHERE hash = ?", (base_hash,)).fetchone()
+            if base and base["depth"] + 1 < self.snapshot_interval:
+
+                def fetchall(sql, params):
+                    return tx.execute(sql, params).fetchall()
+
+                delta = make_delta(self._read_blob(fetchall, base_hash), text)
+                if len(delta) < len(text) * DELTA_MAX_RATIO:
+                    stored, stored_base, depth = delta, base_hash, base["depth"] + 1
+
+        codec, body = compress(stored, self.blob_codec, self.blob_dictionary)
+        tx.execute(INSERT_BLOB_SQL, (digest, codec, len(text.encode("utf-8")), body, stored_base, depth))
+        self._remember_text(digest, text)
+        return digest
+
+    @staticmethod
+    def _next_seq(tx, workspace_id: str) -> int:
+        """워크스페이스의 다음 seq. 잠금은 트랜잭션이 끝날 때까지 유지되므로 blob을 쓴 뒤에 부릅니다."""
+        tx.execute(LOCK_SEQ_SQL, (workspace_id,))
+        return tx.execute(NEXT_SEQ_SQL, (workspace_id,)).fetchone()["next_seq"]
+
+    @timed("db.insert_session")
     def insert_session(
         self,
         workspace_id: str,
@@ -157,39 +326,364 @@ class MemoryRepository:
         revision_id: str,
         content: str,
         categories: List[str],
+        simhash: Optional[int] = None,
+        base_hash: Optional[str] = None,
     ) -> None:
-        with conn:
-            conn.execute(
-                """
-                INSERT INTO sessions (id, workspace_id, scope, team_key, revision_id, content, categories, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+        """세션을 저장합니다. `base_hash`(근접 중복으로 찾은 본문)가 없으면 체인의 직전 본문을 델타 기준으로 씁니다."""
+        with self.backend.transaction() as tx:
+            if base_hash is None:
+                # 같은 (workspace, scope, team) 체인의 직전 본문에 대한 델타로 저장합니다.
+                previous = tx.execute(
+                    """
+                    SELECT content_hash FROM sessions
+                    WHERE workspace_id = ? AND scope = ? AND COALESCE(team_key, '') = ? AND content_hash IS NOT NULL
+                    ORDER BY last_updated DESC LIMIT 1
+                    """,
+                    (workspace_id, scope, team_key or ""),
+                ).fetchone()
+                base_hash = previous["content_hash"] if previous else None
+            digest = self._put_blob(tx, content, base_hash)
+            seq = self._next_seq(tx, workspace_id)
+            tx.execute(
+                INSERT_SESSION_SQL,
                 (
                     str(uuid.uuid4()),
                     workspace_id,
                     scope,
                     team_key,
                     revision_id,
-                    content,
+                    digest,
                     json_dump(categories),
                     datetime.utcnow().isoformat(),
+                    seq,
+                    simhash,
                 ),
             )
-            conn.execute(
-                "INSERT OR REPLACE INTO revisions (workspace_id, revision_id) VALUES (?, ?)",
-                (workspace_id, revision_id),
+            tx.execute(UPSERT_REVISION_SQL, (workspace_id, revision_id))
+
+    @timed("db.recent_chain_sessions")
+    def recent_chain_sessions(self, workspace_id: str, scope: str, team_key: Optional[str], limit: int) -> List[Row]:
+        """같은 (workspace, scope, team) 체인의 최근 세션과 SimHash 서명 (최신 순, 서명이 없는 이전 행 포함)."""
+        return self.backend.fetchall(
+            """
+            SELECT id, revision_id, content_hash, simhash FROM sessions
+            WHERE workspace_id = ? AND scope = ? AND COALESCE(team_key, '') = ? AND content_hash IS NOT NULL
+            ORDER BY last_updated DESC LIMIT ?
+            """,
+            (workspace_id, scope, team_key or "", limit),
+        )
+
+    @timed("db.merge_session")
+    def merge_session(
+        self,
+        session_id: str,
+        base_hash: str,
+        workspace_id: str,
+        revision_id: str,
+        content: str,
+        categories: List[str],
+        simhash: int,
+    ) -> bool:
+        """근접 중복 본문을 새 세션 대신 기존 세션에 덮어씁니다 (본문은 기존 본문에 대한 델타).
+
+        그 사이 다른 요청이 세션을 바꿨으면(content_hash 불일치) False를 반환하고 아무것도 바꾸지 않습니다.
+        """
+        with self.backend.transaction() as tx:
+            digest = self._put_blob(tx, content, base_hash)
+            seq = self._next_seq(tx, workspace_id)
+            cur = tx.execute(
+                """
+                UPDATE sessions SET revision_id = ?, content_hash = ?, categories = ?, last_updated = ?, seq = ?, simhash = ?
+                WHERE id = ? AND content_hash = ?
+                """,
+                (
+                    revision_id,
+                    digest,
+                    json_dump(categories),
+                    datetime.utcnow().isoformat(),
+                    seq,
+                    simhash,
+                    session_id,
+                    base_hash,
+                ),
             )
+            if not cur.rowcount:
+                return False
+            tx.execute(UPSERT_REVISION_SQL, (workspace_id, revision_id))
+            return True
+
+    @timed("db.bulk_insert_sessions")
+    def bulk_insert_sessions(self, sessions: Iterable[SessionSeed], chunk_size: int = 10_000) -> int:
+        """시딩/이관용 대량 저장. 청크마다 트랜잭션 하나와 executemany를 사용합니다.
+
+        본문은 델타 없이 스냅샷 blob으로 저장하고 같은 본문은 한 번만, 이미 저장된 본문은 압축하지 않습니다.
+        last_updated가 None이면 현재 시각을 씁니다. 저장한 세션 수를 반환합니다.
+        워크스페이스의 현재 리비전은 청크의 가장 새 세션이 기존 최신 세션보다 새로울 때만 옮깁니다
+        (이미 세션이 있는 워크스페이스에 과거 히스토리를 가져와도 최신 세션/리비전이 뒤로 가지 않음).
+        """
+        iterator = iter(sessions)
+        # 본문 → digest, 카테고리 → JSON. 같은 값이 반복되면 해시/직렬화를 다시 하지 않습니다.
+        digests: dict[str, str] = {}
+        category_json: dict[tuple, str] = {}
+        total = 0
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return total
+            now = datetime.utcnow().isoformat()
+            # fresh: 이 호출에서 처음 본 본문 (digest → 본문), newest: 워크스페이스 → (last_updated, revision_id)
+            fresh, rows, newest = {}, [], {}
+            for workspace_id, scope, team_key, revision_id, content, categories, last_updated in chunk:
+                digest = digests.get(content)
+                if digest is None:
+                    if len(digests) >= BULK_DIGEST_MEMO:
+                        digests.clear()  # 이미 저장된 본문은 ON CONFLICT로 무시됩니다.
+                    digest = digests[content] = content_hash(content)
+                    fresh[digest] = content
+                key = tuple(categories)
+                encoded = category_json.get(key)
+                if encoded is None:
+                    encoded = category_json[key] = json_dump(categories)
+                # seq는 트랜잭션 안에서 채웁니다. simhash는 None: 대량 적재 세션은 근접 중복 비교 대상에서 빠집니다.
+                rows.append(
+                    [
+                        str(uuid.uuid4()),
+                        workspace_id,
+                        scope,
+                        team_key,
+                        revision_id,
+                        digest,
+                        encoded,
+                        last_updated or now,
+                        None,
+                        None,
+                    ]
+                )
+                if workspace_id not in newest or (last_updated or now) >= newest[workspace_id][0]:
+                    newest[workspace_id] = (last_updated or now, revision_id)
+            # 이미 저장된 본문(다른 워크스페이스, 다시 실행한 가져오기)은 압축하지 않습니다.
+            stored = self._stored_blobs(self.backend.fetchall, list(fresh))
+            blobs = [self._snapshot_blob(digest, content) for digest, content in fresh.items() if digest not in stored]
+            with self.backend.transaction() as tx:
+                # 확인한 뒤 정리 작업(collect_garbage_blobs)이 지운 blob은 트랜잭션 안에서 다시 넣습니다.
+                gone = stored - self._stored_blobs(lambda sql, params: tx.execute(sql, params).fetchall(), list(stored))
+                blobs += [self._snapshot_blob(digest, fresh[digest]) for digest in gone]
+                if blobs:
+                    tx.executemany(INSERT_BLOB_SQL, blobs)
+                # 여러 워크스페이스를 잠글 때 교착이 없도록 id 순서로 잠급니다.
+                next_seq = {workspace_id: self._next_seq(tx, workspace_id) for workspace_id in sorted(newest)}
+                moved = []
+                for workspace_id, (last_updated, revision_id) in newest.items():
+                    current = tx.execute(
+                        f"SELECT last_updated FROM sessions WHERE workspace_id = ? ORDER BY {self._session_order('DESC')} LIMIT 1",
+                        (workspace_id,),
+                    ).fetchone()
+                    # 같은 시각이면 seq가 큰 새 행이 최신입니다.
+                    if current is None or last_updated >= current["last_updated"]:
+                        moved.append((workspace_id, revision_id))
+                for row in rows:
+                    row[8] = next_seq[row[1]]
+                    next_seq[row[1]] += 1
+                tx.executemany(INSERT_SESSION_SQL, rows)
+                if moved:
+                    tx.executemany(UPSERT_REVISION_SQL, moved)
+            total += len(rows)
 
+    @staticmethod
+    def _stored_blobs(fetchall, digests: List[str], batch: int = 500) -> Set[str]:
+        stored: Set[str] = set()
+        for start in range(0, len(digests), batch):
+            part = digests[start : start + batch]
+            placeholders = ", ".join("?" for _ in part)
+            stored.update(row["hash"] for row in fetchall(f"SELECT hash FROM blobs WHERE hash IN ({placeholders})", part))
+        return stored
+
+    def _snapshot_blob(self, digest: str, content: str) -> tuple:
+        codec, body = compress(content, self.blob_codec, self.blob_dictionary)
+        return (digest, codec, len(content.encode("utf-8")), body, None, 0)
+
+    # === 보관/압축 (services/retention.py) ===
+
+    @timed("db.get_retention_policy")
+    def get_retention_policy(self, workspace_id: str) -> Optional[Row]:
+        return self.backend.fetchone(
+            "SELECT keep_last_per_category, max_age_days FROM retention_policies WHERE workspace_id = ?",
+            (workspace_id,),
+        )
+
+    @timed("db.set_retention_policy")
+    def set_retention_policy(
+        self, workspace_id: str, keep_last_per_category: Optional[int], max_age_days: Optional[int]
+    ) -> None:
+        with self.backend.transaction() as tx:
+            tx.execute(
+                """
+                INSERT INTO retention_policies (workspace_id, keep_last_per_category, max_age_days) VALUES (?, ?, ?)
+                ON CONFLICT(workspace_id) DO UPDATE SET
+                    keep_last_per_category = excluded.keep_last_per_category,
+                    max_age_days = excluded.max_age_days
+                """,
+                (workspace_id, keep_last_per_category, max_age_days),
+            )
+
+    @timed("db.delete_sessions")
+    def delete_sessions(self, session_ids: List[str]) -> int:
+        if not session_ids:
+            return 0
+        placeholders = ", ".join("?" for _ in session_ids)
+        with self.backend.transaction() as tx:
+            cur = tx.execute(f"DELETE FROM sessions WHERE id IN ({placeholders})", tuple(session_ids))
+            return cur.rowcount
+
+    @timed("db.rebase_blob")
+    def rebase_blob(self, digest: str) -> bool:
+        """델타 blob을 전체 스냅샷으로 다시 저장해 이전 체인과의 연결을 끊습니다."""
+        row = self.backend.fetchone("SELECT depth FROM blobs WHERE hash = ?", (digest,))
+        if not row or not row["depth"]:
+            return False
+        codec, body = compress(self.get_blob(digest), self.blob_codec, self.blob_dictionary)
+        with self.backend.transaction() as tx:
+            tx.execute(
+                "UPDATE blobs SET codec = ?, body = ?, base_hash = NULL, depth = 0 WHERE hash = ?",
+                (codec, body, digest),
+            )
+        return True
+
+    @timed("db.collect_garbage_blobs")
+    def collect_garbage_blobs(self) -> int:
+        """어떤 세션에서도 (델타 체인을 통해서도) 참조되지 않는 blob을 삭제합니다."""
+        with self.backend.transaction() as tx:
+            cur = tx.execute(
+                """
+                DELETE FROM blobs WHERE hash NOT IN (
+                    WITH RECURSIVE live(hash) AS (
+                        SELECT content_hash FROM sessions WHERE content_hash IS NOT NULL
+                        UNION
+                        SELECT b.base_hash FROM blobs b JOIN live l ON b.hash = l.hash WHERE b.base_hash IS NOT NULL
+                    )
+                    SELECT hash FROM live
+                )
+                """
+            )
+            return cur.rowcount
+
+    @timed("db.purge_expired_tokens")
+    def purge_expired_tokens(self, now: datetime) -> int:
+        with self.backend.transaction() as tx:
+            return tx.execute("DELETE FROM tokens WHERE expires_at < ?", (now.isoformat(),)).rowcount
+
+    @timed("db.claim_idempotency_key")
+    def claim_idempotency_key(
+        self, workspace_id: str, key: str, request_hash: str, now: datetime, expired_before: datetime, stale_before: datetime
+    ) -> Tuple[bool, Optional[Row]]:
+        """멱등성 키를 선점합니다. (선점 여부, 이미 있던 행)을 반환합니다.
+
+        만료된 행(expired_before 이전)과 끝나지 않은 채 오래된 처리 중 행(stale_before 이전, 처리하던 워커가 죽은 경우)은
+        지우고 다시 선점합니다. 이미 있던 행은 request_hash와 response(처리 중이면 NULL)를 담습니다.
+        """
+        with self.backend.transaction() as tx:
+            tx.execute(
+                """
+                DELETE FROM idempotency_keys
+                WHERE workspace_id = ? AND idempotency_key = ?
+                  AND (created_at < ? OR (response IS NULL AND created_at < ?))
+                """,
+                (workspace_id, key, expired_before.isoformat(), stale_before.isoformat()),
+            )
+            claimed = tx.execute(
+                """
+                INSERT INTO idempotency_keys (workspace_id, idempotency_key, request_hash, response, created_at)
+                VALUES (?, ?, ?, NULL, ?)
+                ON CONFLICT(workspace_id, idempotency_key) DO NOTHING
+                """,
+                (workspace_id, key, request_hash, now.isoformat()),
+            ).rowcount
+        if claimed:
+            return True, None
+        existing = self.backend.fetchone(
+            "SELECT request_hash, response FROM idempotency_keys WHERE workspace_id = ? AND idempotency_key = ?",
+            (workspace_id, key),
+        )
+        return False, existing
+
+    @timed("db.complete_idempotency_key")
+    def complete_idempotency_key(self, workspace_id: str, key: str, response_json: str) -> None:
+        with self.backend.transaction() as tx:
+            tx.execute(
+                "UPDATE idempotency_keys SET response = ? WHERE workspace_id = ? AND idempotency_key = ?",
+                (response_json, workspace_id, key),
+            )
+
+    def release_idempotency_key(self, workspace_id: str, key: str) -> None:
+        """저장하지 않고 끝난 요청(충돌, 오류)의 키를 풀어 같은 키로 다시 시도할 수 있게 합니다."""
+        with self.backend.transaction() as tx:
+            tx.execute(
+                "DELETE FROM idempotency_keys WHERE workspace_id = ? AND idempotency_key = ? AND response IS NULL",
+                (workspace_id, key),
+            )
+
+    @timed("db.purge_idempotency_keys")
+    def purge_idempotency_keys(self, expired_before: datetime) -> int:
+        with self.backend.transaction() as tx:
+            cur = tx.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (expired_before.isoformat(),))
+            return cur.rowcount
+
+    def get_doc_sync_token(self, workspace_id: str) -> Optional[str]:
+        row = self.backend.fetchone("SELECT page_token FROM doc_sync_state WHERE workspace_id = ?", (workspace_id,))
+        return row["page_token"] if row else None
+
+    def save_doc_sync_token(self, workspace_id: str, page_token: str) -> None:
+        with self.backend.transaction() as tx:
+            tx.execute(
+                """
+                INSERT INTO doc_sync_state (workspace_id, page_token, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(workspace_id) DO UPDATE SET page_token = excluded.page_token, updated_at = excluded.updated_at
+                """,
+                (workspace_id, page_token, datetime.utcnow().isoformat()),
+            )
+
+    @timed("db.known_doc_blocks")
+    def known_doc_blocks(self, workspace_id: str, doc_id: str) -> Set[str]:
+        rows = self.backend.fetchall(
+            "SELECT block_hash FROM doc_blocks WHERE workspace_id = ? AND doc_id = ?", (workspace_id, doc_id)
+        )
+        return {row["block_hash"] for row in rows}
+
+    def baselined_docs(self, workspace_id: str) -> Set[str]:
+        """기준선을 기록한 문서들 (doc_blocks.BASELINE_MARK 행이 있는 doc_id)."""
+        rows = self.backend.fetchall(
+            "SELECT doc_id FROM doc_blocks WHERE workspace_id = ? AND block_hash = ?", (workspace_id, BASELINE_MARK)
+        )
+        return {row["doc_id"] for row in rows}
+
+    def remember_doc_blocks(self, workspace_id: str, doc_id: str, block_hashes: Iterable[str]) -> None:
+        now = datetime.utcnow().isoformat()
+        with self.backend.transaction() as tx:
+            tx.executemany(
+                """
+                INSERT INTO doc_blocks (workspace_id, doc_id, block_hash, created_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(workspace_id, doc_id, block_hash) DO NOTHING
+                """,
+                [(workspace_id, doc_id, block_hash, now) for block_hash in block_hashes],
+            )
+
+    @timed("db.prune_stale_revisions")
+    def prune_stale_revisions(self) -> int:
+        with self.backend.transaction() as tx:
+            cur = tx.execute("DELETE FROM revisions WHERE workspace_id NOT IN (SELECT id FROM workspaces)")
+            return cur.rowcount
+
+    @timed("db.current_revision")
     def current_revision(self, workspace_id: str) -> str:
-        cur = conn.execute("SELECT revision_id FROM revisions WHERE workspace_id = ?", (workspace_id,))
-        row = cur.fetchone()
+        row = self.backend.fetchone("SELECT revision_id FROM revisions WHERE workspace_id = ?", (workspace_id,))
         return row["revision_id"] if row else "init"
 
+    @timed("db.create_token")
     def create_token(self, workspace_id: str, scopes: List[str]) -> TokenResponse:
         token_value = uuid.uuid4().hex
         expires_at = datetime.utcnow() + timedelta(days=30)
-        with conn:
-            conn.execute(
+        with self.backend.transaction() as tx:
+            tx.execute(
                 "INSERT INTO tokens (token, workspace_id, scopes, expires_at) VALUES (?, ?, ?, ?)",
                 (token_value, workspace_id, json_dump(scopes or []), expires_at.isoformat()),
             )
@@ -197,11 +691,12 @@ class MemoryRepository:
 
     # === [아래 3개 메서드 추가됨] ===
 
+    @timed("db.save_google_token")
     def save_google_token(self, workspace_id: str, token_json: str):
         """[추가] Google 토큰을 저장 (INSERT 또는 UPDATE)합니다."""
         try:
-            with conn:
-                conn.execute(
+            with self.backend.transaction() as tx:
+                tx.execute(
                     """
                     INSERT INTO google_tokens (workspace_id, token_json) 
                     VALUES (?, ?)
@@ -209,21 +704,29 @@ class MemoryRepository:
                     """,
                     (str(workspace_id), token_json)
                 )
-            print(f"Workspace {workspace_id}의 Google 토큰 저장/갱신 성공.")
-        except Exception as e:
-            print(f"[ERROR] save_google_token 실패: {e}")
+            # 다른 워커가 이전 토큰(갱신 전 access token)을 쓰지 않도록 공유 캐시도 함께 바꿉니다.
+            shared_cache.set("google_token", str(workspace_id), token_json, settings.google_token_ttl_seconds)
+            logger.info("Google 토큰 저장/갱신 성공", extra={"workspace_id": str(workspace_id)})
+        except Exception:
+            shared_cache.delete("google_token", str(workspace_id))
+            logger.exception("save_google_token 실패", extra={"workspace_id": str(workspace_id)})
 
+    @timed("db.get_google_token")
     def get_google_token(self, workspace_id: str) -> str | None:
-        """[추가] Google 토큰을 조회합니다."""
+        """[추가] Google 토큰을 조회합니다 (공유 캐시 → DB)."""
+        cached = shared_cache.get("google_token", str(workspace_id))
+        if cached is not None:
+            return cached
         try:
-            cur = conn.execute(
+            row = self.backend.fetchone(
                 "SELECT token_json FROM google_tokens WHERE workspace_id = ?",
                 (str(workspace_id),)
             )
-            row = cur.fetchone()
+            if row:
+                shared_cache.set("google_token", str(workspace_id), row["token_json"], settings.google_token_ttl_seconds)
             return row["token_json"] if row else None
-        except Exception as e:
-            print(f"[ERROR] get_google_token 실패: {e}")
+        except Exception:
+            logger.exception("get_google_token 실패", extra={"workspace_id": str(workspace_id)})
             return None
 
     def update_google_token(self, workspace_id: str, new_token_json: str):
@@ -233,4 +736,18 @@ class MemoryRepository:
         self.save_google_token(workspace_id, new_token_json)
 
 
-repository = MemoryRepository()
\ No newline at end of file
+repository = MemoryRepository(
+    create_backend(settings),
+    blob_codec=settings.blob_codec,
+    blob_dictionary=settings.blob_dictionary,
+    snapshot_interval=settings.delta_snapshot_interval,
+)
+
+
+def init_db() -> None:
+    """스키마 생성/보강. 임포트 시점이 아니라 앱 lifespan(또는 CLI 진입점)에서 호출합니다.
+
+    여러 워커가 동시에 시작해도 DDL(특히 ALTER TABLE)이 겹치지 않도록 파일 락 안에서 실행합니다.
+    """
+    with file_lock(settings.run_dir / "schema.lock"):
+        repository.init_db()
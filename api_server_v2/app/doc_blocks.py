@@ -0,0 +1,31 @@
+"""Google Docs 본문을 핸드오프 블록으로 나누기 (Apps Script splitBlocks와 같은 규칙).
+
+핸드오프는 `---` 한 줄로 구분됩니다 (Apps Script appendHandoff, GoogleDocsAdapter.append_handoff).
+블록은 앞뒤 공백과 줄 끝 공백을 지운 본문의 sha256으로 식별합니다. 사람이 블록을 고치면 해시가 바뀌어
+새 블록으로 보입니다.
+"""
+from __future__ import annotations
+
+import re
+from typing import List
+
+from .storage.blobs import content_hash
+
+_SEPARATOR = re.compile(r"^---[ \t]*$", re.MULTILINE)
+# doc_blocks에 해시 대신 넣는 표시: 이 문서의 기준선을 읽었음 (빈 문서도 기준선이 있어야 첫 블록을 가져옵니다)
+BASELINE_MARK = ""
+
+
+def normalize_block(text: str) -> str:
+    text = text.replace("\r\n", "\n").replace("\x0b", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip()
+
+
+def split_blocks(text: str) -> List[str]:
+    """문서 순서대로 비어 있지 않은 블록들."""
+    blocks = (normalize_block(block) for block in _SEPARATOR.split(text.replace("\r\n", "\n")))
+    return [block for block in blocks if block]
+
+
+def block_hash(text: str) -> str:
+    return content_hash(normalize_block(text))
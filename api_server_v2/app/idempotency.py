@@ -0,0 +1,38 @@
+"""POST /sessions 멱등성 키.
+
+클라이언트가 타임아웃 뒤 같은 핸드오프를 다시 보내도 세션 저장/리비전 갱신/Google Docs 추가는 한 번만 일어나고,
+재전송에는 처음 응답이 그대로 돌아갑니다 (`Idempotent-Replayed: true` 헤더).
+
+- 키: `Idempotency-Key` 헤더. 없으면 요청 내용(scope, team_key, 기준 revision, 본문)의 해시로 만듭니다.
+- 같은 키에 다른 내용을 보내면 422, 처음 요청이 아직 처리 중이면 409입니다.
+- 충돌(409 CONFLICT)이나 오류로 끝난 요청은 키를 풀어 두므로 같은 키로 다시 시도할 수 있습니다.
+- 키는 `IDEMPOTENCY_TTL_SECONDS` 동안 유지되고 보관/압축 작업(retention)이 지웁니다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+
+from .schemas import SessionCreateRequest
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+@dataclass(frozen=True)
+class IdempotentReplay:
+    body: str  # 처음 요청의 응답 JSON
+
+
+class IdempotencyError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def request_hash(payload: SessionCreateRequest) -> str:
+    """요청 내용의 지문. 헤더가 없을 때의 키이자, 같은 키로 다른 내용을 보냈는지 확인하는 값입니다."""
+    fields = [payload.scope, payload.team_key or "", payload.revision or "", payload.content]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode("utf-8")).hexdigest()
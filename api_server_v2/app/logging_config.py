@@ -0,0 +1,163 @@
+"""Structured JSON logging with a queue-based handler.
+
+요청 스레드는 로그 레코드를 큐에 넣기만 하고, 실제 출력(I/O)은 QueueListener
+스레드가 담당합니다. 각 레코드에는 request_id / workspace_id 상관관계 ID가 붙습니다.
+트레이싱이 켜져 있으면 trace_id도 함께 기록됩니다.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .tracing import current_trace_id
+
+PACKAGE = __name__.rpartition(".")[0]  # "app" (또는 테스트에서 "api_server_v2.app")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+workspace_id_var: ContextVar[Optional[str]] = ContextVar("workspace_id", default=None)
+
+# LogRecord 기본 속성 (extra로 넘긴 값만 JSON 필드로 내보내기 위해 제외)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_EXC_FORMATTER = logging.Formatter()
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def bind_workspace(workspace_id: Optional[str]) -> None:
+    """현재 요청 컨텍스트의 로그에 workspace_id를 붙입니다."""
+    workspace_id_var.set(workspace_id)
+
+
+class ContextFilter(logging.Filter):
+    """큐에 넣기 전에(요청 스레드에서) 컨텍스트 값을 레코드에 복사합니다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        if getattr(record, "workspace_id", None) is None:
+            record.workspace_id = workspace_id_var.get()
+        if getattr(record, "trace_id", None) is None:
+            record.trace_id = current_trace_id()
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """기본 prepare()는 트레이스백을 msg에 합쳐 버리므로, exc_text로 따로 넘깁니다."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and value is not None:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """`adapters.google_docs=WARNING,db=DEBUG` 형식을 {로거 이름: 레벨}로 변환합니다."""
+    levels: Dict[str, str] = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        name, level = name.strip(), level.strip().upper()
+        if not name or not level:
+            continue
+        if name != PACKAGE and not name.startswith(PACKAGE + "."):
+            name = f"{PACKAGE}.{name}"
+        levels[name] = level
+    return levels
+
+
+def configure_logging(settings) -> None:
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.log_format == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s %(workspace_id)s] %(message)s")
+        )
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger(PACKAGE)
+    root.handlers[:] = [queue_handler]
+    root.setLevel(settings.log_level.upper())
+    root.propagate = False
+    for name, level in parse_levels(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """남은 레코드를 모두 출력하고 리스너 스레드를 종료합니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestContextMiddleware:
+    """`X-Request-ID` 헤더(없으면 새로 발급)를 로그 컨텍스트와 응답 헤더에 싣는 ASGI 미들웨어."""
+
+    header = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1") for key, value in scope["headers"] if key == self.header), None
+        )
+        request_id = (request_id or uuid.uuid4().hex)[:128]
+        token = request_id_var.set(request_id)
+        workspace_token = workspace_id_var.set(None)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(self.header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+            workspace_id_var.reset(workspace_token)
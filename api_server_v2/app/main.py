@@ -1,21 +1,66 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from . import compression, metrics, profiling, tracing
+from .cache import shared_cache
 from .config import settings
+from .db import init_db
+from .logging_config import RequestContextMiddleware, configure_logging, shutdown_logging
 from .routes import sessions, tokens, workspaces
 from .routes import auth  # 1. 방금 만든 auth 라우터 임포트
+from .services.doc_sync import doc_sync_service
+from .services.retention import retention_service
+from .workers import LeaderLock
+
+configure_logging(settings)
+
+# 멀티 워커에서는 락을 잡은 워커 하나만 보관/압축 작업을 실행합니다.
+compaction_leader = LeaderLock(settings.run_dir / "compaction.lock")
+doc_sync_leader = LeaderLock(settings.run_dir / "doc_sync.lock")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging(settings)  # 이전 lifespan 종료 후 재시작된 경우 리스너를 다시 띄웁니다.
+    init_db()
+    # 보관/압축 작업은 별도 스레드에서 주기적으로 실행됩니다 (COMPACTION_INTERVAL_SECONDS=0이면 비활성화).
+    if settings.compaction_interval_seconds > 0 and compaction_leader.acquire():
+        retention_service.start(settings.compaction_interval_seconds)
+    # Google Docs 역방향 동기화도 워커 하나만 실행합니다 (DOC_SYNC_INTERVAL_SECONDS=0이면 비활성화).
+    if settings.doc_sync_interval_seconds > 0 and doc_sync_leader.acquire():
+        doc_sync_service.start(settings.doc_sync_interval_seconds)
+    yield
+    doc_sync_service.stop()
+    doc_sync_leader.release()
+    retention_service.stop()
+    compaction_leader.release()
+    shared_cache.close()
+    tracing.shutdown_tracing()
+    shutdown_logging()
+
 
 app = FastAPI(
     title=settings.app_name,
     version="0.1.0",
     description="Reference FastAPI implementation for Memory Hub v2",
+    lifespan=lifespan,
 )
 
+app.router.route_class = profiling.ProfiledRoute
+
+compression.install(app)
+metrics.install(app)
+tracing.install(app)
+profiling.install(app)
+app.add_middleware(RequestContextMiddleware)
+
 app.include_router(workspaces.router)
 app.include_router(sessions.router)
 app.include_router(tokens.router)
 app.include_router(auth.router)  # 2. auth 라우터 포함
 
-
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
@@ -0,0 +1,164 @@
+"""Prometheus metrics and per-stage latency instrumentation.
+
+`METRICS_ENABLED=true`이고 `prometheus_client`가 설치된 경우에만 활성화됩니다.
+비활성화 상태에서는 `timed`가 함수를 그대로 반환하고 `stage`는 공유 nullcontext를
+돌려주므로 요청 경로에 추가 비용이 거의 없습니다.
+
+`timed`/`stage`는 트레이싱(`tracing.py`)이 켜져 있으면 같은 이름의 span도 엽니다.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Callable, TypeVar
+
+from . import tracing
+from .config import settings
+
+F = TypeVar("F", bound=Callable)
+
+# 비활성화 상태에서는 prometheus_client를 임포트하지 않습니다 (기동 시간).
+prometheus_client = None
+if settings.metrics_enabled:
+    try:
+        import prometheus_client
+    except ImportError:  # pragma: no cover - optional dependency
+        logging.getLogger(__name__).warning("METRICS_ENABLED=true 이지만 prometheus_client가 없어 메트릭을 비활성화합니다.")
+
+ENABLED = prometheus_client is not None
+
+_NOOP = nullcontext()
+
+if ENABLED:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "memoryhub_request_seconds",
+        "HTTP request latency by route",
+        ["method", "route", "status"],
+    )
+    STAGE_LATENCY = prometheus_client.Histogram(
+        "memoryhub_stage_seconds",
+        "Latency of internal stages (db, adapter init, token refresh, Google calls)",
+        ["stage"],
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    )
+    CONFLICTS = prometheus_client.Counter("memoryhub_conflicts_total", "Revision conflicts on push")
+    CACHE_EVENTS = prometheus_client.Counter("memoryhub_cache_events_total", "Cache lookups", ["cache", "result"])
+    GOOGLE_ERRORS = prometheus_client.Counter("memoryhub_google_errors_total", "Google API errors", ["operation"])
+
+
+@contextmanager
+def _observe(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(name).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def _observe_traced(name: str, attributes):
+    with ExitStack() as stack:
+        stack.enter_context(tracing.span(name, **attributes))
+        if ENABLED:
+            stack.enter_context(_observe(name))
+        yield
+
+
+def stage(name: str, **attributes):
+    """`with stage("google.fetch_meta", doc_id=...):` 형태로 구간 지연 시간을 기록합니다.
+
+    attributes는 트레이싱이 켜진 경우에만 span 속성으로 쓰입니다.
+    """
+    if tracing.ENABLED:
+        return _observe_traced(name, attributes)
+    return _observe(name) if ENABLED else _NOOP
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """메서드 전체를 하나의 stage로 기록하는 데코레이터 (비활성화 시 원본 함수 그대로)."""
+
+    def decorator(func: F) -> F:
+        func = tracing.traced(name)(func)
+        if not ENABLED:
+            return func
+        histogram = STAGE_LATENCY.labels(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record_conflict() -> None:
+    if ENABLED:
+        CONFLICTS.inc()
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    if ENABLED:
+        CACHE_EVENTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_google_error(operation: str) -> None:
+    if ENABLED:
+        GOOGLE_ERRORS.labels(operation).inc()
+
+
+class MetricsMiddleware:
+    """라우트 템플릿(`/sessions/latest` 등) 단위로 요청 지연 시간을 기록하는 ASGI 미들웨어."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], path, str(status["code"])).observe(
+                time.perf_counter() - started
+            )
+
+
+def install(app) -> None:
+    """메트릭이 활성화된 경우에만 미들웨어와 `/metrics` 엔드포인트를 등록합니다."""
+    if not ENABLED:
+        return
+    from fastapi import Response
+
+    app.add_middleware(MetricsMiddleware)
+
+    registry = prometheus_client.REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # 멀티 워커: 워커별로 기록한 파일을 합쳐서 내보냅니다 (어느 워커가 응답해도 같은 값).
+        from prometheus_client import multiprocess
+
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics_endpoint():
+        return Response(prometheus_client.generate_latest(registry), media_type=prometheus_client.CONTENT_TYPE_LATEST)
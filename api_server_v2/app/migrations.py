@@ -0,0 +1,446 @@
+"""버전 관리되는 스키마 마이그레이션.
+
+    cd api_server_v2
+    python -m app.migrations            # 남은 마이그레이션 적용
+    python -m app.migrations --status   # 적용 상태만 출력
+
+`schema_version` 테이블에 적용한 버전을 기록하고 `MIGRATIONS`를 버전 순서대로 한 번씩 실행합니다.
+마이그레이션 하나는 다음 순서로 진행됩니다.
+1. operations: DDL (테이블/컬럼 추가). 한 트랜잭션에서 실행하며 이미 있는 객체는 건너뜁니다.
+2. indexes: 인덱스 생성. PostgreSQL에서는 `CREATE INDEX CONCURRENTLY`로 쓰기를 막지 않습니다.
+3. backfill: 기존 행 채우기. 배치마다 별도 트랜잭션으로 나눠 실행해 API 쓰기가 사이사이 끼어들 수 있습니다.
+4. `schema_version` 기록. 새 컬럼에 의존하는 읽기 경로는 이 기록 이후에만 켭니다.
+
+기존 DB(이 모듈 이전에 만든 `memory.db`)는 1~4번이 이미 있는 객체를 건너뛰고 버전만 기록됩니다.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+from .storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 5_000
+BACKFILL_PAUSE_S = 0.01  # 배치 사이 대기 (SQLite 쓰기 잠금을 API 요청에 양보)
+
+
+@dataclass(frozen=True)
+class AddColumn:
+    """컬럼이 없을 때만 `ALTER TABLE ... ADD COLUMN`을 실행합니다."""
+
+    table: str
+    column: str
+    column_type: str
+
+
+@dataclass(frozen=True)
+class CreateIndex:
+    name: str
+    table: str
+    columns: str
+    unique: bool = False
+
+
+Operation = Union[str, AddColumn]
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    operations: Sequence[Operation] = ()
+    indexes: Sequence[CreateIndex] = ()
+    # (backend, batch_size) → 배치마다 갱신한 행 수. 배치 하나가 트랜잭션 하나입니다.
+    backfill: Optional[Callable[[StorageBackend, int], Iterator[int]]] = field(default=None, compare=False)
+
+
+def backfill_session_seq(backend: StorageBackend, batch_size: int) -> Iterator[int]:
+    """seq가 없는 세션에 워크스페이스별 순번을 채웁니다. 배치마다 갱신한 행 수를 내보냅니다.
+
+    새 세션은 `MAX(seq) + 1`을 받으므로 기존 행은 최신 것부터 `MIN(seq) - 1`로 내려가며 채웁니다.
+    백필 중에 들어온 세션은 항상 기존 행보다 큰 seq를 가지며, 중단 후 다시 실행하면 이어서 채웁니다.
+    """
+    pending = backend.fetchall("SELECT DISTINCT workspace_id FROM sessions WHERE seq IS NULL")
+    for workspace_id in [row["workspace_id"] for row in pending]:
+        found = backend.fetchone("SELECT MIN(seq) AS low FROM sessions WHERE workspace_id = ?", (workspace_id,))
+        low = found["low"] if found and found["low"] is not None else 1
+        cursor = None  # (last_updated, id): 이전 배치의 마지막 행 (최신 → 과거 순서로 진행)
+        while True:
+            if cursor is None:
+                rows = backend.fetchall(
+                    """
+                    SELECT id, last_updated, seq FROM sessions WHERE workspace_id = ?
+                    ORDER BY last_updated DESC, id DESC LIMIT ?
+                    """,
+                    (workspace_id, batch_size),
+                )
+            else:
+                rows = backend.fetchall(
+                    """
+                    SELECT id, last_updated, seq FROM sessions
+                    WHERE workspace_id = ? AND (last_updated < ? OR (last_updated = ? AND id < ?))
+                    ORDER BY last_updated DESC, id DESC LIMIT ?
+                    """,
+                    (workspace_id, cursor[0], cursor[0], cursor[1], batch_size),
+                )
+            if not rows:
+                break
+            cursor = (rows[-1]["last_updated"], rows[-1]["id"])
+            updates = []
+            for row in rows:
+                if row["seq"] is None:
+                    low -= 1
+                    updates.append((low, row["id"]))
+            if updates:
+                with backend.transaction() as tx:
+                    tx.executemany("UPDATE sessions SET seq = ? WHERE id = ? AND seq IS NULL", updates)
+                yield len(updates)
+
+
+def dedupe_session_seq(backend: StorageBackend, batch_size: int) -> Iterator[int]:
+    """같은 워크스페이스에서 seq가 겹친 세션(잠금 없이 동시에 저장된 push)을 맨 뒤 순번으로 옮깁니다.
+
+    겹친 행 중 가장 이른 행은 그대로 두고 나머지는 `MAX(seq) + 1`부터 받습니다. `seq > ?`로 읽는 keyset
+    독자(내보내기, 관련도 색인)가 건너뛴 행도 이렇게 옮기면 다음 갱신 때 읽힙니다.
+    """
+    while True:
+        dupes = backend.fetchall(
+            """
+            SELECT workspace_id, seq FROM sessions WHERE seq IS NOT NULL
+            GROUP BY workspace_id, seq HAVING COUNT(*) > 1 LIMIT ?
+            """,
+            (batch_size,),
+        )
+        if not dupes:
+            return
+        moved = 0
+        with backend.transaction() as tx:
+            for dupe in dupes:
+                # app/db.py와 같은 잠금: 이 사이에 들어오는 push와 순번이 겹치지 않게 합니다.
+                tx.execute(
+                    """
+                    INSERT INTO revisions (workspace_id, revision_id) VALUES (?, 'init')
+                    ON CONFLICT(workspace_id) DO UPDATE SET revision_id = revisions.revision_id
+                    """,
+                    (dupe["workspace_id"],),
+                )
+                rows = tx.execute(
+                    "SELECT id FROM sessions WHERE workspace_id = ? AND seq = ? ORDER BY last_updated, id",
+                    (dupe["workspace_id"], dupe["seq"]),
+                ).fetchall()
+                top = tx.execute(
+                    "SELECT MAX(seq) AS top FROM sessions WHERE workspace_id = ?", (dupe["workspace_id"],)
+                ).fetchone()["top"]
+                tx.executemany(
+                    "UPDATE sessions SET seq = ? WHERE id = ?",
+                    [(top + offset, row["id"]) for offset, row in enumerate(rows[1:], start=1)],
+                )
+                moved += len(rows) - 1
+        yield moved
+
+
+def mark_doc_baselines(backend: StorageBackend, batch_size: int) -> Iterator[int]:
+    """이미 동기화하던 워크스페이스 문서에 기준선 표시(`doc_blocks.block_hash = ''`)를 남깁니다.
+
+    예전에는 커서(doc_sync_state)가 있으면 기준선이 있다고 보았으므로, 커서가 있는 워크스페이스에서 블록이
+    기록된 문서는 기준선을 읽은 문서입니다. 빈 문서는 표시가 없어 다음 동기화 때 기준선을 다시 읽습니다.
+    """
+    with backend.transaction() as tx:
+        cur = tx.execute(
+            """
+            INSERT INTO doc_blocks (workspace_id, doc_id, block_hash, created_at)
+            SELECT DISTINCT workspace_id, doc_id, '', ? FROM doc_blocks
+            WHERE workspace_id IN (SELECT workspace_id FROM doc_sync_state)
+            ON CONFLICT(workspace_id, doc_id, block_hash) DO NOTHING
+            """,
+            (datetime.utcnow().isoformat(),),
+        )
+    yield cur.rowcount
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "initial tables",
+        operations=[
+            """
+            CREATE TABLE IF NOT EXISTS workspaces (
+                id TEXT PRIMARY KEY,
+                name TEXT,
+                doc_personal_id TEXT,
+                team_map TEXT,
+                categories TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                workspace_id TEXT,
+                scope TEXT,
+                team_key TEXT,
+                revision_id TEXT,
+                content TEXT,
+                categories TEXT,
+                last_updated TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tokens (
+                token TEXT PRIMARY KEY,
+                workspace_id TEXT,
+                scopes TEXT,
+                expires_at TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS revisions (
+                workspace_id TEXT PRIMARY KEY,
+                revision_id TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS google_tokens (
+                workspace_id TEXT PRIMARY KEY,
+                token_json TEXT NOT NULL
+            )
+            """,
+        ],
+    ),
+    # 세션 본문 저장소: sha256(본문) → 압축 바이트 (동일 본문은 한 번만 저장)
+    Migration(
+        2,
+        "content-addressed blobs",
+        operations=[
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                body {blob_type} NOT NULL
+            )
+            """,
+            AddColumn("sessions", "content_hash", "TEXT"),
+        ],
+    ),
+    # 델타 blob: base_hash 본문에 대한 줄 단위 델타. depth 0 = 전체 스냅샷.
+    # 리비전 체인 (workspace, scope, team) 조회용 인덱스. team_key NULL과 ''는 같은 체인입니다.
+    Migration(
+        3,
+        "blob deltas and chain indexes",
+        operations=[
+            AddColumn("blobs", "base_hash", "TEXT"),
+            AddColumn("blobs", "depth", "INTEGER NOT NULL DEFAULT 0"),
+        ],
+        indexes=[
+            CreateIndex("idx_sessions_chain", "sessions", "workspace_id, scope, COALESCE(team_key, ''), last_updated"),
+            CreateIndex("idx_sessions_revision", "sessions", "workspace_id, revision_id"),
+        ],
+    ),
+    # 워크스페이스별 보관 정책 (NULL이면 Settings 기본값 사용)
+    Migration(
+        4,
+        "retention policies",
+        operations=[
+            """
+            CREATE TABLE IF NOT EXISTS retention_policies (
+                workspace_id TEXT PRIMARY KEY,
+                keep_last_per_category INTEGER,
+                max_age_days INTEGER
+            )
+            """,
+        ],
+    ),
+    # 워크스페이스별 세션 순번. 같은 last_updated(대량 적재)에서도 순서가 정해지고
+    # 최신 세션 조회가 (workspace_id, seq) 인덱스 한 번으로 끝납니다.
+    Migration(
+        5,
+        "session sequence numbers",
+        operations=[AddColumn("sessions", "seq", "INTEGER")],
+        indexes=[CreateIndex("idx_sessions_seq", "sessions", "workspace_id, seq")],
+        backfill=backfill_session_seq,
+    ),
+    # POST /sessions 멱등성 키: 같은 키로 다시 보내면 처음 응답을 돌려줍니다 (response가 NULL이면 처리 중).
+    Migration(
+        6,
+        "idempotency keys",
+        operations=[
+            """
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                workspace_id TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL,
+                request_hash TEXT NOT NULL,
+                response TEXT,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (workspace_id, idempotency_key)
+            )
+            """,
+        ],
+        indexes=[CreateIndex("idx_idempotency_created", "idempotency_keys", "created_at")],
+    ),
+    # 근접 중복 push 감지용 본문 SimHash (app/storage/simhash.py). 이전 행은 NULL로 두고 비교에서 뺍니다.
+    # 체인의 최근 세션은 idx_sessions_chain으로 읽습니다.
+    Migration(7, "session simhash", operations=[AddColumn("sessions", "simhash", "BIGINT")]),
+    # Google Docs 역방향 동기화 (app/services/doc_sync.py): 워크스페이스별 Drive changes 커서와
+    # 이미 본 문서 블록(`---`로 나뉜 핸드오프)의 해시. 이 서버가 추가한 블록도 push 때 기록합니다.
+    Migration(
+        8,
+        "doc sync state",
+        operations=[
+            """
+            CREATE TABLE IF NOT EXISTS doc_sync_state (
+                workspace_id TEXT PRIMARY KEY,
+                page_token TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS doc_blocks (
+                workspace_id TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                block_hash TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (workspace_id, doc_id, block_hash)
+            )
+            """,
+        ],
+    ),
+    # seq는 워크스페이스 안에서 유일합니다 (app/db.py가 revisions 행을 잠그고 배정).
+    # 잠금 전에 겹친 seq를 먼저 정리하고(9), 유일 인덱스를 만든 뒤(10) 같은 컬럼의 일반 인덱스를 지웁니다(11).
+    Migration(9, "dedupe session seq", backfill=dedupe_session_seq),
+    Migration(
+        10,
+        "unique session seq",
+        indexes=[CreateIndex("idx_sessions_seq_unique", "sessions", "workspace_id, seq", unique=True)],
+    ),
+    Migration(11, "drop non-unique seq index", operations=["DROP INDEX IF EXISTS idx_sessions_seq"]),
+    # 히스토리 순서 (last_updated, seq): 최신 세션/최근 세션 조회를 인덱스 한 번으로 끝냅니다.
+    # seq는 저장 순서(keyset 독자용)이고, 가져오기로 들어온 과거 세션은 시각대로 끼워집니다.
+    Migration(
+        12,
+        "session history order index",
+        indexes=[CreateIndex("idx_sessions_history", "sessions", "workspace_id, last_updated, seq")],
+    ),
+    # 역방향 동기화는 문서마다 기준선 표시가 있는지로 기준선을 판단합니다 (나중에 추가된 팀 문서).
+    Migration(13, "doc sync baselines", backfill=mark_doc_baselines),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TEXT NOT NULL
+    )
+"""
+
+
+def applied_versions(backend: StorageBackend) -> List[int]:
+    with backend.transaction() as tx:
+        tx.execute(SCHEMA_VERSION_TABLE)
+    return [row["version"] for row in backend.fetchall("SELECT version FROM schema_version ORDER BY version")]
+
+
+def current_version(backend: StorageBackend) -> int:
+    versions = applied_versions(backend)
+    return versions[-1] if versions else 0
+
+
+def _create_index(backend: StorageBackend, index: CreateIndex) -> None:
+    # CONCURRENTLY는 트랜잭션 밖에서만 실행할 수 있습니다. SQLite는 짧은 쓰기 잠금으로 만듭니다.
+    concurrently = "CONCURRENTLY " if backend.name == "postgres" else ""
+    unique = "UNIQUE " if index.unique else ""
+    backend.execute_autocommit(
+        f"CREATE {unique}INDEX {concurrently}IF NOT EXISTS {index.name} ON {index.table} ({index.columns})"
+    )
+
+
+def apply(
+    backend: StorageBackend,
+    migration: Migration,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    pause: float = BACKFILL_PAUSE_S,
+) -> int:
+    """마이그레이션 하나를 적용하고 백필한 행 수를 반환합니다."""
+    with backend.transaction() as tx:
+        for operation in migration.operations:
+            if isinstance(operation, AddColumn):
+                if operation.column in backend.columns(operation.table):
+                    continue
+                tx.execute(f"ALTER TABLE {operation.table} ADD COLUMN {operation.column} {operation.column_type}")
+            else:
+                tx.execute(operation.format(blob_type=backend.blob_type))
+    for index in migration.indexes:
+        _create_index(backend, index)
+
+    backfilled = 0
+    if migration.backfill is not None:
+        for count in migration.backfill(backend, batch_size):
+            backfilled += count
+            logger.info("마이그레이션 백필 진행", extra={"version": migration.version, "rows": backfilled})
+            time.sleep(pause)
+
+    with backend.transaction() as tx:
+        tx.execute(
+            "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?) ON CONFLICT(version) DO NOTHING",
+            (migration.version, migration.name, datetime.utcnow().isoformat()),
+        )
+    return backfilled
+
+
+def migrate(
+    backend: StorageBackend,
+    target: Optional[int] = None,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    pause: float = BACKFILL_PAUSE_S,
+) -> List[int]:
+    """적용되지 않은 마이그레이션을 버전 순서대로 적용하고, 이번에 적용한 버전 목록을 반환합니다."""
+    done = set(applied_versions(backend))
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version in done or (target is not None and migration.version > target):
+            continue
+        started = time.perf_counter()
+        backfilled = apply(backend, migration, batch_size, pause)
+        logger.info(
+            "마이그레이션 적용",
+            extra={
+                "version": migration.version,
+                "migration": migration.name,
+                "backfilled_rows": backfilled,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        applied.append(migration.version)
+    return applied
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 적용")
+    parser.add_argument("--status", action="store_true", help="적용 상태만 출력")
+    parser.add_argument("--target", type=int, help="이 버전까지만 적용")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    parser.add_argument("--pause-ms", type=float, default=BACKFILL_PAUSE_S * 1000)
+    args = parser.parse_args(argv)
+
+    from .config import settings
+    from .db import repository
+    from .workers import file_lock
+
+    backend = repository.backend
+    if not args.status:
+        with file_lock(settings.run_dir / "schema.lock"):
+            migrate(backend, args.target, args.batch_size, args.pause_ms / 1000)
+    done = set(applied_versions(backend))
+    for migration in MIGRATIONS:
+        print(f"{migration.version:>4}  {'applied' if migration.version in done else 'pending':8}  {migration.name}")
+
+
+if __name__ == "__main__":
+    main()
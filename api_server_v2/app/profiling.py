@@ -0,0 +1,345 @@
+"""요청 단위 프로파일링 (cProfile / 스택 샘플링).
+
+`PROFILING_ENABLED=true`일 때만 설치됩니다. 다음 요청을 프로파일링합니다.
+- 관리자 요청: `X-Profile: cprofile|sampling` + `X-Admin-Token: <PROFILING_ADMIN_TOKEN>`
+- 샘플링: `PROFILING_SAMPLE_RATE` 비율만큼 무작위 요청 (`PROFILING_MODE` 사용)
+
+sync 엔드포인트는 스레드풀에서 실행되므로 미들웨어가 아니라 엔드포인트 호출 자체를
+(`ProfiledRoute`로) 감싸 그 스레드에서 프로파일러를 켭니다. 결과는 `PROFILING_DIR`에 최대 `PROFILING_MAX_CAPTURES`개까지
+보관하고(오래된 것부터 삭제) `/admin/profiles`로 목록 조회/다운로드합니다.
+- cprofile: `.pstats` (`python -m pstats`, snakeviz 등)
+- sampling: `.speedscope.json` (https://www.speedscope.app)
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import json
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .logging_config import request_id_var
+
+MODES = ("cprofile", "sampling")
+SUFFIXES = {"cprofile": ".pstats", "sampling": ".speedscope.json"}
+_CAPTURE_ID = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+_capture_var: ContextVar[Optional["Capture"]] = ContextVar("profile_capture", default=None)
+# Python 3.12부터 cProfile은 프로세스 전역(sys.monitoring)이라 두 번째 enable()은 ValueError입니다.
+# 겹치는 cprofile 캡처는 기다리지 않고 건너뜁니다.
+_cprofile_lock = threading.Lock()
+
+Frame = Tuple[str, str, int]
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 일정 간격으로 기록하는 샘플링 프로파일러."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: List[Tuple[Frame, ...]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()  # 루트 → 리프
+                self.samples.append(tuple(stack))
+
+
+def to_speedscope(samples: List[Tuple[Frame, ...]], interval: float, name: str) -> Dict[str, Any]:
+    """샘플 목록을 speedscope "sampled" 프로파일 형식으로 변환합니다."""
+    frames: List[Dict[str, Any]] = []
+    index: Dict[Frame, int] = {}
+    encoded = []
+    for stack in samples:
+        row = []
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            row.append(index[frame])
+        encoded.append(row)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "exporter": "memoryhub",
+        "name": name,
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": interval * len(encoded),
+                "samples": encoded,
+                "weights": [interval] * len(encoded),
+            }
+        ],
+    }
+
+
+class Capture:
+    """요청 하나의 프로파일링 상태. 엔드포인트 래퍼가 실제 프로파일러를 붙입니다."""
+
+    def __init__(self, mode: str, interval: float):
+        self.id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.mode = mode
+        self.interval = interval
+        self.profiler: Optional[cProfile.Profile] = None
+        self.sampler: Optional[StackSampler] = None
+
+    def begin(self) -> bool:
+        """프로파일러를 켭니다. 다른 cprofile 캡처가 실행 중이면 켜지 않고 False (요청은 그대로 처리)."""
+        if self.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                return False
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # 다른 프로파일링 도구(coverage 등)가 이미 켜져 있음
+                _cprofile_lock.release()
+                return False
+            self.profiler = profiler
+        else:
+            self.sampler = StackSampler(threading.get_ident(), self.interval)
+            self.sampler.start()
+        return True
+
+    def end(self) -> None:
+        if self.profiler is not None:
+            self.profiler.disable()
+            _cprofile_lock.release()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    def write(self, path: Path, name: str) -> bool:
+        if self.profiler is not None:
+            self.profiler.dump_stats(str(path))
+            return True
+        if self.sampler is not None:
+            path.write_text(json.dumps(to_speedscope(self.sampler.samples, self.interval, name)), encoding="utf-8")
+            return True
+        return False
+
+
+class ProfileStore:
+    """디스크의 고정 크기 링 버퍼. 캡처마다 데이터 파일 하나와 메타데이터(`.meta.json`) 하나를 씁니다."""
+
+    def __init__(self, root: Path, max_captures: int):
+        self.root = Path(root)
+        self.max_captures = max(1, max_captures)
+        self._lock = threading.Lock()
+
+    def save(self, capture: Capture, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        filename = capture.id + SUFFIXES[capture.mode]
+        name = f"{meta.get('method')} {meta.get('path')}"
+        if not capture.write(self.root / filename, name):
+            return None  # 엔드포인트까지 도달하지 못했거나(404 등) 다른 cprofile 캡처와 겹친 요청
+        meta = {**meta, "id": capture.id, "mode": capture.mode, "file": filename}
+        (self.root / f"{capture.id}.meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        self._trim()
+        return meta
+
+    def _trim(self) -> None:
+        with self._lock:
+            metas = sorted(self.root.glob("*.meta.json"))
+            for stale in metas[: max(0, len(metas) - self.max_captures)]:
+                capture_id = stale.name[: -len(".meta.json")]
+                for path in self.root.glob(f"{capture_id}.*"):
+                    path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        items = []
+        for path in sorted(self.root.glob("*.meta.json"), reverse=True):
+            try:
+                items.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return items
+
+    def get(self, capture_id: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        if not _CAPTURE_ID.match(capture_id):
+            return None
+        try:
+            meta = json.loads((self.root / f"{capture_id}.meta.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        path = self.root / meta["file"]
+        return (path, meta) if path.exists() else None
+
+
+store = ProfileStore(settings.profiling_dir, settings.profiling_max_captures)
+
+
+def _is_admin(token: Optional[str]) -> bool:
+    expected = settings.profiling_admin_token
+    return bool(expected and token and secrets.compare_digest(token, expected))
+
+
+def _select_mode(headers: Dict[bytes, bytes]) -> Optional[str]:
+    requested = headers.get(b"x-profile")
+    if requested is not None and _is_admin(headers.get(b"x-admin-token", b"").decode("latin-1")):
+        mode = requested.decode("latin-1").strip().lower()
+        return mode if mode in MODES else settings.profiling_mode
+    if settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+        return settings.profiling_mode
+    return None
+
+
+class ProfilingMiddleware:
+    """선택된 요청에 Capture를 붙이고, 응답이 끝나면 결과를 ProfileStore에 저장합니다."""
+
+    header = b"x-profile-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = _select_mode(dict(scope["headers"]))
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        from starlette.concurrency import run_in_threadpool
+
+        capture = Capture(mode, settings.profiling_sample_interval_ms / 1000)
+        token = _capture_var.set(capture)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(self.header, capture.id.encode("latin-1"))]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _capture_var.reset(token)
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status["code"],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "request_id": request_id_var.get(),
+                "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            await run_in_threadpool(store.save, capture, meta)
+
+
+def _profiled(func):
+    """엔드포인트를 감싸 Capture가 있는 요청에서만 실행 스레드에 프로파일러를 켭니다."""
+    if getattr(func, "__profiled__", False):
+        return func
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            capture = _capture_var.get()
+            if capture is None:
+                return await func(*args, **kwargs)
+            capture.begin()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                capture.end()
+
+        async_wrapper.__profiled__ = True
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        capture = _capture_var.get()
+        if capture is None:
+            return func(*args, **kwargs)
+        capture.begin()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            capture.end()
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+try:
+    from fastapi.routing import APIRoute
+except ImportError:  # pragma: no cover - server dependencies not installed
+    APIRoute = object  # type: ignore[assignment,misc]
+
+
+class ProfiledRoute(APIRoute):
+    """`APIRouter(route_class=ProfiledRoute)`. 프로파일링이 꺼져 있으면 엔드포인트를 그대로 둡니다."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if settings.profiling_enabled:
+            endpoint = _profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _admin_router():
+    from fastapi import APIRouter, Depends, Header, HTTPException
+    from fastapi.responses import FileResponse
+
+    def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+        if not _is_admin(x_admin_token):
+            raise HTTPException(status_code=403, detail="ADMIN_TOKEN_REQUIRED")
+
+    router = APIRouter(
+        prefix="/admin/profiles", tags=["Admin"], dependencies=[Depends(require_admin)], include_in_schema=False
+    )
+
+    @router.get("")
+    def list_profiles():
+        return {"items": store.list()}
+
+    @router.get("/{capture_id}")
+    def download_profile(capture_id: str):
+        found = store.get(capture_id)
+        if not found:
+            raise HTTPException(status_code=404, detail="PROFILE_NOT_FOUND")
+        path, meta = found
+        media_type = "application/json" if meta["mode"] == "sampling" else "application/octet-stream"
+        return FileResponse(path, media_type=media_type, filename=meta["file"])
+
+    return router
+
+
+def install(app) -> None:
+    """프로파일링이 켜져 있으면 미들웨어와 관리자 엔드포인트를 등록합니다 (꺼져 있으면 변경 없음)."""
+    if not settings.profiling_enabled:
+        return
+    app.include_router(_admin_router())
+    app.add_middleware(ProfilingMiddleware)
@@ -0,0 +1,127 @@
+"""과거 핸드오프 관련도 색인 (POST /sessions/related).
+
+워크스페이스마다 세션 본문의 hashed TF-IDF 벡터를 연속된 NumPy 행렬 하나(float32, 행마다 L2 정규화)에 두고,
+질의 벡터와의 행렬-벡터 곱 한 번으로 모든 세션의 점수를 매깁니다. 모델/네트워크 없이 CPU에서 동작합니다.
+
+- 특징: 소문자 단어와, 조사가 붙은 형태도 맞도록 한글 단어의 글자 2-gram. `RELATED_INDEX_DIM`차원에 부호 해싱합니다.
+- 행에는 로그 TF만 저장하고 IDF는 질의 벡터에 곱합니다. 문서 빈도가 바뀌어도 기존 행을 다시 계산하지 않습니다.
+- 색인은 프로세스 메모리에만 있고 (`hash()` 사용), 워크스페이스별로 마지막에 색인한 seq 이후 세션만 읽어 갱신합니다
+  (`MemoryService.related_sessions`). 다른 워커나 대량 적재로 들어온 세션, 근접 중복 병합으로 바뀐 행도 반영됩니다.
+- `pip install numpy`가 필요합니다.
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .cache import LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_HANGUL = re.compile(r"[가-힣]")
+INITIAL_CAPACITY = 1024
+
+
+def available() -> bool:
+    return np is not None
+
+
+def tokens(text: str) -> List[str]:
+    out: List[str] = []
+    for word in _WORD.findall(text.lower()):
+        out.append(word)
+        if len(word) > 2 and _HANGUL.search(word):
+            out.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return out
+
+
+class WorkspaceVectors:
+    """한 워크스페이스의 세션 벡터 행렬. 호출하는 쪽이 `lock`을 잡고 사용합니다."""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.lock = threading.Lock()
+        self.matrix = np.zeros((INITIAL_CAPACITY, dim), dtype=np.float32)
+        self.ids: List[Optional[str]] = []  # 행 번호 → 세션 id (삭제된 행은 None)
+        self.rows: Dict[str, int] = {}
+        self.df = np.zeros(dim, dtype=np.int64)  # 차원(해시 버킷)별 문서 빈도
+        self.last_seq: Optional[int] = None  # 마지막으로 색인한 세션의 seq (None이면 아직 없음)
+        # 토큰 → (차원, 부호). 같은 단어가 반복되므로 해시 계산을 한 번만 합니다.
+        self._buckets: Dict[str, Tuple[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def vector(self, text: str) -> "np.ndarray":
+        """로그 TF 부호 해싱 벡터 (L2 정규화). 본문에 단어가 없으면 0 벡터."""
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for token, count in Counter(tokens(text)).items():
+            bucket = self._buckets.get(token)
+            if bucket is None:
+                h = hash(token)
+                bucket = self._buckets[token] = (h % self.dim, 1.0 if h & 0x10000 else -1.0)
+            vec[bucket[0]] += bucket[1] * (1.0 + math.log(count))
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def put(self, session_id: str, vec: "np.ndarray") -> None:
+        """세션 벡터(`vector()` 결과)를 추가합니다. 이미 있는 세션(병합으로 본문이 바뀐 행)은 그 자리에서 바꿉니다."""
+        row = self.rows.get(session_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self.matrix):
+                grown = np.zeros((len(self.matrix) * 2, self.dim), dtype=np.float32)
+                grown[:row] = self.matrix
+                self.matrix = grown
+            self.ids.append(session_id)
+            self.rows[session_id] = row
+        else:
+            self.df -= self.matrix[row] != 0
+        self.matrix[row] = vec
+        self.df += vec != 0
+
+    def remove(self, session_id: str) -> None:
+        row = self.rows.pop(session_id, None)
+        if row is not None:
+            self.df -= self.matrix[row] != 0
+            self.matrix[row] = 0
+            self.ids[row] = None
+
+    def search(self, text: str, limit: int) -> List[Tuple[str, float]]:
+        """(세션 id, 점수) 점수 높은 순. 점수는 IDF 가중 코사인 유사도이며 0 이하인 세션은 뺍니다."""
+        if not self.rows:
+            return []
+        idf = np.log((1.0 + len(self.rows)) / (1.0 + self.df)).astype(np.float32) + 1.0
+        query = self.vector(text) * idf * idf  # 행 쪽 IDF까지 질의에 곱합니다.
+        norm = float(np.linalg.norm(query))
+        if not norm:
+            return []
+        scores = self.matrix[: len(self.ids)] @ (query / norm)
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top if scores[i] > 0 and self.ids[i] is not None]
+
+
+class RelatedIndex:
+    """워크스페이스 id → `WorkspaceVectors`. 최근에 쓴 `max_workspaces`개만 메모리에 둡니다."""
+
+    def __init__(self, dim: int, max_workspaces: int):
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._workspaces: LRUCache[WorkspaceVectors] = LRUCache("related_index", max_workspaces)
+
+    def workspace(self, workspace_id: str) -> WorkspaceVectors:
+        with self._lock:
+            vectors = self._workspaces.get(workspace_id)
+            if vectors is None:
+                vectors = WorkspaceVectors(self.dim)
+                self._workspaces.set(workspace_id, vectors)
+            return vectors
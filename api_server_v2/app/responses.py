@@ -0,0 +1,46 @@
+"""JSON 응답 직렬화 빠른 경로.
+
+FastAPI는 `response_model`이 있으면 반환값을 모델로 다시 검증한 뒤 직렬화하므로, 큰 핸드오프 본문은
+Row → 모델 → dict → JSON 문자열 → bytes로 여러 번 복사됩니다. 여기서는 DB 값으로 바로 JSON bytes를
+만들고 라우트는 `Response`를 그대로 반환합니다 (`response_model`은 OpenAPI 스키마용으로 남겨 둡니다).
+
+orjson이 설치되어 있으면 사용하고, 없으면 pydantic_core 직렬화기를 씁니다 (둘 다 FastAPI 응답과 같은 형식).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Type
+
+import pydantic_core
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(obj: Any) -> bytes:
+    """`JSONResponse`와 같은 형식(공백 없음, 비ASCII 그대로)의 UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return pydantic_core.to_json(obj)
+
+
+def json_datetime(value: str | datetime) -> str:
+    """pydantic과 같은 ISO 8601 표기 (UTC는 `Z`)."""
+    text = (datetime.fromisoformat(value) if isinstance(value, str) else value).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def dump_fields(model: Type[BaseModel], values: Dict[str, Any]) -> bytes:
+    """`model` 필드 순서대로 JSON 객체를 만듭니다. `values`는 JSON으로 바로 쓸 수 있는 값이어야 하고,
+    빠진 필드는 모델 기본값을 씁니다 (필수 필드가 빠지면 KeyError)."""
+    return dumps(
+        {
+            name: values[name] if name in values or field.is_required() else field.default
+            for name, field in model.model_fields.items()
+        }
+    )
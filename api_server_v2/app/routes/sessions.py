@@ -1,22 +1,87 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 
-from ..schemas import SessionCreateRequest, SessionResponse
+from .. import related
+from ..idempotency import REPLAYED_HEADER, IdempotencyError, IdempotentReplay
+from ..profiling import ProfiledRoute
+from ..responses import JSON_MEDIA_TYPE
+from ..schemas import (
+    ContextBundleResponse,
+    RelatedSessionsRequest,
+    RelatedSessionsResponse,
+    SessionCreateRequest,
+    SessionDiffResponse,
+    SessionResponse,
+)
 from ..services.memory import memory_service
 
-router = APIRouter(prefix="/sessions", tags=["Sessions"])
+router = APIRouter(prefix="/sessions", tags=["Sessions"], route_class=ProfiledRoute)
 
 
 @router.get("/latest", response_model=SessionResponse | None)
 def latest_session(workspace_id: str, scope: str, team_key: str | None = None, category: str | None = None):
-    session = memory_service.latest_session(workspace_id, scope, team_key, category)
-    if not session:
+    # 직렬화된 bytes를 그대로 반환합니다 (response_model은 OpenAPI 스키마용, app/responses.py 참고).
+    body = memory_service.latest_session_body(workspace_id, scope, team_key, category)
+    if body is None:
         raise HTTPException(status_code=404, detail="SESSION_NOT_FOUND")
-    return session
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
 
 
-@router.post("", response_model=SessionResponse, responses={409: {"description": "Conflict"}})
-def create_session(payload: SessionCreateRequest):
-    result = memory_service.create_session(payload)
+@router.get("/context", response_model=ContextBundleResponse)
+def context_bundle(
+    workspace_id: str,
+    budget_tokens: int = Query(ge=64, le=200_000),
+    scope: str | None = None,
+    team_key: str | None = None,
+    category: str | None = None,
+):
+    # 같은 (리비전, 예산, 필터) 요청은 캐시된 bytes를 그대로 반환합니다 (오버레이를 다시 열 때).
+    body = memory_service.context_bundle(workspace_id, budget_tokens, scope, team_key, category)
+    if body is None:
+        raise HTTPException(status_code=404, detail="SESSION_NOT_FOUND")
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+
+@router.get("/diff", response_model=SessionDiffResponse)
+def diff_sessions(
+    workspace_id: str,
+    from_revision: str = Query(alias="from"),
+    to_revision: str | None = Query(default=None, alias="to"),
+):
+    diff = memory_service.diff_sessions(workspace_id, from_revision, to_revision)
+    if not diff:
+        raise HTTPException(status_code=404, detail="REVISION_NOT_FOUND")
+    return diff
+
+
+@router.post(
+    "/related",
+    response_model=RelatedSessionsResponse,
+    responses={503: {"description": "numpy is not installed on the server"}},
+)
+def related_sessions(payload: RelatedSessionsRequest):
+    if not related.available():
+        raise HTTPException(status_code=503, detail="RELATED_INDEX_UNAVAILABLE")
+    return RelatedSessionsResponse(results=memory_service.related_sessions(payload))
+
+
+@router.post(
+    "",
+    response_model=SessionResponse,
+    responses={
+        409: {"description": "Conflict (revision, or the same Idempotency-Key still in progress)"},
+        422: {"description": "Idempotency-Key reused with a different request"},
+    },
+)
+def create_session(
+    payload: SessionCreateRequest,
+    idempotency_key: str | None = Header(default=None, max_length=255),
+):
+    try:
+        result = memory_service.create_session(payload, idempotency_key)
+    except IdempotencyError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    if isinstance(result, IdempotentReplay):
+        return Response(content=result.body, media_type=JSON_MEDIA_TYPE, headers={REPLAYED_HEADER: "true"})
     if hasattr(result, "status") and getattr(result, "status") == "CONFLICT":
         raise HTTPException(
             status_code=409,
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
 
+from ..profiling import ProfiledRoute
 from ..schemas import TokenCreateRequest, TokenResponse
 from ..services.memory import memory_service
 
-router = APIRouter(prefix="/tokens", tags=["Auth"])
+router = APIRouter(prefix="/tokens", tags=["Auth"], route_class=ProfiledRoute)
 
 
 @router.post("", response_model=TokenResponse, status_code=201)
@@ -1,9 +1,24 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from ..schemas import Workspace, WorkspaceCreateRequest
+from .. import transfer
+from ..compression import BodyError
+from ..config import settings
+from ..db import repository
+from ..profiling import ProfiledRoute
+from ..schemas import (
+    ArchivedSession,
+    CompactionResult,
+    ImportResult,
+    RetentionPolicy,
+    Workspace,
+    WorkspaceCreateRequest,
+)
 from ..services.memory import memory_service
+from ..services.retention import retention_service
 
-router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
+router = APIRouter(prefix="/workspaces", tags=["Workspaces"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=dict[str, list[Workspace]])
@@ -22,3 +37,70 @@ def get_workspace(workspace_id: str):
     if not workspace:
         raise HTTPException(status_code=404, detail="WORKSPACE_NOT_FOUND")
     return workspace
+
+
+def _require_workspace(workspace_id: str) -> None:
+    if not memory_service.get_workspace(workspace_id):
+        raise HTTPException(status_code=404, detail="WORKSPACE_NOT_FOUND")
+
+
+@router.get("/{workspace_id}/retention", response_model=RetentionPolicy)
+def get_retention_policy(workspace_id: str):
+    _require_workspace(workspace_id)
+    return retention_service.get_policy(workspace_id)
+
+
+@router.put("/{workspace_id}/retention", response_model=RetentionPolicy)
+def set_retention_policy(workspace_id: str, payload: RetentionPolicy):
+    _require_workspace(workspace_id)
+    return retention_service.set_policy(workspace_id, payload)
+
+
+@router.post("/{workspace_id}/compact", response_model=CompactionResult)
+def compact_workspace(workspace_id: str):
+    _require_workspace(workspace_id)
+    return retention_service.compact_workspace(workspace_id)
+
+
+@router.get("/{workspace_id}/archive", response_model=dict[str, list[ArchivedSession]])
+def search_archive(workspace_id: str, q: str = "", limit: int = 20):
+    _require_workspace(workspace_id)
+    return {"items": retention_service.search_archive(workspace_id, q, limit)}
+
+
+@router.get(
+    "/{workspace_id}/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {transfer.NDJSON_MEDIA_TYPE: {}}, "description": "NDJSON stream"}},
+)
+def export_workspace(workspace_id: str):
+    # 세션을 배치 단위로 읽어 바로 내보냅니다 (app/transfer.py). gzip/br은 Accept-Encoding으로 협상합니다.
+    workspace = memory_service.get_workspace(workspace_id)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="WORKSPACE_NOT_FOUND")
+    return StreamingResponse(
+        transfer.export_lines(repository, workspace),
+        media_type=transfer.NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{workspace_id}.ndjson"'},
+    )
+
+
+@router.post(
+    "/{workspace_id}/import",
+    response_model=ImportResult,
+    responses={422: {"description": "Invalid NDJSON line (earlier batches are already stored)"}},
+)
+async def import_workspace(workspace_id: str, request: Request):
+    # 본문(NDJSON, Content-Encoding 가능)을 스트림으로 읽어 배치마다 저장합니다.
+    await run_in_threadpool(_require_workspace, workspace_id)
+    try:
+        return await transfer.import_ndjson(
+            repository, workspace_id, request.stream(), settings.max_request_body_bytes
+        )
+    except transfer.ImportLineError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "INVALID_IMPORT_LINE", "line": exc.line, "message": exc.message, "imported": exc.imported},
+        )
+    except BodyError as exc:
+        raise HTTPException(status_code=exc.status, detail=exc.detail)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SessionCreateRequest(BaseModel):
@@ -24,6 +24,53 @@ class SessionResponse(BaseModel):
     matched_category: Optional[str] = None
 
 
+class RelatedSessionsRequest(BaseModel):
+    workspace_id: str
+    text: str  # 지금 대화/작업 내용 (질의)
+    limit: int = Field(default=5, ge=1, le=50)
+    include_content: bool = True
+
+
+class RelatedSession(BaseModel):
+    score: float
+    revision_id: str
+    last_updated: datetime
+    categories: List[str]
+    scope: str
+    team_key: Optional[str] = None
+    content: Optional[str] = None
+
+
+class RelatedSessionsResponse(BaseModel):
+    status: str = "OK"
+    results: List[RelatedSession]
+
+
+class ContextPart(BaseModel):
+    revision_id: str
+    section: str  # 최신 핸드오프 전체면 "ALL"
+    tokens: int
+
+
+class ContextBundleResponse(BaseModel):
+    status: str = "OK"
+    revision_id: str  # 묶음의 최신 세션 리비전
+    budget_tokens: int
+    estimated_tokens: int
+    truncated: bool  # 예산 때문에 빠지거나 잘린 내용이 있으면 true
+    parts: List[ContextPart]
+    content: str
+
+
+class SessionDiffResponse(BaseModel):
+    status: str = "OK"
+    from_revision: str
+    to_revision: str
+    diff: str
+    added_lines: int
+    removed_lines: int
+
+
 class ConflictResponse(BaseModel):
     status: str = "CONFLICT"
     expected_revision: str
@@ -44,6 +91,43 @@ class WorkspaceCreateRequest(BaseModel):
     team_map: Dict[str, str] = {}
 
 
+class RetentionPolicy(BaseModel):
+    keep_last_per_category: Optional[int] = None  # 카테고리별 최근 N개 유지
+    max_age_days: Optional[int] = None  # D일 이내 세션 유지
+
+
+class CompactionResult(BaseModel):
+    workspace_id: str
+    archived: int
+    kept: int
+
+
+class ArchivedSession(BaseModel):
+    id: str
+    revision_id: str
+    scope: str
+    team_key: Optional[str] = None
+    categories: List[str] = []
+    last_updated: datetime
+    content: str
+
+
+class ExportedSession(BaseModel):
+    """GET /workspaces/{id}/export NDJSON의 세션 한 줄 (POST /workspaces/{id}/import 입력과 같음)."""
+    revision_id: Optional[str] = None  # 가져올 때 없으면 새로 발급
+    scope: Literal["personal", "team"]
+    team_key: Optional[str] = None
+    categories: List[str] = []
+    last_updated: Optional[datetime] = None  # 가져올 때 없으면 현재 시각
+    content: str
+
+
+class ImportResult(BaseModel):
+    workspace_id: str
+    imported: int
+    skipped: int  # 워크스페이스에 이미 있는 revision_id
+
+
 class TokenCreateRequest(BaseModel):
     workspace_id: str
     scopes: List[str]
@@ -0,0 +1,54 @@
+"""멀티 워커 실행기.
+
+    cd api_server_v2
+    python -m app.serve --workers 4 --port 8000
+
+`uvicorn --workers N`과 같지만 다음 두 가지를 먼저 처리합니다.
+- 스키마 생성/보강(`init_db`)을 부모 프로세스에서 한 번 실행합니다 (워커의 lifespan은 확인만 하게 됨).
+- 리스닝 소켓에 TCP_NODELAY를 켭니다. uvicorn은 멀티 워커 모드에서 소켓을 proto=0으로 만들어
+  asyncio가 연결마다 TCP_NODELAY를 설정하지 않고, 응답 헤더/본문이 나뉘어 전송될 때
+  delayed ACK(~40ms)만큼 지연됩니다. Linux에서는 accept된 연결이 리스닝 소켓의 설정을 물려받습니다.
+
+gunicorn(`-k uvicorn.workers.UvicornWorker`)은 자체적으로 TCP_NODELAY를 켜므로 그대로 써도 됩니다.
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Memory Hub 멀티 워커 실행")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", action="store_true")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    from uvicorn.supervisors import Multiprocess
+
+    from .db import init_db, repository
+
+    init_db()
+    repository.backend.close()  # 워커는 각자 연결합니다.
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        access_log=not args.no_access_log,
+    )
+    sock = config.bind_socket()
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if config.workers > 1:
+        Multiprocess(config, sockets=[sock]).run()
+    else:
+        uvicorn.Server(config).run(sockets=[sock])
+
+
+if __name__ == "__main__":
+    main()
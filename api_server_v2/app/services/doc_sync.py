@@ -0,0 +1,129 @@
+"""Google Docs 역방향 동기화: 사람이 Docs에서 직접 추가/수정한 핸드오프 블록을 세션으로 가져옵니다.
+
+워크스페이스마다 Drive changes 커서(page token)를 저장해 두고, 실행할 때마다 그 이후 바뀐 파일만 받습니다.
+워크스페이스 문서(doc_personal_id → personal, team_map → team) 중 바뀐 문서만 읽고, 아직 본 적 없는
+블록(app/doc_blocks.py)만 문서 순서대로 세션으로 저장합니다. 이 서버가 push로 추가한 블록은 push 때
+기록되므로 다시 가져오지 않습니다. 기준선이 없는 문서(첫 실행, 나중에 team_map에 추가된 팀 문서)는
+현재 블록을 기준선으로 기록만 합니다.
+
+한 번 실행:
+    cd api_server_v2
+    python -m app.services.doc_sync
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from ..adapters.google_docs import GoogleDocsAdapter
+from ..db import MemoryRepository, init_db, repository
+from ..doc_blocks import BASELINE_MARK, block_hash, split_blocks
+from ..schemas import Workspace
+from .memory import MemoryService, memory_service
+
+logger = logging.getLogger(__name__)
+
+
+class DocSyncService:
+    def __init__(self, repo: MemoryRepository, service: MemoryService):
+        self.repo = repo
+        self.service = service
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sync_workspace(self, workspace: Workspace) -> int:
+        """가져온 세션 수. Google 토큰이 없는 워크스페이스는 건너뜁니다."""
+        token_json = self.service.get_google_token(workspace.id)
+        if not token_json:
+            return 0
+        docs: Dict[str, Tuple[str, Optional[str]]] = {}
+        if workspace.doc_personal_id:
+            docs[workspace.doc_personal_id] = ("personal", None)
+        for team_key, doc_id in workspace.team_map.items():
+            docs.setdefault(doc_id, ("team", team_key))
+        if not docs:
+            return 0
+
+        adapter = GoogleDocsAdapter(token_json)
+        page_token = self.repo.get_doc_sync_token(workspace.id)
+        imported = 0
+        if page_token is None:
+            # 커서를 먼저 받아 두므로 기준선을 읽는 동안의 수정도 다음 실행에서 다시 확인합니다.
+            next_token = adapter.start_page_token()
+        # 기준선은 변경 목록보다 먼저 읽습니다. 그 사이 수정된 문서는 아래에서 한 번 더 읽어 가져옵니다.
+        baselined = self.repo.baselined_docs(workspace.id)
+        for doc_id in docs:
+            if doc_id not in baselined:
+                hashes = [block_hash(block) for block in split_blocks(adapter.read_text(doc_id))]
+                self.repo.remember_doc_blocks(workspace.id, doc_id, [*hashes, BASELINE_MARK])
+        if page_token is not None:
+            changed, next_token = adapter.list_changes(page_token)
+            for doc_id in changed & docs.keys():
+                scope, team_key = docs[doc_id]
+                imported += self._sync_doc(adapter, workspace.id, doc_id, scope, team_key)
+        self.repo.save_doc_sync_token(workspace.id, next_token)
+
+        refreshed_token_json = adapter.get_current_token_json()
+        if refreshed_token_json != token_json:
+            self.service.update_google_token(workspace.id, refreshed_token_json)
+        return imported
+
+    def _sync_doc(
+        self, adapter: GoogleDocsAdapter, workspace_id: str, doc_id: str, scope: str, team_key: Optional[str]
+    ) -> int:
+        known = self.repo.known_doc_blocks(workspace_id, doc_id)
+        fresh: Dict[str, str] = {}  # 해시 → 블록 (문서 순서, 같은 블록은 한 번만)
+        for block in split_blocks(adapter.read_text(doc_id)):
+            digest = block_hash(block)
+            if digest not in known:
+                fresh.setdefault(digest, block)
+        if not fresh:
+            return 0
+        self.service.import_doc_blocks(workspace_id, scope, team_key, list(fresh.values()))
+        self.repo.remember_doc_blocks(workspace_id, doc_id, fresh.keys())
+        logger.info("Google Docs 수정 사항을 가져왔습니다", extra={"doc_id": doc_id, "imported": len(fresh)})
+        return len(fresh)
+
+    def run_once(self) -> dict:
+        imported = failed = 0
+        for workspace in self.repo.list_workspaces():
+            try:
+                imported += self.sync_workspace(workspace)
+            except Exception:
+                # 한 워크스페이스의 인증/API 오류가 나머지 동기화를 막지 않도록 합니다 (커서는 그대로).
+                failed += 1
+                logger.exception("Google Docs 동기화 실패", extra={"workspace_id": workspace.id})
+        return {"imported_sessions": imported, "failed_workspaces": failed}
+
+    # === 백그라운드 작업 ===
+
+    def start(self, interval_seconds: int) -> None:
+        if self._thread or interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval_seconds,), name="doc-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self, interval_seconds: int) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                summary = self.run_once()
+                if summary["imported_sessions"]:
+                    logger.info("Google Docs 동기화 완료", extra=summary)
+            except Exception:
+                logger.exception("Google Docs 동기화 작업 실패")
+
+
+doc_sync_service = DocSyncService(repository, memory_service)
+
+
+if __name__ == "__main__":
+    init_db()
+    print(doc_sync_service.run_once())
@@ -1,39 +1,105 @@
 from __future__ import annotations
 
+import dataclasses
+import difflib
+import logging
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional
 
+from ..cache import LRUCache, shared_cache
+from ..config import settings
+from .. import context, related
 from ..db import json_load, repository
+from ..doc_blocks import block_hash, split_blocks
+from ..idempotency import IdempotencyError, IdempotentReplay, request_hash
+from ..logging_config import bind_workspace
+from ..metrics import record_conflict, timed
+from ..responses import dump_fields, json_datetime
 from ..schemas import (
     ConflictResponse,
+    ContextBundleResponse,
+    RelatedSession,
+    RelatedSessionsRequest,
     SessionCreateRequest,
+    SessionDiffResponse,
     SessionResponse,
     TokenCreateRequest,
     TokenResponse,
     Workspace,
     WorkspaceCreateRequest,
 )
+from ..storage.simhash import distance, simhash
 
 # [추가 1]
 # 4단계에서 완성한 어댑터와 메타데이터 클래스를 임포트합니다.
 from ..adapters.google_docs import GoogleDocsAdapter, DocumentMeta
 
+logger = logging.getLogger(__name__)
+
+# 관련도 색인을 갱신할 때 한 번에 읽는 세션 수와, 같은 본문(content_hash)의 벡터를 기억해 둘 개수
+RELATED_INDEX_BATCH = 1000
+RELATED_VECTOR_MEMO = 10_000
+
 
 class MemoryService:
     """Persistent service backed by sqlite repository."""
 
-    # ... (list_workspaces, get_workspace, create_workspace는 변경 없음) ...
+    def __init__(self) -> None:
+        # 요청마다 반복되는 워크스페이스/토큰 조회용 프로세스 내 캐시 (저장/갱신 시 무효화)
+        self._workspaces: LRUCache[Workspace] = LRUCache("workspace", settings.workspace_cache_size)
+        self._tokens: LRUCache[str] = LRUCache(
+            "google_token", settings.google_token_cache_size, ttl=settings.google_token_cache_ttl_seconds
+        )
+        # 직렬화한 세션 응답: (세션 id, revision, doc_url, last_updated) → JSON bytes.
+        # 세션 행은 근접 중복 병합 때만 바뀌고 그때 revision도 바뀌므로 무효화가 필요 없습니다.
+        self._bodies: LRUCache[bytes] = LRUCache("session_body", settings.session_body_cache_size)
+        # GET /sessions/context 응답 JSON: (워크스페이스, 현재 리비전, 예산, 필터) → bytes. 새 push는 리비전을 바꿉니다.
+        self._contexts: LRUCache[bytes] = LRUCache("context_bundle", settings.context_cache_size)
+        self._related = (
+            related.RelatedIndex(settings.related_index_dim, settings.related_index_workspaces)
+            if related.available()
+            else None
+        )
+
     def list_workspaces(self) -> List[Workspace]:
         return repository.list_workspaces()
 
     def get_workspace(self, workspace_id: str) -> Optional[Workspace]:
-        return repository.get_workspace(workspace_id)
+        workspace = self._workspaces.get(workspace_id)
+        if workspace is None:
+            workspace = repository.get_workspace(workspace_id)
+            if workspace is not None:
+                self._workspaces.set(workspace_id, workspace)
+        return workspace
 
     def create_workspace(self, payload: WorkspaceCreateRequest) -> Workspace:
-        return repository.create_workspace(payload.name, payload.doc_personal_id, payload.team_map)
+        workspace = repository.create_workspace(payload.name, payload.doc_personal_id, payload.team_map)
+        self._workspaces.set(workspace.id, workspace)
+        return workspace
+
+    def get_google_token(self, workspace_id: str) -> Optional[str]:
+        token_json = self._tokens.get(workspace_id)
+        if token_json is None:
+            token_json = repository.get_google_token(workspace_id)
+            if token_json:
+                self._tokens.set(workspace_id, token_json)
+        return token_json
+
+    def save_google_token(self, workspace_id: str, token_json: str) -> None:
+        repository.save_google_token(workspace_id, token_json)
+        self._tokens.delete(workspace_id)
 
+    def update_google_token(self, workspace_id: str, token_json: str) -> None:
+        repository.update_google_token(workspace_id, token_json)
+        self._tokens.delete(workspace_id)
 
+    def cache_stats(self) -> dict:
+        """프로세스 내 캐시별 크기와 적중률."""
+        return {cache.name: cache.stats() for cache in (self._workspaces, self._tokens, self._bodies, self._contexts)}
+
+
+    @timed("service.latest_session")
     def latest_session(
         self,
         workspace_id: str,
@@ -45,76 +111,132 @@ class MemoryService:
         [PULL 로직] 로컬 DB에서 최신 세션을 가져오고,
         Google Docs API를 호출하여 실제 메타데이터를 함께 반환합니다.
         """
+        row, meta = self._latest_row(workspace_id, category)
+        return self._row_to_session(row, meta) if row else None
+
+    @timed("service.latest_session_body")
+    def latest_session_body(
+        self,
+        workspace_id: str,
+        scope: str,
+        team_key: Optional[str],
+        category: Optional[str],
+    ) -> Optional[bytes]:
+        """`latest_session`과 같은 응답을 JSON bytes로 반환합니다 (GET /sessions/latest 빠른 경로)."""
+        row, meta = self._latest_row(workspace_id, category)
+        return self._session_body(row, meta) if row else None
+
+    def _latest_row(self, workspace_id: str, category: Optional[str]):
+        """최신 세션 행과 Google Docs 메타데이터(실패 시 None)를 반환합니다."""
+        bind_workspace(workspace_id)
         
         # 1. Google Docs 메타데이터 먼저 조회 (PULL)
         # (로컬 DB 조회 '전에' 호출해야 토큰 갱신을 먼저 처리할 수 있음)
         meta: DocumentMeta | None = None
         try:
             # (선행 작업 1) 워크스페이스에서 GDoc ID 가져오기
-            workspace = repository.get_workspace(workspace_id)
+            workspace = self.get_workspace(workspace_id)
             if not workspace:
                 raise ValueError("WORKSPACE_NOT_FOUND")
             doc_id = workspace.doc_personal_id
-            
-            # (선행 작업 2) DB에서 Google OAuth 토큰 가져오기
-            token_json = repository.get_google_token(workspace_id)
-            if not token_json:
-                raise Exception("Google 인증 토큰이 없습니다. 먼저 인증하세요.")
 
-            # (어댑터 사용 1) 어댑터 초기화 (이때 토큰 갱신 발생 가능)
-            adapter = GoogleDocsAdapter(token_json)
+            # 다른 워커가 최근에 가져온 메타가 있으면 어댑터 생성과 Drive 호출을 건너뜁니다.
+            meta = self._cached_meta(doc_id)
+            if meta is None:
+                # (선행 작업 2) DB에서 Google OAuth 토큰 가져오기
+                token_json = self.get_google_token(workspace_id)
+                if not token_json:
+                    raise Exception("Google 인증 토큰이 없습니다. 먼저 인증하세요.")
 
-            # (어댑터 사용 2) GDoc 실제 메타데이터 가져오기
-            meta = adapter.fetch_meta(doc_id)
-            
-            # (선행 작업 3) 갱신된 토큰이 있다면 DB에 다시 저장
-            refreshed_token_json = adapter.get_current_token_json()
-            if refreshed_token_json != token_json:
-                repository.update_google_token(workspace_id, refreshed_token_json)
+                # (어댑터 사용 1) 어댑터 초기화 (이때 토큰 갱신 발생 가능)
+                adapter = GoogleDocsAdapter(token_json)
+
+                # (어댑터 사용 2) GDoc 실제 메타데이터 가져오기
+                meta = adapter.fetch_meta(doc_id)
+                self._remember_meta(meta)
+
+                # (선행 작업 3) 갱신된 토큰이 있다면 DB에 다시 저장
+                refreshed_token_json = adapter.get_current_token_json()
+                if refreshed_token_json != token_json:
+                    self.update_google_token(workspace_id, refreshed_token_json)
         
         except Exception as e:
             # GDoc API 호출에 실패해도 (예: 토큰 만료) 
-            # 로컬 DB 데이터는 반환하도록 오류를 출력만 합니다.
-            print(f"[ERROR] Google Docs meta fetch 실패: {e}")
+            # 로컬 DB 데이터는 반환하도록 오류를 기록만 합니다.
+            logger.error("Google Docs meta fetch 실패: %s", e)
             # TODO: 인증 만료(Re-authentication required) 오류 시 
             #       클라이언트에 "REAUTH_REQUIRED" 상태를 보내는 것이 좋음
             meta = None
 
 
         # 2. 로컬 DB에서 세션 조회 (기존 로직)
-        sessions = repository.list_sessions(workspace_id)
-        if not sessions:
-            return None
-            
         row_to_return = None
         if category:
             cat_upper = category.strip().upper()
-            for row in reversed(sessions):
+            for row in reversed(repository.list_sessions(workspace_id)):
                 categories = [c.upper() for c in json_load(row["categories"], [])]
                 if cat_upper in categories:
                     row_to_return = row
                     break
-            if not row_to_return:
-                return None
         else:
-            row_to_return = sessions[-1]
-
-        # 3. 로컬 DB 정보(row)와 GDoc 메타(meta)를 합쳐서 반환
-        return self._row_to_session(row_to_return, meta)
+            # 카테고리 조건이 없으면 (workspace_id, last_updated, seq) 인덱스로 최신 행 하나만 읽습니다.
+            row_to_return = repository.get_latest_session(workspace_id)
+        # 3. 로컬 DB 정보(row)와 GDoc 메타(meta)는 호출한 쪽에서 합칩니다.
+        return row_to_return, meta
 
 
-    def create_session(self, payload: SessionCreateRequest) -> SessionResponse | ConflictResponse:
+    @timed("service.create_session")
+    def create_session(
+        self, payload: SessionCreateRequest, idempotency_key: Optional[str] = None
+    ) -> SessionResponse | ConflictResponse | IdempotentReplay:
         """
         [PUSH 로직] 로컬 DB에 세션을 저장하고,
         Google Docs API를 호출하여 실제 문서에 내용을 추가(append)합니다.
+        같은 멱등성 키(없으면 요청 내용 해시)로 다시 온 요청은 처음 응답을 돌려줍니다 (app/idempotency.py).
         """
-        workspace = repository.get_workspace(payload.workspace_id)
+        bind_workspace(payload.workspace_id)
+        workspace = self.get_workspace(payload.workspace_id)
         if not workspace:
             raise ValueError("WORKSPACE_NOT_FOUND")
+        if settings.idempotency_ttl_seconds <= 0:
+            return self._push_session(payload, workspace)
 
+        # 리비전 검사보다 먼저 확인해야 재전송(이미 바뀐 기준 리비전)이 충돌로 보이지 않습니다.
+        fingerprint = request_hash(payload)
+        key = idempotency_key or f"auto:{fingerprint}"
+        now = datetime.utcnow()
+        claimed, existing = repository.claim_idempotency_key(
+            payload.workspace_id,
+            key,
+            fingerprint,
+            now,
+            expired_before=now - timedelta(seconds=settings.idempotency_ttl_seconds),
+            stale_before=now - timedelta(seconds=settings.idempotency_pending_timeout_seconds),
+        )
+        if not claimed:
+            if existing and existing["request_hash"] != fingerprint:
+                raise IdempotencyError(422, "IDEMPOTENCY_KEY_REUSED")
+            if not existing or existing["response"] is None:
+                raise IdempotencyError(409, "IDEMPOTENCY_KEY_IN_PROGRESS")
+            logger.info("재전송된 요청: 처음 응답을 반환합니다", extra={"idempotency_key": key})
+            return IdempotentReplay(existing["response"])
+
+        try:
+            result = self._push_session(payload, workspace)
+        except BaseException:
+            repository.release_idempotency_key(payload.workspace_id, key)
+            raise
+        if isinstance(result, ConflictResponse):
+            repository.release_idempotency_key(payload.workspace_id, key)
+        else:
+            repository.complete_idempotency_key(payload.workspace_id, key, result.model_dump_json())
+        return result
+
+    def _push_session(self, payload: SessionCreateRequest, workspace: Workspace) -> SessionResponse | ConflictResponse:
         # 1. 리비전 충돌 검사 (기존 로직)
         current_revision = repository.current_revision(payload.workspace_id)
         if payload.revision and payload.revision != current_revision:
+            record_conflict()
             return ConflictResponse(
                 expected_revision=current_revision,
                 provided_revision=payload.revision,
@@ -123,6 +245,25 @@ class MemoryService:
         # 2. 로컬 DB에 저장 (기존 로직)
         revision_id = str(uuid.uuid4())
         categories = self._derive_categories(payload.content)
+        signature, match, latest = self._near_duplicate(payload)
+        if match is not None and match["id"] == latest["id"] and settings.near_duplicate_mode == "merge":
+            # 체인 최신 세션과 거의 같으면 새 세션/Docs 추가 없이 그 세션의 본문만 바꿉니다.
+            if repository.merge_session(
+                match["id"], match["content_hash"], payload.workspace_id, revision_id, payload.content, categories, signature
+            ):
+                logger.info("근접 중복 push: 최신 세션에 병합했습니다", extra={"merged_revision": match["revision_id"]})
+                meta = self._cached_meta(workspace.doc_personal_id)
+                return SessionResponse(
+                    revision_id=revision_id,
+                    last_updated=datetime.utcnow(),
+                    categories=categories,
+                    scope=payload.scope,
+                    team_key=payload.team_key,
+                    content=payload.content,
+                    doc_url=meta.url if meta else None,
+                    matched_category=None,
+                    status="OK_MERGED_NEAR_DUPLICATE",
+                )
         repository.insert_session(
             payload.workspace_id,
             payload.scope,
@@ -130,6 +271,9 @@ class MemoryService:
             revision_id,
             payload.content,
             categories,
+            simhash=signature,
+            # 근접 중복이면 그 본문에 대한 델타로 저장합니다 (체인 직전 본문보다 작음).
+            base_hash=match["content_hash"] if match is not None else None,
         )
 
         # 3. [추가] Google Docs에 PUSH
@@ -139,28 +283,32 @@ class MemoryService:
             doc_id = workspace.doc_personal_id
             
             # (선행 작업 2) DB에서 Google OAuth 토큰 가져오기
-            token_json = repository.get_google_token(payload.workspace_id)
+            token_json = self.get_google_token(payload.workspace_id)
             if not token_json:
                 raise Exception("Google 인증 토큰이 없습니다. 먼저 인증하세요.")
 
             # (어댑터 사용 1) 어댑터 초기화 (토큰 갱신)
             adapter = GoogleDocsAdapter(token_json)
 
-            # (어댑터 사용 2) GDoc에 내용 추가 (PUSH)
+            # (어댑터 사용 2) GDoc에 내용 추가 (PUSH). 역방향 동기화가 이 블록들을 다시 가져오지 않도록 먼저 기록합니다.
+            # 본문에 `---` 줄이 있으면 문서에서는 여러 블록으로 나뉘므로 나뉜 블록마다 기록합니다.
+            hashes = [block_hash(block) for block in split_blocks(payload.content)]
+            repository.remember_doc_blocks(payload.workspace_id, doc_id, hashes)
             adapter.append_handoff(doc_id, payload.content)
 
-            # (어댑터 사용 3) PUSH 성공 후, 최신 메타데이터 다시 가져오기
+            # (어댑터 사용 3) PUSH 성공 후, 최신 메타데이터 다시 가져오기 (공유 캐시도 갱신)
             meta = adapter.fetch_meta(doc_id)
+            self._remember_meta(meta)
             doc_url = meta.url if meta else None
             
             # (선행 작업 3) 갱신된 토큰 DB에 저장
             refreshed_token_json = adapter.get_current_token_json()
             if refreshed_token_json != token_json:
-                repository.update_google_token(payload.workspace_id, refreshed_token_json)
+                self.update_google_token(payload.workspace_id, refreshed_token_json)
 
         except Exception as e:
             # GDoc PUSH 실패 시, 로컬 저장은 이미 완료되었음
-            print(f"[ERROR] Google Docs append_handoff 실패: {e}")
+            logger.error("Google Docs append_handoff 실패: %s", e)
             # TODO: 클라이언트에 "PUSH_FAILED" 같은 상태를 보내는 것이 좋음
             pass
 
@@ -178,10 +326,177 @@ class MemoryService:
             status="OK_LOCAL_SAVED" # (PUSH 성공 여부와 관계없이 로컬 성공)
         )
 
+    @timed("service.import_doc_blocks")
+    def import_doc_blocks(
+        self, workspace_id: str, scope: str, team_key: Optional[str], blocks: List[str]
+    ) -> List[str]:
+        """Google Docs에서 직접 추가/수정한 블록을 문서 순서대로 세션으로 저장합니다 (Docs에는 다시 쓰지 않음).
+
+        마지막 블록이 최신 세션이 되고 현재 리비전이 바뀝니다. 저장한 revision_id 목록을 반환합니다.
+        """
+        revisions = []
+        for text in blocks:
+            revision_id = str(uuid.uuid4())
+            repository.insert_session(
+                workspace_id,
+                scope,
+                team_key,
+                revision_id,
+                text,
+                self._derive_categories(text),
+                simhash=simhash(text) if settings.near_duplicate_mode != "off" else None,
+            )
+            revisions.append(revision_id)
+        return revisions
+
+    @timed("service.diff_sessions")
+    def diff_sessions(
+        self,
+        workspace_id: str,
+        from_revision: str,
+        to_revision: Optional[str] = None,
+    ) -> Optional[SessionDiffResponse]:
+        """두 리비전의 본문을 서버에서 복원해 unified diff로 반환합니다 (to 생략 시 현재 리비전)."""
+        bind_workspace(workspace_id)
+        to_revision = to_revision or repository.current_revision(workspace_id)
+        from_row = repository.get_session_by_revision(workspace_id, from_revision)
+        to_row = repository.get_session_by_revision(workspace_id, to_revision)
+        if not from_row or not to_row:
+            return None
+
+        diff_lines = list(
+            difflib.unified_diff(
+                repository.session_content(from_row).splitlines(keepends=True),
+                repository.session_content(to_row).splitlines(keepends=True),
+                fromfile=from_revision,
+                tofile=to_revision,
+            )
+        )
+        # 마지막 줄에 개행이 없으면 diff 줄이 붙지 않도록 보정합니다.
+        diff = "".join(line if line.endswith("\n") else line + "\n" for line in diff_lines)
+        return SessionDiffResponse(
+            from_revision=from_revision,
+            to_revision=to_revision,
+            diff=diff,
+            added_lines=sum(1 for line in diff_lines if line.startswith("+") and not line.startswith("+++")),
+            removed_lines=sum(1 for line in diff_lines if line.startswith("-") and not line.startswith("---")),
+        )
+
+    @timed("service.context_bundle")
+    def context_bundle(
+        self,
+        workspace_id: str,
+        budget_tokens: int,
+        scope: Optional[str],
+        team_key: Optional[str],
+        category: Optional[str],
+    ) -> Optional[bytes]:
+        """최신 핸드오프 + 최근 핸드오프의 가치 높은 섹션을 토큰 예산 안에서 묶은 응답 JSON (app/context.py)."""
+        bind_workspace(workspace_id)
+        key = (workspace_id, repository.current_revision(workspace_id), budget_tokens, scope, team_key, category)
+        body = self._contexts.get(key)
+        if body is not None:
+            return body
+        rows = repository.recent_sessions(workspace_id, settings.context_history, scope, team_key, category)
+        if not rows:
+            return None
+        sessions = [
+            context.SessionText(row["revision_id"], row["last_updated"], repository.session_content(row)) for row in rows
+        ]
+        content, parts, truncated = context.build_bundle(sessions, budget_tokens)
+        body = dump_fields(
+            ContextBundleResponse,
+            {
+                "revision_id": rows[0]["revision_id"],
+                "budget_tokens": budget_tokens,
+                "estimated_tokens": context.estimate_tokens(content),
+                "truncated": truncated,
+                "parts": [dataclasses.asdict(part) for part in parts],
+                "content": content,
+            },
+        )
+        self._contexts.set(key, body)
+        return body
+
+    @timed("service.related_sessions")
+    def related_sessions(self, payload: RelatedSessionsRequest) -> List[RelatedSession]:
+        """질의 본문과 관련도가 높은 과거 세션 (app/related.py). 색인은 마지막으로 색인한 seq 이후만 갱신합니다."""
+        bind_workspace(payload.workspace_id)
+        vectors = self._related.workspace(payload.workspace_id)
+        with vectors.lock:
+            memo = {}
+            while True:
+                rows = repository.sessions_since(payload.workspace_id, vectors.last_seq, RELATED_INDEX_BATCH)
+                if not rows:
+                    break
+                for row in rows:
+                    vec = memo.get(row["content_hash"])
+                    if vec is None:
+                        if len(memo) >= RELATED_VECTOR_MEMO:
+                            memo.clear()
+                        vec = vectors.vector(repository.session_content(row))
+                        if row["content_hash"]:
+                            memo[row["content_hash"]] = vec
+                    vectors.put(row["id"], vec)
+                vectors.last_seq = rows[-1]["seq"]
+            # 보관 정책으로 지워진 세션이 섞여 있을 수 있으므로 여유 있게 뽑고 DB에 남은 행만 돌려줍니다.
+            hits = vectors.search(payload.text, payload.limit * 2)
+            found = {row["id"]: row for row in repository.get_sessions([session_id for session_id, _ in hits])}
+            for session_id, _ in hits:
+                if session_id not in found:
+                    vectors.remove(session_id)
+
+        results: List[RelatedSession] = []
+        for session_id, score in hits:
+            row = found.get(session_id)
+            if row is None:
+                continue
+            results.append(
+                RelatedSession(
+                    score=round(score, 4),
+                    revision_id=row["revision_id"],
+                    last_updated=datetime.fromisoformat(row["last_updated"]),
+                    categories=json_load(row["categories"], []),
+                    scope=row["scope"],
+                    team_key=row["team_key"],
+                    content=repository.session_content(row) if payload.include_content else None,
+                )
+            )
+            if len(results) == payload.limit:
+                break
+        return results
+
+    @timed("service.create_token")
     def create_token(self, payload: TokenCreateRequest) -> TokenResponse:
         # (변경 없음 - FastAPI 서버 API 키 발급 로직)
         return repository.create_token(payload.workspace_id, payload.scopes)
 
+    def _near_duplicate(self, payload: SessionCreateRequest):
+        """(본문 서명, 가장 가까운 근접 중복 세션, 체인 최신 세션). `NEAR_DUPLICATE_MODE=off`면 모두 None."""
+        if settings.near_duplicate_mode == "off":
+            return None, None, None
+        signature = simhash(payload.content)
+        recent = repository.recent_chain_sessions(
+            payload.workspace_id, payload.scope, payload.team_key, settings.near_duplicate_window
+        )
+        match, best = None, settings.near_duplicate_max_distance
+        for row in recent:
+            if row["simhash"] is None:
+                continue
+            gap = distance(signature, row["simhash"])
+            if gap <= best:
+                match, best = row, gap
+                if gap == 0:
+                    break
+        return signature, match, recent[0] if recent else None
+
+    def _cached_meta(self, doc_id: str) -> DocumentMeta | None:
+        cached = shared_cache.get("doc_meta", doc_id)
+        return DocumentMeta(**cached) if cached else None
+
+    def _remember_meta(self, meta: DocumentMeta) -> None:
+        shared_cache.set("doc_meta", meta.doc_id, dataclasses.asdict(meta), settings.doc_meta_ttl_seconds)
+
     def _derive_categories(self, text: str) -> List[str]:
         # (변경 없음)
         lowered = (text or "").lower()
@@ -191,6 +506,29 @@ class MemoryService:
             return ["BUG"]
         return ["GENERAL"]
 
+    def _session_body(self, row, meta: DocumentMeta | None = None) -> bytes:
+        """`_row_to_session(...)`을 FastAPI가 직렬화한 것과 같은 JSON bytes (모델/검증 없이)."""
+        doc_url = meta.url if meta else None
+        last_updated = json_datetime(meta.last_updated if meta else row["last_updated"])
+        key = (row["id"], row["revision_id"], doc_url, last_updated)
+        body = self._bodies.get(key)
+        if body is None:
+            body = dump_fields(
+                SessionResponse,
+                {
+                    "revision_id": row["revision_id"],
+                    "last_updated": last_updated,
+                    "categories": json_load(row["categories"], []),
+                    "scope": row["scope"],
+                    "team_key": row["team_key"],
+                    "content": repository.session_content(row),
+                    "doc_url": doc_url,
+                    "status": "OK_PULLED",
+                },
+            )
+            self._bodies.set(key, body)
+        return body
+
     def _row_to_session(
         self, 
         row, 
@@ -211,7 +549,7 @@ class MemoryService:
             categories=json_load(row["categories"], []),
             scope=row["scope"],
             team_key=row["team_key"],
-            content=row["content"],
+            content=repository.session_content(row),
             doc_url=doc_url, # [수정]
             matched_category=None,
             status="OK_PULLED",
@@ -0,0 +1,178 @@
+"""Retention policy, compaction into the session archive, and space reclamation.
+
+한 번 실행:
+    cd api_server_v2
+    python -m app.services.retention
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ..config import settings
+from ..db import MemoryRepository, init_db, json_load, repository
+from ..schemas import ArchivedSession, CompactionResult, RetentionPolicy
+from ..storage.archive import SessionArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 500
+VACUUM_MAX_STEPS = 200
+VACUUM_STEP_PAUSE_S = 0.05
+
+
+class RetentionService:
+    def __init__(self, repo: MemoryRepository, archive: SessionArchive, default_policy: RetentionPolicy):
+        self.repo = repo
+        self.archive = archive
+        self.default_policy = default_policy
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get_policy(self, workspace_id: str) -> RetentionPolicy:
+        row = self.repo.get_retention_policy(workspace_id)
+        if not row:
+            return self.default_policy
+        return RetentionPolicy(
+            keep_last_per_category=row["keep_last_per_category"],
+            max_age_days=row["max_age_days"],
+        )
+
+    def set_policy(self, workspace_id: str, policy: RetentionPolicy) -> RetentionPolicy:
+        self.repo.set_retention_policy(workspace_id, policy.keep_last_per_category, policy.max_age_days)
+        return policy
+
+    def select_expired(self, rows, policy: RetentionPolicy, now: datetime, current_revision: str) -> List:
+        """보관 대상 행을 고릅니다. rows는 최신순이어야 합니다.
+
+        카테고리별 최근 N개에 들거나 D일 이내이면 유지합니다. 현재 리비전과
+        (scope, team) 체인별 최신 세션은 정책과 관계없이 항상 유지합니다.
+        """
+        keep_last = policy.keep_last_per_category or 0
+        max_age = policy.max_age_days or 0
+        if not keep_last and not max_age:
+            return []
+        cutoff = (now - timedelta(days=max_age)).isoformat() if max_age else None
+
+        seen: Dict[str, int] = {}
+        chains = set()
+        expired = []
+        for row in rows:
+            chain = (row["scope"], row["team_key"] or "")
+            keep = row["revision_id"] == current_revision or chain not in chains
+            chains.add(chain)
+            if cutoff and row["last_updated"] >= cutoff:
+                keep = True
+            for category in json_load(row["categories"], []) or ["GENERAL"]:
+                seen[category] = seen.get(category, 0) + 1
+                if keep_last and seen[category] <= keep_last:
+                    keep = True
+            if not keep:
+                expired.append(row)
+        return expired
+
+    def compact_workspace(self, workspace_id: str, now: Optional[datetime] = None) -> CompactionResult:
+        """만료된 세션을 보관 파일로 옮긴 뒤 DB에서 삭제합니다."""
+        now = now or datetime.utcnow()
+        rows = list(reversed(self.repo.list_sessions(workspace_id)))
+        expired = self.select_expired(
+            rows, self.get_policy(workspace_id), now, self.repo.current_revision(workspace_id)
+        )
+        if not expired:
+            return CompactionResult(workspace_id=workspace_id, archived=0, kept=len(rows))
+        expired_ids = {row["id"] for row in expired}
+
+        # 남는 세션의 델타 체인이 삭제될 blob에 기대지 않도록 체인별 가장 오래된 세션을 스냅샷으로 바꿉니다.
+        oldest_kept: Dict[tuple, str] = {}
+        for row in rows:
+            if row["id"] not in expired_ids and row["content_hash"]:
+                oldest_kept[(row["scope"], row["team_key"] or "")] = row["content_hash"]
+        for digest in oldest_kept.values():
+            self.repo.rebase_blob(digest)
+
+        # 보관 파일에 먼저 기록하고 나서 삭제합니다 (중간에 실패하면 다음 실행에서 다시 보관).
+        for start in range(0, len(expired), ARCHIVE_BATCH_SIZE):
+            batch = expired[start:start + ARCHIVE_BATCH_SIZE]
+            self.archive.append(workspace_id, [self._archive_record(row) for row in batch])
+            self.repo.delete_sessions([row["id"] for row in batch])
+
+        return CompactionResult(workspace_id=workspace_id, archived=len(expired), kept=len(rows) - len(expired))
+
+    def _archive_record(self, row) -> dict:
+        return {
+            "id": row["id"],
+            "workspace_id": row["workspace_id"],
+            "scope": row["scope"],
+            "team_key": row["team_key"],
+            "revision_id": row["revision_id"],
+            "categories": json_load(row["categories"], []),
+            "last_updated": row["last_updated"],
+            "content": self.repo.session_content(row),
+        }
+
+    def search_archive(self, workspace_id: str, query: str = "", limit: int = 20) -> List[ArchivedSession]:
+        return [ArchivedSession(**record) for record in self.archive.search(workspace_id, query, limit)]
+
+    def reclaim_space(self) -> None:
+        for _ in range(VACUUM_MAX_STEPS):
+            if self.repo.backend.reclaim_space(settings.vacuum_pages_per_step) <= 0:
+                return
+            time.sleep(VACUUM_STEP_PAUSE_S)
+
+    def run_once(self, now: Optional[datetime] = None) -> dict:
+        now = now or datetime.utcnow()
+        archived = sum(self.compact_workspace(ws.id, now).archived for ws in self.repo.list_workspaces())
+        summary = {
+            "archived_sessions": archived,
+            "expired_tokens": self.repo.purge_expired_tokens(now),
+            "expired_idempotency_keys": self.repo.purge_idempotency_keys(
+                now - timedelta(seconds=settings.idempotency_ttl_seconds)
+            ),
+            "stale_revisions": self.repo.prune_stale_revisions(),
+            "deleted_blobs": self.repo.collect_garbage_blobs(),
+        }
+        self.reclaim_space()
+        return summary
+
+    # === 백그라운드 작업 ===
+
+    def start(self, interval_seconds: int) -> None:
+        if self._thread or interval_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval_seconds,), name="retention-compaction", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self, interval_seconds: int) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                summary = self.run_once()
+                logger.info("retention 압축 완료", extra=summary)
+            except Exception:
+                logger.exception("retention 작업 실패")
+
+
+retention_service = RetentionService(
+    repository,
+    SessionArchive(settings.archive_dir, settings.archive_codec),
+    RetentionPolicy(
+        keep_last_per_category=settings.retention_keep_last_per_category or None,
+        max_age_days=settings.retention_max_age_days or None,
+    ),
+)
+
+
+if __name__ == "__main__":
+    init_db()
+    print(retention_service.run_once())
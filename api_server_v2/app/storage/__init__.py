@@ -0,0 +1,21 @@
+"""Pluggable storage backends for MemoryRepository."""
+from __future__ import annotations
+
+from .base import StorageBackend
+from .sqlite import SQLiteBackend
+
+
+def create_backend(settings) -> StorageBackend:
+    """Settings.storage_backend 값에 맞는 백엔드를 생성합니다."""
+    if settings.storage_backend == "postgres":
+        from .postgres import PostgresBackend
+
+        return PostgresBackend(
+            settings.postgres_dsn,
+            min_size=settings.postgres_pool_min,
+            max_size=settings.postgres_pool_max,
+        )
+    return SQLiteBackend(settings.sqlite_path)
+
+
+__all__ = ["StorageBackend", "SQLiteBackend", "create_backend"]
@@ -0,0 +1,89 @@
+"""Compressed monthly JSONL archive for compacted sessions.
+
+보관 파일: `<archive_dir>/<workspace_id>/<YYYY-MM>.jsonl.gz` (zstd 사용 시 `.jsonl.zst`).
+파일에는 압축 프레임을 이어 붙이므로 기존 내용을 다시 쓰지 않고 추가할 수 있습니다.
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+class SessionArchive:
+    def __init__(self, root: Path | str, codec: str = "gzip"):
+        if codec == "zstd" and zstandard is None:
+            codec = "gzip"
+        self.root = Path(root)
+        self.codec = codec
+
+    def _workspace_dir(self, workspace_id: str) -> Path:
+        # workspace_id는 경로 구분자를 포함하지 않는 값(uuid)만 허용합니다.
+        if not workspace_id or "/" in workspace_id or "\\" in workspace_id or workspace_id.startswith("."):
+            raise ValueError(f"잘못된 workspace_id: {workspace_id!r}")
+        return self.root / workspace_id
+
+    def append(self, workspace_id: str, records: Iterable[dict]) -> int:
+        """레코드를 last_updated의 연-월 파일로 나눠 압축 프레임 하나씩 추가합니다."""
+        by_month: Dict[str, List[str]] = {}
+        for record in records:
+            month = (record.get("last_updated") or "unknown")[:7]
+            by_month.setdefault(month, []).append(json.dumps(record, ensure_ascii=False))
+
+        directory = self._workspace_dir(workspace_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for month, lines in by_month.items():
+            payload = ("\n".join(lines) + "\n").encode("utf-8")
+            if self.codec == "zstd":
+                frame = zstandard.ZstdCompressor().compress(payload)
+            else:
+                frame = gzip.compress(payload)
+            path = directory / f"{month}{EXTENSIONS[self.codec]}"
+            with open(path, "ab") as fh:
+                fh.write(frame)
+                fh.flush()
+            written += len(lines)
+        return written
+
+    def _read_lines(self, path: Path) -> Iterator[str]:
+        if path.name.endswith(EXTENSIONS["zstd"]):
+            if zstandard is None:
+                raise RuntimeError("zstd 보관 파일을 읽으려면 `pip install zstandard`가 필요합니다.")
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True)
+        else:
+            raw = gzip.open(path, "rb")
+        with io.TextIOWrapper(raw, encoding="utf-8") as text:
+            for line in text:
+                if line.strip():
+                    yield line
+
+    def files(self, workspace_id: str) -> List[Path]:
+        directory = self._workspace_dir(workspace_id)
+        if not directory.exists():
+            return []
+        paths = [p for p in directory.iterdir() if p.name.endswith(tuple(EXTENSIONS.values()))]
+        return sorted(paths, reverse=True)  # 최신 월부터
+
+    def search(self, workspace_id: str, query: str = "", limit: int = 20) -> List[dict]:
+        """보관된 세션 중 본문에 query가 포함된 항목을 최신 월부터 찾습니다 (대소문자 무시)."""
+        needle = query.casefold()
+        results: List[dict] = []
+        for path in self.files(workspace_id):
+            for line in self._read_lines(path):
+                record = json.loads(line)
+                if needle and needle not in (record.get("content") or "").casefold():
+                    continue
+                results.append(record)
+                if len(results) >= limit:
+                    return results
+        return results
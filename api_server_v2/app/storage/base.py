@@ -0,0 +1,43 @@
+"""Storage backend protocol shared by the SQLite and PostgreSQL implementations."""
+from __future__ import annotations
+
+from typing import Any, ContextManager, Iterable, List, Mapping, Optional, Protocol, Sequence
+
+Row = Mapping[str, Any]
+
+
+class Transaction(Protocol):
+    """트랜잭션 안에서 사용하는 최소 실행 인터페이스."""
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> Any: ...
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> Any: ...
+
+
+class StorageBackend(Protocol):
+    """MemoryRepository가 의존하는 저장소 백엔드.
+
+    SQL은 `?` placeholder와 SQLite/PostgreSQL 공통 문법(`ON CONFLICT ... DO UPDATE` 등)으로
+    작성하고, 백엔드가 드라이버에 맞게 변환합니다. 조회 결과 row는 컬럼 이름으로 접근합니다.
+    """
+
+    name: str
+    blob_type: str  # 바이너리 컬럼 타입 (SQLite: BLOB, PostgreSQL: BYTEA)
+
+    def columns(self, table: str) -> set[str]: ...
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[Row]: ...
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Row]: ...
+
+    def transaction(self) -> ContextManager[Transaction]: ...
+
+    def execute_autocommit(self, sql: str) -> None:
+        """트랜잭션 밖에서 실행해야 하는 문장 (예: PostgreSQL `CREATE INDEX CONCURRENTLY`)."""
+        ...
+
+    def reclaim_space(self, max_pages: int) -> int:
+        """삭제로 비워진 공간을 조금씩 반환하고, 남은 작업량(0이면 완료)을 돌려줍니다."""
+        ...
+
+    def close(self) -> None: ...
@@ -0,0 +1,90 @@
+"""Content-addressed, compressed session bodies.
+
+세션 본문은 sha256(본문) → 압축 바이트로 `blobs` 테이블에 한 번만 저장되고,
+sessions 행은 `content_hash`로 참조합니다. 코덱 이름은 blob마다 기록되므로
+설정을 바꿔도 기존 blob은 그대로 읽을 수 있습니다.
+"""
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import Dict, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# [HANDOFF] 템플릿(prompts/, examples/)에서 자주 반복되는 조각으로 만든 공유 사전.
+# zlib은 사전 끝부분을 가장 가까운 거리로 참조하므로 빈도가 높은 조각을 뒤에 둡니다.
+# 내용을 바꾸면 기존 blob을 읽을 수 없으므로 새 ID(d2, d3...)로 추가해야 합니다.
+HANDOFF_DICTIONARIES: Dict[str, bytes] = {
+    "d1": (
+        "타임스탬프: 제약: 불릿 10줄 이내, 숫자/날짜 명시, 군더더기 금지.\n"
+        "실행: 생성된 블록을 중앙 문서 끝에 붙여넣거나, Memory Handoff 웹앱으로 \"문서에 추가\".\n"
+        "(기한·우선순위·담당=나) [추정] [불명확] 2025- KST\n"
+        "[AUTO_CATEGORY] GENERAL, MEETING, BUG, FEATURE, RESEARCH, HANDOFF\n"
+        "[Source Link] https://docs.google.com/document/d/\n"
+        "[TL;DR]\n"
+        "[Startup Decisions]\n"
+        "[Personal Learnings]\n"
+        "[Next Actions]\n"
+        "[Open Questions]\n"
+        "[Keywords] #\n"
+        "[Memory Updates]\n"
+        "[HANDOFF] \n"
+    ).encode("utf-8"),
+}
+DEFAULT_DICTIONARY = "d1"
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+_zstd_dicts: Dict[str, "zstandard.ZstdCompressionDict"] = {}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _zstd_dict(dict_id: str):
+    if dict_id not in _zstd_dicts:
+        _zstd_dicts[dict_id] = zstandard.ZstdCompressionDict(
+            HANDOFF_DICTIONARIES[dict_id], dict_type=zstandard.DICT_TYPE_RAWCONTENT
+        )
+    return _zstd_dicts[dict_id]
+
+
+def compress(text: str, codec: str = "zlib", use_dictionary: bool = True) -> Tuple[str, bytes]:
+    """본문을 압축해 (코덱 이름, 바이트)를 반환합니다. 코덱 이름 예: `zlib`, `zlib+d1`, `zstd+d1`."""
+    raw = text.encode("utf-8")
+    dict_id = DEFAULT_DICTIONARY if use_dictionary else ""
+    if codec == "zstd" and zstandard is not None:
+        if dict_id:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=_zstd_dict(dict_id))
+            return f"zstd+{dict_id}", compressor.compress(raw)
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if dict_id:
+        compressor = zlib.compressobj(ZLIB_LEVEL, zdict=HANDOFF_DICTIONARIES[dict_id])
+        return f"zlib+{dict_id}", compressor.compress(raw) + compressor.flush()
+    return "zlib", zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress(codec: str, data: bytes) -> str:
+    name, _, dict_id = codec.partition("+")
+    data = bytes(data)
+    if name == "zlib":
+        if dict_id:
+            decompressor = zlib.decompressobj(zdict=HANDOFF_DICTIONARIES[dict_id])
+            raw = decompressor.decompress(data) + decompressor.flush()
+        else:
+            raw = zlib.decompress(data)
+    elif name == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd blob을 읽으려면 `pip install zstandard`가 필요합니다.")
+        dict_data = _zstd_dict(dict_id) if dict_id else None
+        raw = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+    elif name == "raw":
+        raw = data
+    else:
+        raise ValueError(f"알 수 없는 blob 코덱: {codec}")
+    return raw.decode("utf-8")
@@ -0,0 +1,36 @@
+"""Line-level deltas between consecutive session bodies.
+
+델타는 JSON 배열입니다. `[i1, i2]` 항목은 기준 본문의 i1~i2 줄을 그대로 복사하고,
+문자열 항목은 새로 추가된 텍스트입니다.
+"""
+from __future__ import annotations
+
+import json
+from difflib import SequenceMatcher
+from typing import List, Union
+
+DeltaOp = Union[List[int], str]
+
+
+def make_delta(base: str, text: str) -> str:
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops: List[DeltaOp] = []
+    matcher = SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(lines[j1:j2]))
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    base_lines = base.splitlines(keepends=True)
+    parts: List[str] = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
@@ -0,0 +1,92 @@
+"""PostgreSQL storage backend (여러 API 레플리카가 같은 저장소를 공유할 때 사용)."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    dict_row = None
+    ConnectionPool = None
+
+
+def to_pyformat(sql: str) -> str:
+    """`?` placeholder를 psycopg의 `%s`로 바꿉니다 (리터럴 `%`는 이스케이프)."""
+    return sql.replace("%", "%%").replace("?", "%s")
+
+
+class _PostgresTransaction:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, sql: str, params: Sequence[Any] = ()):
+        return self._conn.execute(to_pyformat(sql), params)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]):
+        with self._conn.cursor() as cur:
+            cur.executemany(to_pyformat(sql), seq_of_params)
+            return cur
+
+
+class PostgresBackend:
+    name = "postgres"
+    blob_type = "BYTEA"
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        if ConnectionPool is None:
+            raise RuntimeError("PostgreSQL 백엔드를 사용하려면 `pip install psycopg[binary] psycopg_pool`이 필요합니다.")
+        if not dsn:
+            raise RuntimeError("POSTGRES_DSN이 설정되지 않았습니다.")
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={"row_factory": dict_row},
+            open=True,
+        )
+
+    def columns(self, table: str) -> set[str]:
+        rows = self.fetchall(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = ?",
+            (table,),
+        )
+        return {row["column_name"] for row in rows}
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[dict]:
+        with self.pool.connection() as conn:
+            return conn.execute(to_pyformat(sql), params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[dict]:
+        with self.pool.connection() as conn:
+            return conn.execute(to_pyformat(sql), params).fetchall()
+
+    @contextmanager
+    def transaction(self) -> Iterator[_PostgresTransaction]:
+        # pool.connection()은 블록이 정상 종료되면 commit, 예외 시 rollback 합니다.
+        with self.pool.connection() as conn:
+            yield _PostgresTransaction(conn)
+
+    def execute_autocommit(self, sql: str) -> None:
+        with self.pool.connection() as conn:
+            conn.autocommit = True
+            try:
+                conn.execute(sql)
+            finally:
+                conn.autocommit = False
+
+    def reclaim_space(self, max_pages: int) -> int:
+        # PostgreSQL의 일반 VACUUM은 읽기/쓰기를 막지 않으므로 한 번에 실행합니다.
+        with self.pool.connection() as conn:
+            conn.autocommit = True
+            try:
+                conn.execute("VACUUM (ANALYZE) sessions")
+                conn.execute("VACUUM (ANALYZE) blobs")
+                conn.execute("VACUUM (ANALYZE) tokens")
+            finally:
+                conn.autocommit = False
+        return 0
+
+    def close(self) -> None:
+        self.pool.close()
@@ -0,0 +1,72 @@
+"""SQLite storage backend (기본값, 단일 호스트용)."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence
+
+
+class SQLiteBackend:
+    name = "sqlite"
+    blob_type = "BLOB"
+
+    def __init__(self, path: Path | str, busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # 첫 사용 시점에 연결합니다. fork 이후(gunicorn --preload)에는 부모의 연결을 쓰지 않습니다.
+        if self._conn is None or self._pid != os.getpid():
+            with self._lock:
+                if self._conn is None or self._pid != os.getpid():
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.row_factory = sqlite3.Row
+                    # 새 DB에서만 적용됩니다. 기존 DB는 한 번 `VACUUM`을 실행해야 증분 vacuum이 동작합니다.
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    # 여러 워커 프로세스가 같은 파일을 쓸 때: 읽기는 쓰기를 막지 않고(WAL), 쓰기 잠금은 기다립니다.
+                    conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+                    conn.execute("PRAGMA journal_mode = WAL")
+                    self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def columns(self, table: str) -> set[str]:
+        return {row["name"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        # 커넥션 하나를 스레드 간에 공유하므로 쓰기 트랜잭션은 직렬화합니다.
+        with self._lock:
+            with self.conn:
+                yield self.conn
+
+    def execute_autocommit(self, sql: str) -> None:
+        with self._lock:
+            with self.conn:
+                self.conn.execute(sql)
+
+    def reclaim_space(self, max_pages: int) -> int:
+        # 짧은 단계로 나눠 실행해 API 쓰기 트랜잭션이 오래 기다리지 않게 합니다.
+        with self._lock:
+            if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:  # 2 = INCREMENTAL
+                return 0
+            self.conn.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+            return self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
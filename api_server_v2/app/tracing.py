@@ -0,0 +1,228 @@
+"""OpenTelemetry request tracing.
+
+`TRACING_ENABLED=true`이고 `opentelemetry-sdk`가 설치된 경우에만 활성화됩니다.
+비활성화 상태에서는 `traced`가 함수를 그대로 반환하고 `span`은 공유 nullcontext를
+돌려주므로 메트릭과 마찬가지로 요청 경로에 추가 비용이 없습니다.
+
+익스포터(`TRACING_EXPORTER`):
+- memory: 프로세스 메모리에 보관 (`finished_spans()`로 조회, 테스트용)
+- file: `TRACING_FILE`에 span 하나당 JSON 한 줄로 기록 (오프라인 분석용)
+- console: 표준 출력
+- otlp: `TRACING_OTLP_ENDPOINT`로 전송 (`opentelemetry-exporter-otlp-proto-http` 필요)
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import logging
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# 비활성화 상태에서는 OpenTelemetry SDK를 임포트하지 않습니다 (기동 시간).
+trace = None
+if settings.tracing_enabled:
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+            SpanExporter,
+            SpanExportResult,
+        )
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    except ImportError:  # pragma: no cover - optional dependency
+        trace = None
+        logger.warning("TRACING_ENABLED=true 이지만 opentelemetry-sdk가 없어 트레이싱을 비활성화합니다.")
+
+ENABLED = trace is not None
+
+_NOOP = nullcontext()
+
+# 인자 이름 → span 속성. `payload`(요청 스키마)는 같은 이름의 필드를 꺼내 씁니다.
+ATTRIBUTE_PARAMS = {
+    "workspace_id": "memoryhub.workspace_id",
+    "scope": "memoryhub.scope",
+    "team_key": "memoryhub.team_key",
+    "category": "memoryhub.category",
+    "doc_id": "memoryhub.doc_id",
+    "revision_id": "memoryhub.revision_id",
+}
+PAYLOAD_PARAMS = ("content", "text")
+
+
+if trace is not None:
+
+    class JsonLinesSpanExporter(SpanExporter):
+        """완료된 span을 JSON Lines 파일에 덧붙이는 익스포터."""
+
+        def __init__(self, path: Path):
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence) -> "SpanExportResult":
+            lines = [json.dumps(json.loads(span.to_json()), ensure_ascii=False) for span in spans]
+            with self._lock, self.path.open("a", encoding="utf-8") as handle:
+                for line in lines:
+                    handle.write(line + "\n")
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+
+_memory_exporter = None
+_provider = None
+
+
+def _build_exporter():
+    kind = settings.tracing_exporter
+    if kind == "memory":
+        return InMemorySpanExporter()
+    if kind == "file":
+        return JsonLinesSpanExporter(settings.tracing_file)
+    if kind == "console":
+        return ConsoleSpanExporter()
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+    return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint or None)
+
+
+if ENABLED:
+    _exporter = _build_exporter()
+    # 메모리/파일 익스포터는 테스트에서 바로 읽을 수 있도록 동기 처리합니다.
+    _processor = (
+        BatchSpanProcessor(_exporter) if settings.tracing_exporter == "otlp" else SimpleSpanProcessor(_exporter)
+    )
+    _provider = TracerProvider(resource=Resource.create({"service.name": settings.app_name}))
+    _provider.add_span_processor(_processor)
+    if settings.tracing_exporter == "memory":
+        _memory_exporter = _exporter
+    tracer = _provider.get_tracer("memoryhub")
+
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def span(name: str, **attributes):
+    """`with span("google.docs.get", doc_id=...):` 형태로 하위 span을 엽니다."""
+    if not ENABLED:
+        return _NOOP
+    return tracer.start_as_current_span(
+        name, attributes=_clean({ATTRIBUTE_PARAMS.get(k, f"memoryhub.{k}"): v for k, v in attributes.items()})
+    )
+
+
+def _extract_attributes(bound: inspect.BoundArguments) -> Dict[str, Any]:
+    attributes: Dict[str, Any] = {}
+    arguments = dict(bound.arguments)
+    payload = arguments.pop("payload", None)
+    if payload is not None:
+        for name in (*ATTRIBUTE_PARAMS, *PAYLOAD_PARAMS):
+            if name not in arguments and hasattr(payload, name):
+                arguments[name] = getattr(payload, name)
+    for name, attribute in ATTRIBUTE_PARAMS.items():
+        value = arguments.get(name)
+        if isinstance(value, (str, int, float, bool)):
+            attributes[attribute] = value
+    for name in PAYLOAD_PARAMS:
+        value = arguments.get(name)
+        if isinstance(value, str):
+            attributes["memoryhub.payload_bytes"] = len(value.encode("utf-8"))
+    return attributes
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """메서드 호출 하나를 span으로 감쌉니다. 인자 이름으로 workspace/scope/doc_id/payload 크기를 태깅합니다."""
+
+    def decorator(func: F) -> F:
+        if not ENABLED:
+            return func
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                attributes: Dict[str, Any] = {}
+            else:
+                attributes = _extract_attributes(bound)
+            with tracer.start_as_current_span(name, attributes=attributes):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def finished_spans() -> List[Any]:
+    """memory 익스포터에 쌓인 span 목록 (다른 익스포터이거나 비활성화면 빈 목록)."""
+    return list(_memory_exporter.get_finished_spans()) if _memory_exporter is not None else []
+
+
+def clear_spans() -> None:
+    if _memory_exporter is not None:
+        _memory_exporter.clear()
+
+
+def shutdown_tracing() -> None:
+    """대기 중인 span을 내보냅니다 (lifespan 종료 시 호출)."""
+    if _provider is not None:
+        _provider.force_flush()
+
+
+class TracingMiddleware:
+    """요청마다 루트 span(`POST /sessions` 등)을 열어 하위 span을 한 트레이스로 묶는 ASGI 미들웨어."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        ) as root:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+            route = scope.get("route")
+            if getattr(route, "path", None):
+                root.update_name(f"{scope['method']} {route.path}")
+                root.set_attribute("http.route", route.path)
+
+
+def install(app) -> None:
+    """트레이싱이 활성화된 경우에만 루트 span 미들웨어를 등록합니다."""
+    if ENABLED:
+        app.add_middleware(TracingMiddleware)
+
+
+def current_trace_id() -> Optional[str]:
+    """현재 span의 trace id (로그 상관관계용, 비활성화면 None)."""
+    if not ENABLED:
+        return None
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
@@ -0,0 +1,147 @@
+"""워크스페이스 NDJSON 내보내기/가져오기 (GET /workspaces/{id}/export, POST /workspaces/{id}/import).
+
+첫 줄은 워크스페이스 정보 `{"workspace": {...}}`, 이후 한 줄에 세션 하나(`ExportedSession`)를 seq 순서로 씁니다.
+
+- 내보내기: seq keyset 페이지(`sessions_since`)로 `EXPORT_BATCH`개씩 읽고 본문 blob은 배치마다 한 번에 읽습니다.
+  배치 하나가 응답 조각 하나이므로 메모리는 워크스페이스 크기와 관계없이 배치 크기로 정해집니다.
+  DB 커서를 응답 내내 열어 두지 않으므로 느린 클라이언트가 SQLite 쓰기나 PostgreSQL 연결 풀을 붙잡지 않습니다.
+  압축은 app/compression.py가 조각마다 합니다 (`Accept-Encoding: gzip | br`).
+- 가져오기: 요청 본문을 줄 단위로 읽어 `IMPORT_BATCH`줄마다 트랜잭션 하나로 저장합니다 (`bulk_insert_sessions`).
+  워크스페이스에 이미 있는 revision_id는 건너뛰므로 중간에 끊긴 가져오기는 같은 파일로 다시 실행하면 됩니다.
+  잘못된 줄이 있으면 그 앞 배치까지 저장한 채로 `ImportLineError`를 냅니다.
+  세션이 있는 워크스페이스에 과거 세션을 가져와도 최신 세션/현재 리비전은 그대로입니다 (`bulk_insert_sessions`).
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from .db import MemoryRepository, SessionSeed, json_load
+from .responses import dump_fields, dumps, json_datetime
+from .schemas import ExportedSession, ImportResult, Workspace
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EXPORT_BATCH = 500
+IMPORT_BATCH = 500  # revision_id 조회의 IN 목록 크기 (오래된 SQLite의 변수 상한 999 이하)
+_HEADER_PREFIX = b'{"workspace"'
+
+
+class ImportLineError(Exception):
+    def __init__(self, line: int, message: str, imported: int = 0):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.message = message
+        self.imported = imported  # 오류 전에 저장한 세션 수
+
+
+def export_lines(repo: MemoryRepository, workspace: Workspace) -> Iterator[bytes]:
+    """NDJSON 조각들 (머리 줄, 이후 세션 `EXPORT_BATCH`개씩)."""
+    yield dumps({"workspace": workspace.model_dump()}) + b"\n"
+    after_seq = None
+    while True:
+        rows = repo.sessions_since(workspace.id, after_seq, EXPORT_BATCH)
+        if not rows:
+            return
+        contents = repo.session_contents(rows)
+        yield b"".join(
+            dump_fields(
+                ExportedSession,
+                {
+                    "revision_id": row["revision_id"],
+                    "scope": row["scope"],
+                    "team_key": row["team_key"],
+                    "categories": json_load(row["categories"], []),
+                    "last_updated": json_datetime(row["last_updated"]),
+                    "content": content,
+                },
+            )
+            + b"\n"
+            for row, content in zip(rows, contents)
+        )
+        after_seq = rows[-1]["seq"]
+
+
+async def import_ndjson(
+    repo: MemoryRepository, workspace_id: str, chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> ImportResult:
+    """요청 본문 조각들을 줄로 나눠 배치마다 스레드 풀에서 검증/저장합니다."""
+    result = ImportResult(workspace_id=workspace_id, imported=0, skipped=0)
+    batch: List[Tuple[int, bytes]] = []
+    buffer = bytearray()
+    line_no = 0
+
+    async def flush() -> None:
+        imported, skipped = await run_in_threadpool(_store_batch, repo, workspace_id, batch, result.imported)
+        result.imported += imported
+        result.skipped += skipped
+        batch.clear()
+
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) >= 0:
+            line_no += 1
+            batch.append((line_no, bytes(buffer[start:end])))
+            start = end + 1
+            if len(batch) >= IMPORT_BATCH:
+                await flush()
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise ImportLineError(line_no + 1, "LINE_TOO_LONG", result.imported)
+    if buffer.strip():
+        batch.append((line_no + 1, bytes(buffer)))
+    if batch:
+        await flush()
+    return result
+
+
+def _store_batch(
+    repo: MemoryRepository, workspace_id: str, lines: List[Tuple[int, bytes]], imported: int
+) -> Tuple[int, int]:
+    """(저장한 수, 건너뛴 수). 배치 전체를 검증한 뒤 저장하므로 잘못된 줄이 있으면 이 배치는 저장하지 않습니다."""
+    sessions: List[ExportedSession] = []
+    for line_no, raw in lines:
+        raw = raw.strip()
+        if not raw or raw.startswith(_HEADER_PREFIX):
+            continue
+        try:
+            sessions.append(ExportedSession.model_validate_json(raw))
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            raise ImportLineError(line_no, f"{location}: {error['msg']}" if location else error["msg"], imported)
+
+    revision_ids = [session.revision_id or str(uuid.uuid4()) for session in sessions]
+    seen = repo.existing_revisions(workspace_id, [rid for rid, s in zip(revision_ids, sessions) if s.revision_id])
+    seeds: List[SessionSeed] = []
+    for revision_id, session in zip(revision_ids, sessions):
+        if revision_id in seen:
+            continue
+        seen.add(revision_id)
+        seeds.append(
+            (
+                workspace_id,
+                session.scope,
+                session.team_key,
+                revision_id,
+                session.content,
+                session.categories,
+                _stored_time(session.last_updated),
+            )
+        )
+    if seeds:
+        repo.bulk_insert_sessions(seeds, chunk_size=len(seeds))
+    return len(seeds), len(sessions) - len(seeds)
+
+
+def _stored_time(value: Optional[datetime]) -> Optional[str]:
+    """DB의 last_updated 형식 (UTC, 시간대 표기 없는 isoformat)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
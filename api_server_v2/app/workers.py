@@ -0,0 +1,81 @@
+"""멀티 워커 배포 보조 (`uvicorn --workers N`, `gunicorn -k uvicorn.workers.UvicornWorker -w N`).
+
+워커 프로세스는 lifespan을 각자 실행하므로 한 번만 해야 하는 작업을 파일 락으로 조정합니다.
+- `file_lock`: 스키마 생성처럼 순서대로 한 번씩 실행해야 하는 구간 (다른 워커는 기다림)
+- `LeaderLock`: 백그라운드 압축처럼 워커 하나만 실행해야 하는 작업 (락을 잡은 워커가 리더)
+
+락 파일은 `RUN_DIR`에 만들며 같은 호스트의 프로세스끼리만 조정됩니다.
+fcntl이 없는 플랫폼(Windows)에서는 락 없이 실행합니다 (단일 프로세스 전제).
+"""
+from __future__ import annotations
+
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _open(path: Path) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """배타적 파일 락을 잡고 구간을 실행합니다. 다른 프로세스가 잡고 있으면 풀릴 때까지 기다립니다."""
+    if fcntl is None:
+        yield
+        return
+    fd = _open(Path(path))
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class LeaderLock:
+    """논블로킹 파일 락. 처음 잡은 프로세스가 해제(또는 종료)할 때까지 리더로 남습니다."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+        fd = _open(self.path)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        logger.info("리더 락 획득", extra={"lock": self.path.name, "pid": os.getpid()})
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
@@ -0,0 +1 @@
+"""Benchmarks for the Memory Hub v2 API (run from api_server_v2/ with `python -m benchmarks.<name>`)."""
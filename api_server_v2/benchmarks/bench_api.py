@@ -0,0 +1,148 @@
+"""PULL/PUSH 핫 패스 벤치마크: 앱을 프로세스 안에서 띄우고 로컬 Google API 스텁에 연결합니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_api --sizes 100,1000,10000 --requests 200 --latency-ms 20
+
+히스토리 크기별로 워크스페이스를 하나씩 만들어 세션을 채운 뒤 다음 요청의
+p50/p99 지연 시간(ms)과 처리량(req/s)을 JSON으로 출력합니다.
+- latest: GET /sessions/latest
+- latest_category: GET /sessions/latest?category=MEETING
+- push: POST /sessions
+- token: POST /tokens
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .corpus import body_pool, generate_sessions, synthetic_handoffs
+from .google_stub import GoogleApiStub, stub_token_json
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(call: Callable[[int], object], requests: int, warmup: int) -> Dict[str, float]:
+    for i in range(warmup):
+        call(i)
+    samples: List[float] = []
+    started = time.perf_counter()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+    }
+
+
+def seed_history(repository, workspace_id: str, count: int, seed: int = 7) -> float:
+    """워크스페이스에 세션 `count`개를 대량 적재하고 걸린 시간(초)을 반환합니다."""
+    pool = body_pool(min(count, 5_000) or 1, seed)
+    started = time.perf_counter()
+    repository.bulk_insert_sessions(generate_sessions([workspace_id], count, pool, seed=seed))
+    return time.perf_counter() - started
+
+
+def _expect(response, *statuses: int):
+    if response.status_code not in statuses:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text[:200]}")
+    return response
+
+
+def run(sizes: List[int], requests: int, warmup: int, stub: GoogleApiStub) -> Dict[str, object]:
+    # 설정은 임포트 시점에 읽히므로 환경 변수를 먼저 지정한 뒤 앱을 불러옵니다.
+    from fastapi.testclient import TestClient
+
+    from app.db import repository
+    from app.main import app
+
+    results: Dict[str, object] = {}
+    with TestClient(app) as client:
+        for size in sizes:
+            workspace = repository.create_workspace(f"bench-{size}", f"doc-{size}", {"alpha": f"doc-{size}-alpha"})
+            repository.save_google_token(workspace.id, stub_token_json())
+            seed_s = seed_history(repository, workspace.id, size)
+            query = {"workspace_id": workspace.id, "scope": "personal"}
+            bodies = synthetic_handoffs(requests + warmup, duplicate_ratio=0.0, seed=size)
+            stub_before = stub.requests
+
+            results[str(size)] = {
+                "seed_s": round(seed_s, 2),
+                "latest": measure(lambda i: _expect(client.get("/sessions/latest", params=query), 200), requests, warmup),
+                "latest_category": measure(
+                    lambda i: _expect(client.get("/sessions/latest", params={**query, "category": "MEETING"}), 200, 404),
+                    requests,
+                    warmup,
+                ),
+                "push": measure(
+                    lambda i: _expect(
+                        client.post("/sessions", json={**query, "content": bodies[i % len(bodies)]}), 200
+                    ),
+                    requests,
+                    warmup,
+                ),
+                "token": measure(
+                    lambda i: _expect(client.post("/tokens", json={"workspace_id": workspace.id, "scopes": ["read"]}), 201),
+                    requests,
+                    warmup,
+                ),
+                "google_calls": stub.requests - stub_before,
+            }
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="쉼표로 구분한 히스토리 크기 (예: 100,10000,1000000)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="스텁의 요청당 지연 시간")
+    parser.add_argument("--doc-bytes", type=int, default=20_000, help="스텁 문서의 초기 크기")
+    parser.add_argument("--fixtures", type=Path, help="스텁에 불러올 문서 픽스처 (benchmarks.corpus --fixtures)")
+    parser.add_argument("--db", type=Path, help="SQLite 경로 (기본: 임시 파일)")
+    parser.add_argument("--output", type=Path, help="결과 JSON을 저장할 파일")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp, GoogleApiStub(
+        latency_ms=args.latency_ms, doc_bytes=args.doc_bytes, fixtures=args.fixtures
+    ) as stub:
+        os.environ.update(
+            {
+                "SQLITE_PATH": str(args.db or Path(tmp) / "bench.db"),
+                "ARCHIVE_DIR": str(Path(tmp) / "archive"),
+                "GOOGLE_API_ENDPOINT": stub.endpoint,
+                "COMPACTION_INTERVAL_SECONDS": "0",
+                "LOG_LEVEL": "WARNING",
+            }
+        )
+        results = {
+            "config": {
+                "requests": args.requests,
+                "latency_ms": args.latency_ms,
+                "doc_bytes": args.doc_bytes,
+                "storage_backend": os.environ.get("STORAGE_BACKEND", "sqlite"),
+            },
+            "sizes": run(sizes, args.requests, args.warmup, stub),
+        }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""세션 본문 저장 방식 비교: 비압축 TEXT 컬럼 vs content-addressed 압축 blob.
+
+    cd api_server_v2
+    python -m benchmarks.bench_blob_storage --sessions 5000
+
+결과는 JSON으로 stdout에 출력됩니다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from app.db import UPSERT_REVISION_SQL, MemoryRepository
+from app.storage import SQLiteBackend
+
+from .corpus import synthetic_handoffs
+
+def bench_plain(path: Path, bodies: list[str]) -> dict:
+    """기존 방식: sessions.content에 본문 전체를 TEXT로 저장."""
+    backend = SQLiteBackend(path)
+    MemoryRepository(backend).init_db()
+    conn = backend.conn
+    started = time.perf_counter()
+    for i, body in enumerate(bodies):
+        with conn:
+            conn.execute(
+                "INSERT INTO sessions (id, workspace_id, scope, team_key, revision_id, content, categories, last_updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(uuid.uuid4()), "bench", "personal", None, f"rev-{i}", body, '["GENERAL"]', datetime.utcnow().isoformat()),
+            )
+            conn.execute(UPSERT_REVISION_SQL, ("bench", f"rev-{i}"))
+    insert_s = time.perf_counter() - started
+    started = time.perf_counter()
+    read = sum(len(row[0]) for row in conn.execute("SELECT content FROM sessions"))
+    read_s = time.perf_counter() - started
+    backend.close()
+    return _result(path, bodies, insert_s, read_s, read)
+
+
+def bench_blobs(path: Path, bodies: list[str], codec: str, use_dictionary: bool) -> dict:
+    backend = SQLiteBackend(path)
+    repo = MemoryRepository(backend, blob_codec=codec, blob_dictionary=use_dictionary)
+    repo.init_db()
+    started = time.perf_counter()
+    for i, body in enumerate(bodies):
+        repo.insert_session("bench", "personal", None, f"rev-{i}", body, ["GENERAL"])
+    insert_s = time.perf_counter() - started
+    started = time.perf_counter()
+    read = sum(len(repo.session_content(row)) for row in repo.list_sessions("bench"))
+    read_s = time.perf_counter() - started
+    blobs = backend.fetchone("SELECT COUNT(*) AS n FROM blobs")["n"]
+    backend.close()
+    return dict(_result(path, bodies, insert_s, read_s, read), blobs=blobs)
+
+
+def _result(path: Path, bodies: list[str], insert_s: float, read_s: float, read_chars: int) -> dict:
+    assert read_chars == sum(len(b) for b in bodies)
+    return {
+        "db_bytes": path.stat().st_size,
+        "insert_per_s": round(len(bodies) / insert_s, 1),
+        "read_per_s": round(len(bodies) / read_s, 1),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    bodies = synthetic_handoffs(args.sessions, args.duplicate_ratio)
+    results = {
+        "sessions": len(bodies),
+        "unique_bodies": len(set(bodies)),
+        "raw_bytes": sum(len(b.encode("utf-8")) for b in bodies),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        results["plain_text"] = bench_plain(Path(tmp) / "plain.db", bodies)
+        for name, codec, use_dictionary in [
+            ("blob_zlib", "zlib", False),
+            ("blob_zlib_dict", "zlib", True),
+            ("blob_zstd_dict", "zstd", True),
+        ]:
+            results[name] = bench_blobs(Path(tmp) / f"{name}.db", bodies, codec, use_dictionary)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""핸드오프 전송 압축 벤치마크: 인코딩별 전송 크기와 느린 회선에서의 예상 전송 시간을 비교합니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_compression --sizes 1000,100000,1000000 --link-mbps 1,10
+
+핸드오프 본문 크기(bytes)별로 다음을 측정합니다.
+- pull: `GET /sessions/latest`를 `Accept-Encoding: identity | gzip | br`로 요청.
+  전송 바이트(wire_bytes), 압축/해제를 포함한 프로세스 내 p50(ms), 회선 속도별 예상 시간
+  (p50 + wire_bytes / 대역폭)을 출력합니다.
+- push: `POST /sessions` 본문을 압축 없이 / `Content-Encoding: gzip`으로 보낼 때의 전송 바이트와 p50.
+  Google 토큰이 없는 워크스페이스에 보내므로 로컬 저장까지만 측정합니다 (스텁 문서가 커지는 영향 제외).
+
+Drive 메타데이터는 공유 캐시에서 읽고 스텁 지연은 0이므로 Google 호출 비용은 빠집니다.
+br은 `pip install brotli`가 있을 때만 측정합니다.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from .bench_api import _expect, percentile
+from .bench_serialize import handoff_of_size
+from .google_stub import GoogleApiStub, stub_token_json
+
+
+def _p50_ms(call, requests: int, warmup: int) -> float:
+    for _ in range(warmup):
+        call()
+    samples = []
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - t0)
+    return round(percentile(samples, 50) * 1000, 3)
+
+
+def _link_ms(p50_ms: float, wire_bytes: int, links: List[float]) -> Dict[str, float]:
+    return {f"{mbps:g}mbps": round(p50_ms + wire_bytes * 8 / (mbps * 1e6) * 1000, 1) for mbps in links}
+
+
+def run(sizes: List[int], requests: int, warmup: int, links: List[float]) -> Dict[str, object]:
+    # 설정은 임포트 시점에 읽히므로 환경 변수를 먼저 지정한 뒤 앱을 불러옵니다.
+    from fastapi.testclient import TestClient
+
+    from app.compression import available_encodings
+    from app.db import repository
+    from app.main import app
+
+    encodings = ["identity"] + [coding for coding in ("gzip", "br") if coding in available_encodings()]
+    results: Dict[str, object] = {}
+    with TestClient(app) as client:
+        for size in sizes:
+            workspace = repository.create_workspace(f"bench-{size}", f"doc-{size}", {})
+            repository.save_google_token(workspace.id, stub_token_json())
+            text = handoff_of_size(size)
+            repository.insert_session(workspace.id, "personal", None, "rev-1", text, ["GENERAL"])
+            query = {"workspace_id": workspace.id, "scope": "personal"}
+
+            pull: Dict[str, object] = {}
+            for coding in encodings:
+                headers = {"Accept-Encoding": coding}
+                response = _expect(client.get("/sessions/latest", params=query, headers=headers), 200)
+                wire_bytes = response.num_bytes_downloaded
+                p50 = _p50_ms(
+                    lambda: _expect(client.get("/sessions/latest", params=query, headers=headers), 200).content,
+                    requests,
+                    warmup,
+                )
+                pull[coding] = {"wire_bytes": wire_bytes, "p50_ms": p50, "link_ms": _link_ms(p50, wire_bytes, links)}
+
+            local_only = repository.create_workspace(f"bench-{size}-push", f"doc-{size}-push", {})
+            raw = json.dumps(
+                {"workspace_id": local_only.id, "scope": "personal", "content": text}, ensure_ascii=False
+            ).encode("utf-8")
+            push: Dict[str, object] = {}
+            for coding, body in [("identity", raw), ("gzip", gzip.compress(raw, 6))]:
+                headers = {"Content-Type": "application/json", "Accept-Encoding": "identity"}
+                if coding != "identity":
+                    headers["Content-Encoding"] = coding
+                p50 = _p50_ms(
+                    lambda: _expect(client.post("/sessions", content=body, headers=headers), 200),
+                    max(1, requests // 4),
+                    1,
+                )
+                push[coding] = {"wire_bytes": len(body), "p50_ms": p50, "link_ms": _link_ms(p50, len(body), links)}
+
+            results[str(size)] = {"pull": pull, "push": push}
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="쉼표로 구분한 핸드오프 본문 크기(bytes)")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--link-mbps", default="1,10", help="예상 전송 시간을 계산할 회선 속도 (Mbit/s, 쉼표 구분)")
+    parser.add_argument("--output", type=Path, help="결과 JSON을 저장할 파일")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    links = [float(mbps) for mbps in args.link_mbps.split(",") if mbps.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp, GoogleApiStub(latency_ms=0) as stub:
+        os.environ.update(
+            {
+                "SQLITE_PATH": str(Path(tmp) / "bench.db"),
+                "SHARED_CACHE": "sqlite",
+                "SHARED_CACHE_PATH": str(Path(tmp) / "cache.db"),
+                "DOC_META_TTL_SECONDS": "3600",
+                "RUN_DIR": str(Path(tmp) / "run"),
+                "ARCHIVE_DIR": str(Path(tmp) / "archive"),
+                "GOOGLE_API_ENDPOINT": stub.endpoint,
+                "COMPACTION_INTERVAL_SECONDS": "0",
+                "IDEMPOTENCY_TTL_SECONDS": "0",  # 같은 본문 push를 재전송 응답이 아닌 실제 저장으로 측정
+                "LOG_LEVEL": "CRITICAL",  # push의 "Google 인증 토큰이 없습니다" 오류 로그 생략
+            }
+        )
+        results = {
+            "config": {"requests": args.requests, "link_mbps": links},
+            "sizes": run(sizes, args.requests, args.warmup, links),
+        }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
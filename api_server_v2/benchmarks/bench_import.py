@@ -0,0 +1,99 @@
+"""콜드 스타트 측정: `python -X importtime -c "import app.main"`을 여러 번 실행해 중앙값을 냅니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_import --runs 7
+
+결과(JSON)
+- import_ms: 대상 모듈의 누적 임포트 시간 중앙값
+- wall_ms: 인터프리터 시작부터 종료까지의 프로세스 시간 중앙값
+- packages: 최상위 패키지별 self 시간 합계 ms (중앙값 실행 기준, 상위 10개)
+- google_loaded: Google 클라이언트 라이브러리가 임포트되었는지 여부
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+GOOGLE_PREFIXES = ("google.oauth2", "googleapiclient", "google_auth_oauthlib", "google.auth")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """`import time: self | cumulative | name` 줄을 (이름, 들여쓰기 깊이, self µs, 누적 µs)로 변환합니다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(module: str, env: Dict[str, str]) -> Dict[str, object]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - started
+    rows = parse_importtime(result.stderr)
+    packages: Dict[str, int] = defaultdict(int)
+    for name, _, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    target = next((cumulative for name, depth, _, cumulative in rows if name == module and depth == 0), 0)
+    return {
+        "import_ms": target / 1000,
+        "wall_ms": wall * 1000,
+        "packages": {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda item: -item[1])[:10]},
+        "google_loaded": any(name.startswith(GOOGLE_PREFIXES) for name, *_ in rows),
+        "modules": len(rows),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "import.db"
+        env = {**os.environ, "SQLITE_PATH": str(database), "LOG_LEVEL": "WARNING"}
+        runs = [run_once(args.module, env) for _ in range(args.runs)]
+        db_created = database.exists()
+
+    runs.sort(key=lambda run: run["import_ms"])
+    median = runs[len(runs) // 2]
+    print(
+        json.dumps(
+            {
+                "module": args.module,
+                "runs": args.runs,
+                "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+                "wall_ms": round(statistics.median(run["wall_ms"] for run in runs), 1),
+                "modules": median["modules"],
+                "google_loaded": median["google_loaded"],
+                "db_created_on_import": db_created,
+                "packages": median["packages"],
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
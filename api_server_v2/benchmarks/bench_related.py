@@ -0,0 +1,93 @@
+"""관련도 검색 벤치마크: `POST /sessions/related`의 색인 구축 시간과 질의 지연 시간을 히스토리 크기별로 측정합니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_related --sizes 1000,10000,100000 --requests 200
+
+히스토리 크기별로 워크스페이스를 만들어 세션을 대량 적재한 뒤 다음을 JSON으로 출력합니다.
+- build_s: 첫 질의에서 전체 세션을 색인하는 데 걸린 시간
+- index_mb: 벡터 행렬 크기
+- related: 색인이 만들어진 뒤 `POST /sessions/related`(본문 제외, limit 5)의 p50/p99
+- related_content: 같은 질의에 본문 포함
+`pip install numpy`가 필요합니다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from .bench_api import _expect, measure, seed_history
+from .corpus import body_pool
+
+
+def run(sizes: List[int], requests: int, warmup: int) -> Dict[str, object]:
+    # 설정은 임포트 시점에 읽히므로 환경 변수를 먼저 지정한 뒤 앱을 불러옵니다.
+    from fastapi.testclient import TestClient
+
+    from app.db import repository
+    from app.main import app
+    from app.services.memory import memory_service
+
+    queries = [body[:400] for body, _ in body_pool(50, seed=11)]
+    results: Dict[str, object] = {}
+    with TestClient(app) as client:
+        for size in sizes:
+            workspace = repository.create_workspace(f"bench-{size}", f"doc-{size}", {})
+            seed_s = seed_history(repository, workspace.id, size)
+
+            def related(i: int, include_content: bool = False):
+                payload = {
+                    "workspace_id": workspace.id,
+                    "text": queries[i % len(queries)],
+                    "limit": 5,
+                    "include_content": include_content,
+                }
+                return _expect(client.post("/sessions/related", json=payload), 200)
+
+            started = time.perf_counter()
+            related(0)
+            build_s = time.perf_counter() - started
+            vectors = memory_service._related.workspace(workspace.id)
+            results[str(size)] = {
+                "seed_s": round(seed_s, 2),
+                "build_s": round(build_s, 2),
+                "index_mb": round(vectors.matrix[: len(vectors.ids)].nbytes / 1e6, 1),
+                "related": measure(related, requests, warmup),
+                "related_content": measure(lambda i: related(i, True), requests, warmup),
+            }
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="쉼표로 구분한 히스토리 크기")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="결과 JSON을 저장할 파일")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            {
+                "SQLITE_PATH": str(Path(tmp) / "bench.db"),
+                "ARCHIVE_DIR": str(Path(tmp) / "archive"),
+                "RUN_DIR": str(Path(tmp) / "run"),
+                "COMPACTION_INTERVAL_SECONDS": "0",
+                "LOG_LEVEL": "WARNING",
+            }
+        )
+        results = {"config": {"requests": args.requests}, "sizes": run(sizes, args.requests, args.warmup)}
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
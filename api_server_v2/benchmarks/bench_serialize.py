@@ -0,0 +1,130 @@
+"""GET /sessions/latest 응답 직렬화 벤치마크: 모델 경로(이전 구현)와 JSON bytes 빠른 경로를 비교합니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_serialize --sizes 1000,100000,1000000 --requests 200
+
+핸드오프 본문 크기(bytes)별로 세션 하나를 저장하고 같은 요청을 세 가지 경로로 보냅니다.
+- model: `memory_service.latest_session` → `response_model` 검증/직렬화 (이전 /sessions/latest)
+- fast_uncached: /sessions/latest, 응답 캐시 비활성화 (행을 바로 JSON bytes로 인코딩)
+- fast: /sessions/latest, 응답 캐시 사용 (같은 리비전/메타면 인코딩한 bytes를 재사용)
+
+Drive 메타데이터는 공유 캐시(`SHARED_CACHE=sqlite`)에서 읽으므로 Google 호출 비용은 빠지고,
+응답 압축도 끕니다(`Accept-Encoding: identity`, 압축은 `benchmarks.bench_compression`).
+세 경로의 응답 본문이 바이트 단위로 같은지도 확인합니다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .bench_api import _expect, measure
+from .corpus import synthetic_handoffs
+from .google_stub import GoogleApiStub, stub_token_json
+
+
+def handoff_of_size(size: int, seed: int = 7) -> str:
+    """UTF-8로 약 `size` bytes인 핸드오프 본문 (합성 본문을 이어 붙임)."""
+    parts: List[str] = []
+    total = 0
+    for body in synthetic_handoffs(max(1, size // 200), duplicate_ratio=0.0, seed=seed):
+        parts.append(body)
+        total += len(body.encode("utf-8")) + 1
+        if total >= size:
+            break
+    return "\n".join(parts).encode("utf-8")[:size].decode("utf-8", errors="ignore")
+
+
+def run(sizes: List[int], requests: int, warmup: int, encoder: str) -> Dict[str, object]:
+    # 설정은 임포트 시점에 읽히므로 환경 변수를 먼저 지정한 뒤 앱을 불러옵니다.
+    from fastapi.testclient import TestClient
+
+    from app import responses
+    from app.db import repository
+    from app.main import app
+    from app.schemas import SessionResponse
+    from app.services.memory import memory_service
+
+    if encoder == "pydantic":
+        responses.orjson = None
+    elif responses.orjson is None:
+        raise SystemExit("orjson이 설치되어 있지 않습니다 (--encoder pydantic으로 대체 경로를 측정)")
+
+    @app.get("/bench/latest-model", response_model=Optional[SessionResponse])
+    def latest_model(workspace_id: str, scope: str):
+        return memory_service.latest_session(workspace_id, scope, None, None)
+
+    bodies = memory_service._bodies
+    maxsize = bodies.maxsize
+    results: Dict[str, object] = {}
+    with TestClient(app, headers={"Accept-Encoding": "identity"}) as client:
+        for size in sizes:
+            workspace = repository.create_workspace(f"bench-{size}", f"doc-{size}", {})
+            repository.save_google_token(workspace.id, stub_token_json())
+            repository.insert_session(workspace.id, "personal", None, "rev-1", handoff_of_size(size), ["GENERAL"])
+            query = {"workspace_id": workspace.id, "scope": "personal"}
+
+            payloads = {
+                path: _expect(client.get(path, params=query), 200).content
+                for path in ("/bench/latest-model", "/sessions/latest")
+            }
+            if len(set(payloads.values())) != 1:
+                raise RuntimeError(f"빠른 경로 응답이 모델 경로와 다릅니다 (size={size})")
+
+            bodies.maxsize = 0
+            bodies.clear()
+            model = measure(lambda i: _expect(client.get("/bench/latest-model", params=query), 200), requests, warmup)
+            uncached = measure(lambda i: _expect(client.get("/sessions/latest", params=query), 200), requests, warmup)
+            bodies.maxsize = maxsize
+            cached = measure(lambda i: _expect(client.get("/sessions/latest", params=query), 200), requests, warmup)
+
+            results[str(size)] = {
+                "response_bytes": len(payloads["/sessions/latest"]),
+                "model": model,
+                "fast_uncached": uncached,
+                "fast": cached,
+                "speedup_p50": round(model["p50_ms"] / cached["p50_ms"], 2),
+            }
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="쉼표로 구분한 핸드오프 본문 크기(bytes)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--encoder", choices=["orjson", "pydantic"], default="orjson", help="빠른 경로의 JSON 인코더")
+    parser.add_argument("--output", type=Path, help="결과 JSON을 저장할 파일")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp, GoogleApiStub(latency_ms=0) as stub:
+        os.environ.update(
+            {
+                "SQLITE_PATH": str(Path(tmp) / "bench.db"),
+                "SHARED_CACHE": "sqlite",
+                "SHARED_CACHE_PATH": str(Path(tmp) / "cache.db"),
+                "DOC_META_TTL_SECONDS": "3600",
+                "RUN_DIR": str(Path(tmp) / "run"),
+                "ARCHIVE_DIR": str(Path(tmp) / "archive"),
+                "GOOGLE_API_ENDPOINT": stub.endpoint,
+                "COMPACTION_INTERVAL_SECONDS": "0",
+                "LOG_LEVEL": "WARNING",
+            }
+        )
+        results = {
+            "config": {"requests": args.requests, "encoder": args.encoder},
+            "sizes": run(sizes, args.requests, args.warmup, args.encoder),
+        }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
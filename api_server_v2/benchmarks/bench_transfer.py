@@ -0,0 +1,139 @@
+"""NDJSON 내보내기/가져오기 벤치마크: 워크스페이스 크기별 처리량과 최대 메모리를 측정합니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_transfer --sizes 1000,10000,100000
+
+히스토리 크기별로 워크스페이스를 만들어 세션을 대량 적재한 뒤 다음을 JSON으로 출력합니다.
+- export: `transfer.export_lines`를 파일로 흘려 쓴 시간, 세션/초, MB/초, 출력 크기
+- export_gzip: 같은 스트림을 압축 미들웨어와 같은 방식(조각마다 flush)으로 gzip 했을 때
+- import: 내보낸 파일을 64KB 조각으로 `transfer.import_ndjson`에 넣어 새 워크스페이스에 저장한 시간과 처리량
+- peak_mb: tracemalloc으로 따로 한 번 더 실행해 잰 파이썬 힙 최대 증가량. 크기와 관계없이 거의 같아야 합니다.
+HTTP 계층(TestClient는 응답을 모아서 돌려줌) 없이 스트리밍 함수를 직접 호출합니다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .bench_api import seed_history
+
+READ_CHUNK = 64 * 1024
+
+
+def _peak_mb(func: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes: List[int], work_dir: Path) -> Dict[str, object]:
+    # 설정은 임포트 시점에 읽히므로 환경 변수를 먼저 지정한 뒤 앱을 불러옵니다.
+    from app import transfer
+    from app.compression import _StreamCompressor
+    from app.db import init_db, repository
+
+    init_db()
+
+    def export(workspace, path: Path, gzip: bool = False) -> int:
+        compressor = _StreamCompressor("gzip") if gzip else None
+        written = 0
+        with path.open("wb") as out:
+            for chunk in transfer.export_lines(repository, workspace):
+                data = compressor.chunk(chunk) if compressor else chunk
+                out.write(data)
+                written += len(data)
+            if compressor:
+                tail = compressor.finish()
+                out.write(tail)
+                written += len(tail)
+        return written
+
+    async def chunks(path: Path):
+        with path.open("rb") as source:
+            while chunk := source.read(READ_CHUNK):
+                yield chunk
+
+    def load(path: Path, workspace_id: str):
+        return asyncio.run(transfer.import_ndjson(repository, workspace_id, chunks(path), 16 * 1024 * 1024))
+
+    results: Dict[str, object] = {}
+    for size in sizes:
+        workspace = repository.create_workspace(f"bench-{size}", f"doc-{size}", {})
+        seed_s = seed_history(repository, workspace.id, size)
+        path = work_dir / f"export-{size}.ndjson"
+
+        started = time.perf_counter()
+        raw_bytes = export(workspace, path)
+        export_s = time.perf_counter() - started
+        started = time.perf_counter()
+        gzip_bytes = export(workspace, work_dir / f"export-{size}.ndjson.gz", gzip=True)
+        gzip_s = time.perf_counter() - started
+
+        target = repository.create_workspace(f"import-{size}", f"doc-{size}-copy", {})
+        started = time.perf_counter()
+        imported = load(path, target.id)
+        import_s = time.perf_counter() - started
+
+        spare = repository.create_workspace(f"import-{size}-peak", f"doc-{size}-peak", {})
+        results[str(size)] = {
+            "seed_s": round(seed_s, 2),
+            "export": {
+                "seconds": round(export_s, 2),
+                "sessions_per_s": round(size / export_s),
+                "mb_per_s": round(raw_bytes / 1e6 / export_s, 1),
+                "mb": round(raw_bytes / 1e6, 1),
+                "peak_mb": _peak_mb(lambda: export(workspace, work_dir / "peak.ndjson")),
+            },
+            "export_gzip": {
+                "seconds": round(gzip_s, 2),
+                "sessions_per_s": round(size / gzip_s),
+                "mb": round(gzip_bytes / 1e6, 1),
+                "ratio": round(raw_bytes / gzip_bytes, 1),
+            },
+            "import": {
+                "seconds": round(import_s, 2),
+                "sessions_per_s": round(imported.imported / import_s),
+                "mb_per_s": round(raw_bytes / 1e6 / import_s, 1),
+                "imported": imported.imported,
+                "peak_mb": _peak_mb(lambda: load(path, spare.id)),
+            },
+        }
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="쉼표로 구분한 히스토리 크기")
+    parser.add_argument("--output", type=Path, help="결과 JSON을 저장할 파일")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            {
+                "SQLITE_PATH": str(Path(tmp) / "bench.db"),
+                "ARCHIVE_DIR": str(Path(tmp) / "archive"),
+                "RUN_DIR": str(Path(tmp) / "run"),
+                "LOG_LEVEL": "WARNING",
+            }
+        )
+        results = {"sizes": run(sizes, Path(tmp))}
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
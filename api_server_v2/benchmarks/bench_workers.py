@@ -0,0 +1,176 @@
+"""멀티 워커 처리량 벤치마크: `python -m app.serve --workers N`을 워커 수별로 띄워 같은 부하를 줍니다.
+
+    cd api_server_v2
+    python -m benchmarks.bench_workers --workers 1,2,4 --clients 16 --duration 10
+
+모든 워커가 같은 SQLite 파일과 공유 캐시(`SHARED_CACHE=sqlite`)를 쓰고, Google API는
+`benchmarks/google_stub.py`로 대신합니다. 부하는 별도 프로세스들(`--clients`)이 keep-alive
+연결로 `GET /sessions/latest`를 반복 호출하며, 워커 수별 처리량(req/s), p50/p99(ms)와
+1 워커 대비 배율(scaling)을 JSON으로 출력합니다. 코어 수(`cpu_count`)보다 워커를 늘려도
+처리량은 늘지 않으며, 부하 생성 프로세스도 같은 코어를 나눠 씁니다.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlencode
+
+from .bench_api import percentile, seed_history
+from .google_stub import GoogleApiStub, stub_token_json
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"서버가 {timeout}초 안에 시작되지 않았습니다 (port {port})")
+
+
+def client_loop(port: int, path: str, duration: float) -> Dict[str, object]:
+    """연결 하나로 `duration`초 동안 요청을 보내고 지연 시간 목록을 반환합니다 (부하 생성 프로세스)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    samples: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        samples.append(time.perf_counter() - t0)
+    conn.close()
+    return {"samples": samples, "errors": errors}
+
+
+def run_workers(workers: int, env: Dict[str, str], path: str, clients: int, duration: float, warmup: float) -> Dict[str, object]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "app.serve",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=APP_ROOT,
+        env=env,
+    )
+    try:
+        _wait_ready(port)
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            list(pool.map(client_loop, [port] * clients, [path] * clients, [warmup] * clients))
+            started = time.perf_counter()
+            results = list(pool.map(client_loop, [port] * clients, [path] * clients, [duration] * clients))
+            elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    samples = [sample for result in results for sample in result["samples"]]
+    return {
+        "requests": len(samples),
+        "errors": sum(result["errors"] for result in results),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3) if samples else None,
+        "p99_ms": round(percentile(samples, 99) * 1000, 3) if samples else None,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 워커 수")
+    parser.add_argument("--clients", type=int, default=16, help="부하 생성 프로세스(동시 연결) 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="워커 수별 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--sessions", type=int, default=1000, help="워크스페이스에 미리 채울 세션 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="스텁의 요청당 지연 시간")
+    parser.add_argument("--shared-cache", choices=["none", "sqlite"], default="sqlite")
+    parser.add_argument("--output", type=Path, help="결과 JSON을 저장할 파일")
+    args = parser.parse_args(argv)
+    worker_counts = [int(count) for count in args.workers.split(",") if count.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp, GoogleApiStub(latency_ms=args.latency_ms) as stub:
+        env = {
+            **os.environ,
+            "SQLITE_PATH": str(Path(tmp) / "bench.db"),
+            "SHARED_CACHE": args.shared_cache,
+            "SHARED_CACHE_PATH": str(Path(tmp) / "cache.db"),
+            "RUN_DIR": str(Path(tmp) / "run"),
+            "ARCHIVE_DIR": str(Path(tmp) / "archive"),
+            "GOOGLE_API_ENDPOINT": stub.endpoint,
+            "COMPACTION_INTERVAL_SECONDS": "0",
+            "LOG_LEVEL": "WARNING",
+        }
+        # 설정은 임포트 시점에 읽히므로 환경 변수를 먼저 지정한 뒤 앱을 불러옵니다.
+        os.environ.update(env)
+        from app.db import init_db, repository
+
+        init_db()
+        workspace = repository.create_workspace("bench-workers", "doc-workers", {})
+        repository.save_google_token(workspace.id, stub_token_json())
+        seed_history(repository, workspace.id, args.sessions)
+        repository.backend.close()
+        path = "/sessions/latest?" + urlencode({"workspace_id": workspace.id, "scope": "personal"})
+
+        runs: Dict[str, object] = {}
+        for workers in worker_counts:
+            stub_before = stub.requests
+            runs[str(workers)] = run_workers(workers, env, path, args.clients, args.duration, args.warmup)
+            runs[str(workers)]["google_calls"] = stub.requests - stub_before
+
+    baseline = runs[str(worker_counts[0])]["throughput_rps"] or 1
+    for result in runs.values():
+        result["scaling"] = round(result["throughput_rps"] / baseline, 2)
+
+    output = json.dumps(
+        {
+            "config": {
+                "cpu_count": os.cpu_count(),
+                "clients": args.clients,
+                "duration_s": args.duration,
+                "sessions": args.sessions,
+                "latency_ms": args.latency_ms,
+                "shared_cache": args.shared_cache,
+            },
+            "workers": runs,
+        },
+        indent=2,
+    )
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""합성 핸드오프 코퍼스 생성 및 DB 시딩 도구.
+
+    cd api_server_v2
+    python -m benchmarks.corpus --db /tmp/seed.db --workspaces 100 --sessions 1000000 --fixtures fixtures.json
+
+`prompts/`, `examples/handoff_*.md` 템플릿 모양의 [HANDOFF] 블록을 만들어
+`MemoryRepository.bulk_insert_sessions`로 적재하고, 같은 워크스페이스의 문서를
+`benchmarks/google_stub.py`용 픽스처(JSON)로 내보낼 수 있습니다.
+
+모듈 최상단에서는 앱을 임포트하지 않으므로 환경 변수를 지정하기 전에 불러와도 안전합니다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SECTIONS = ["TL;DR", "Startup Decisions", "Personal Learnings", "Next Actions", "Open Questions", "Keywords", "Memory Updates"]
+SENTENCES = [
+    "IRIS MVP 명령 5개 최종 스펙과 테스트 시나리오를 작성한다.",
+    "RPA 3FLOW 설계서 초안(입력/출력/트리거/예외)을 정리했다.",
+    "Fixed the revision conflict bug in push_memory retry flow.",
+    "회의에서 팀 문서 매핑(TEAM_MAP)을 alpha/beta로 나누기로 결정.",
+    "Benchmark p99 latency for /sessions/latest before the deploy.",
+    "AICE 학습 블록 캘린더링(주5×90분) & 모의 2회 예약.",
+    "Open question: should category filters be case-insensitive?",
+    "#ESS #SMR #IRIS #RPA #AICE #MVP #핸드오프",
+]
+
+
+def synthetic_handoffs(count: int, duplicate_ratio: float, seed: int = 7) -> list[str]:
+    """템플릿은 같고 내용이 조금씩 다른 핸드오프 본문을 만듭니다 (일부는 완전히 동일)."""
+    rng = random.Random(seed)
+    bodies: list[str] = []
+    for i in range(count):
+        if bodies and rng.random() < duplicate_ratio:
+            bodies.append(rng.choice(bodies))
+            continue
+        lines = ["[HANDOFF]", f"[AUTO_CATEGORY] {rng.choice(['GENERAL', 'MEETING', 'BUG'])}"]
+        for section in SECTIONS:
+            picked = rng.sample(SENTENCES, k=rng.randint(1, 3))
+            lines.append(f"[{section}] " + "\n".join(picked))
+        lines.append(f"타임스탬프: 2025-09-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d} KST")
+        bodies.append("\n".join(lines))
+    return bodies
+
+
+# examples/handoff_*.md 형식의 섹션과 카테고리별 문장. MemoryService._derive_categories와
+# 같은 결과가 나오도록 MEETING은 "회의", BUG는 "bug"를 포함하고 GENERAL은 둘 다 피합니다.
+HANDOFF_SECTIONS = ["Startup Decisions", "Personal Learnings", "Next Actions", "Open Questions", "Keywords", "Memory Updates"]
+CATEGORY_SENTENCES = {
+    "GENERAL": [
+        "문서 베이스라인 v1.2a 확정(섹션6 불변, 월간 롤업 운영).",
+        "IRIS MVP=명령5+로그연동, RPA 3FLOW 범위 고정.",
+        "AICE 학습 블록 캘린더링(주5×90분) & 모의 2회 예약 (상, 나)",
+        "표준화된 단축키·템플릿이 실행 속도와 일관성의 핵심이다.",
+        "자동화 설계는 입력/출력/트리거/예외 4요소가 누락되면 실패한다 [추정].",
+        "Benchmark p99 latency for /sessions/latest before the deploy.",
+    ],
+    "MEETING": [
+        "주간 회의에서 팀 문서 매핑(TEAM_MAP)을 alpha/beta로 나누기로 결정.",
+        "회의 액션 아이템: RPA 각 FLOW의 데이터 소스·권한 분리 정리 (담당=나).",
+        "Weekly meeting: agreed to freeze the IRIS command list.",
+    ],
+    "BUG": [
+        "Fixed the revision conflict bug in push_memory retry flow.",
+        "bug: 카테고리 필터가 대소문자를 구분함 → upper() 비교로 수정.",
+        "Open bug: Apps Script cache returns a stale block after revision bump.",
+    ],
+}
+KEYWORDS = "#ESS #SMR #IRIS #RPA #AICE #MVP #핸드오프"
+CATEGORY_WEIGHTS = [("GENERAL", 6), ("MEETING", 2), ("BUG", 2)]
+TEAM_KEYS = ["alpha", "beta"]
+
+SessionSeed = Tuple[str, str, Optional[str], str, str, List[str], Optional[str]]
+
+
+def handoff_block(rng: random.Random, category: str, when: datetime) -> str:
+    """examples/handoff_*.md 모양의 핸드오프 블록 하나."""
+    general = CATEGORY_SENTENCES["GENERAL"]
+    lines = [f"# HANDOFF Snapshot ({when:%Y-%m-%d_%H%M%S})", ""]
+    for section in HANDOFF_SECTIONS:
+        lines.append(f"## {section}")
+        if section == "Keywords":
+            lines.append(KEYWORDS)
+        else:
+            pool = general + CATEGORY_SENTENCES[category] * 2 if category != "GENERAL" else general
+            lines.extend(rng.sample(pool, k=min(len(pool), rng.randint(1, 3))))
+        lines.append("")
+    lines.append(f"타임스탬프: {when:%Y-%m-%d %H:%M} KST")
+    return "\n".join(lines)
+
+
+def body_pool(size: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """(본문, 카테고리) 목록. 세션은 이 풀에서 본문을 골라 씁니다 (동일 본문은 blob 하나로 저장)."""
+    rng = random.Random(seed)
+    names = [name for name, weight in CATEGORY_WEIGHTS for _ in range(weight)]
+    start = datetime(2025, 1, 1)
+    pool = []
+    for i in range(size):
+        category = rng.choice(names)
+        pool.append((handoff_block(rng, category, start + timedelta(minutes=37 * i)), category))
+    return pool
+
+
+def workspace_names(count: int) -> List[str]:
+    return [f"corpus-{i:05d}" for i in range(count)]
+
+
+def generate_sessions(
+    workspace_ids: List[str],
+    count: int,
+    pool: List[Tuple[str, str]],
+    team_ratio: float = 0.3,
+    seed: int = 7,
+) -> Iterator[SessionSeed]:
+    """워크스페이스를 번갈아 가며 시간순으로 세션 `count`개를 만듭니다."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        body, category = pool[rng.randrange(len(pool))]
+        if rng.random() < team_ratio:
+            scope, team_key = "team", rng.choice(TEAM_KEYS)
+        else:
+            scope, team_key = "personal", None
+        last_updated = (start + timedelta(seconds=i)).isoformat()
+        yield (workspace_ids[i % len(workspace_ids)], scope, team_key, f"seed-{i}", body, [category], last_updated)
+
+
+def doc_fixtures(workspaces, pool: List[Tuple[str, str]], blocks_per_doc: int = 20, seed: int = 7) -> Dict[str, object]:
+    """google_stub용 문서 픽스처: 워크스페이스의 개인/팀 문서마다 핸드오프 블록을 이어 붙인 본문."""
+    rng = random.Random(seed)
+    documents: Dict[str, Dict[str, str]] = {}
+    for workspace in workspaces:
+        doc_ids = [(workspace.doc_personal_id, workspace.name)]
+        doc_ids += [(doc_id, f"{workspace.name} ({team})") for team, doc_id in workspace.team_map.items()]
+        for doc_id, name in doc_ids:
+            blocks = [pool[rng.randrange(len(pool))][0] for _ in range(blocks_per_doc)]
+            documents[doc_id] = {"name": f"Handoff {name}", "text": "\n\n".join(blocks)}
+    return {"documents": documents}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, help="SQLite 경로 (생략 시 SQLITE_PATH/STORAGE_BACKEND 설정 사용)")
+    parser.add_argument("--workspaces", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--unique-bodies", type=int, default=20_000, help="서로 다른 본문 수")
+    parser.add_argument("--team-ratio", type=float, default=0.3)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--fixtures", type=Path, help="google_stub 픽스처 JSON 출력 경로")
+    parser.add_argument("--fixture-blocks", type=int, default=20, help="문서당 핸드오프 블록 수")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        os.environ["SQLITE_PATH"] = str(args.db)
+    from app.db import repository
+
+    repository.init_db()
+    started = time.perf_counter()
+    pool = body_pool(min(args.unique_bodies, args.sessions) or 1, args.seed)
+    workspaces = [
+        repository.create_workspace(name, f"doc-{name}", {team: f"doc-{name}-{team}" for team in TEAM_KEYS})
+        for name in workspace_names(args.workspaces)
+    ]
+    prepared = time.perf_counter()
+    inserted = repository.bulk_insert_sessions(
+        generate_sessions([ws.id for ws in workspaces], args.sessions, pool, args.team_ratio, args.seed),
+        chunk_size=args.chunk_size,
+    )
+    elapsed = time.perf_counter() - prepared
+
+    if args.fixtures:
+        args.fixtures.write_text(
+            json.dumps(doc_fixtures(workspaces, pool, args.fixture_blocks, args.seed), ensure_ascii=False),
+            encoding="utf-8",
+        )
+    summary = {
+        "workspaces": len(workspaces),
+        "sessions": inserted,
+        "unique_bodies": len(pool),
+        "prepare_s": round(prepared - started, 2),
+        "insert_s": round(elapsed, 2),
+        "rows_per_s": round(inserted / elapsed, 1) if elapsed else None,
+        "backend": repository.backend.name,
+    }
+    if args.db:
+        summary["db_bytes"] = args.db.stat().st_size
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""로컬 Google Docs/Drive API 스텁 (벤치마크/오프라인 테스트용).
+
+실제 API와 같은 경로만 흉내 냅니다.
+- GET  /v1/documents/{id}               (Docs documents.get)
+- POST /v1/documents/{id}:batchUpdate   (Docs documents.batchUpdate, insertText만 반영)
+- GET  /drive/v3/files/{id}             (Drive files.get)
+- GET  /drive/v3/changes/startPageToken  (Drive changes.getStartPageToken)
+- GET  /drive/v3/changes?pageToken=N     (Drive changes.list, page token = 변경 기록의 위치)
+
+서버를 띄운 뒤 `GOOGLE_API_ENDPOINT=http://127.0.0.1:<port>`로 앱을 실행하면
+GoogleDocsAdapter가 이 스텁으로 요청을 보냅니다. `--fixtures`로 `benchmarks.corpus`가
+만든 문서 픽스처를 미리 불러올 수 있습니다.
+
+    python -m benchmarks.google_stub --port 8765 --latency-ms 30 --doc-bytes 50000 --fixtures fixtures.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+PARAGRAPH_CHARS = 1000  # 문서 본문을 이 크기의 문단으로 나눠 응답합니다.
+
+_DOC_PATH = re.compile(r"^/v1/documents/([^/:?]+)(:batchUpdate)?$")
+_FILE_PATH = re.compile(r"^/drive/v3/files/([^/?]+)$")
+_CHANGES_PATH = "/drive/v3/changes"
+_START_TOKEN_PATH = "/drive/v3/changes/startPageToken"
+
+
+class FakeDocument:
+    def __init__(self, doc_id: str, text: str, name: Optional[str] = None):
+        self.doc_id = doc_id
+        self.name = name or f"Handoff {doc_id}"
+        self.text = text
+        self.modified = datetime.now(timezone.utc)
+        self.lock = threading.Lock()
+
+    def append(self, text: str) -> None:
+        with self.lock:
+            self.text += text
+            self.modified = datetime.now(timezone.utc)
+
+    def replace(self, text: str) -> None:
+        with self.lock:
+            self.text = text
+            self.modified = datetime.now(timezone.utc)
+
+    def to_resource(self) -> dict:
+        # Docs API 인덱스는 1부터 시작하고 마지막 문단의 endIndex가 문서 끝입니다.
+        with self.lock:
+            text = self.text + "\n"
+        content = [{"endIndex": 1, "sectionBreak": {}}]
+        index = 1
+        for start in range(0, len(text), PARAGRAPH_CHARS):
+            chunk = text[start : start + PARAGRAPH_CHARS]
+            content.append(
+                {
+                    "startIndex": index,
+                    "endIndex": index + len(chunk),
+                    "paragraph": {"elements": [{"startIndex": index, "endIndex": index + len(chunk), "textRun": {"content": chunk}}]},
+                }
+            )
+            index += len(chunk)
+        return {"documentId": self.doc_id, "title": self.name, "body": {"content": content}}
+
+    def to_file(self) -> dict:
+        return {
+            "name": self.name,
+            "modifiedTime": self.modified.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "webViewLink": f"https://docs.google.com/document/d/{self.doc_id}/edit",
+        }
+
+
+class GoogleApiStub:
+    """ThreadingHTTPServer 기반 스텁. 처음 보는 doc_id는 `doc_bytes` 크기의 문서로 자동 생성합니다."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        doc_bytes: int = 20_000,
+        fixtures: Optional[Path] = None,
+    ):
+        self.latency = latency_ms / 1000
+        self.doc_bytes = doc_bytes
+        self.documents: Dict[str, FakeDocument] = {}
+        if fixtures:
+            self.load_fixtures(fixtures)
+        self.requests = 0
+        self.changes: List[str] = []  # 수정된 doc_id 기록. Drive page token은 이 목록의 위치입니다.
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def load_fixtures(self, path: Path) -> int:
+        """`{"documents": {doc_id: {"name", "text"}}}` 형식의 픽스처를 불러오고 문서 수를 반환합니다."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        for doc_id, doc in data.get("documents", {}).items():
+            self.documents[doc_id] = FakeDocument(doc_id, doc.get("text", ""), doc.get("name"))
+        return len(data.get("documents", {}))
+
+    def document(self, doc_id: str) -> FakeDocument:
+        with self._lock:
+            if doc_id not in self.documents:
+                filler = "[HANDOFF] 이전 기록\n" * (self.doc_bytes // 24 + 1)
+                self.documents[doc_id] = FakeDocument(doc_id, filler[: self.doc_bytes])
+            return self.documents[doc_id]
+
+    def record_change(self, doc_id: str) -> None:
+        with self._lock:
+            self.changes.append(doc_id)
+
+    def edit(self, doc_id: str, text: str) -> None:
+        """사용자가 Google Docs에서 직접 고친 것처럼 문서 본문을 바꾸고 변경 기록에 남깁니다."""
+        self.document(doc_id).replace(text)
+        self.record_change(doc_id)
+
+    def list_changes(self, page_token: str, page_size: int) -> dict:
+        start = int(page_token)
+        with self._lock:
+            doc_ids = self.changes[start : start + page_size]
+            end = start + len(doc_ids)
+            more = end < len(self.changes)
+        page = {
+            "changes": [{"kind": "drive#change", "fileId": doc_id, "removed": False} for doc_id in doc_ids],
+        }
+        page["nextPageToken" if more else "newStartPageToken"] = str(end)
+        return page
+
+    def start(self) -> "GoogleApiStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="google-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "GoogleApiStub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+                pass
+
+            def _reply(self, status: int, body: dict) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_json(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    return json.loads(raw or b"{}")
+                except ValueError:
+                    return {}
+
+            def _delay(self) -> None:
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+            def do_GET(self):
+                self._delay()
+                path, _, query = self.path.partition("?")
+                if path == _START_TOKEN_PATH:
+                    self._reply(200, {"startPageToken": str(len(stub.changes))})
+                elif path == _CHANGES_PATH:
+                    params = parse_qs(query)
+                    page_token = params.get("pageToken", ["0"])[0]
+                    self._reply(200, stub.list_changes(page_token, int(params.get("pageSize", ["100"])[0])))
+                elif match := _DOC_PATH.match(path):
+                    self._reply(200, stub.document(match.group(1)).to_resource())
+                elif match := _FILE_PATH.match(path):
+                    self._reply(200, stub.document(match.group(1)).to_file())
+                else:
+                    self._reply(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+            def do_POST(self):
+                self._delay()
+                path = self.path.split("?", 1)[0]
+                body = self._read_json()
+                match = _DOC_PATH.match(path)
+                if match and match.group(2):
+                    document = stub.document(match.group(1))
+                    for request in body.get("requests", []):
+                        insert = request.get("insertText")
+                        if insert:
+                            document.append(insert.get("text", ""))
+                    stub.record_change(document.doc_id)
+                    self._reply(200, {"documentId": document.doc_id, "replies": [{} for _ in body.get("requests", [])]})
+                else:
+                    self._reply(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+        return Handler
+
+
+def stub_token_json() -> str:
+    """만료되지 않는 OAuth 토큰 JSON (google_tokens 테이블에 그대로 저장).
+
+    google-auth는 token_uri를 항상 실제 주소로 덮어쓰므로 갱신이 일어나지 않도록 만료 시각을 먼 미래로 둡니다.
+    """
+    return json.dumps(
+        {
+            "token": "stub-access-token",
+            "refresh_token": "stub-refresh-token",
+            "client_id": "stub-client",
+            "client_secret": "stub-secret",
+            "expiry": "2999-01-01T00:00:00Z",
+        }
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--doc-bytes", type=int, default=20_000)
+    parser.add_argument("--fixtures", type=Path, help="benchmarks.corpus --fixtures 출력")
+    args = parser.parse_args(argv)
+
+    stub = GoogleApiStub(args.host, args.port, args.latency_ms, args.doc_bytes, args.fixtures)
+    print(f"Google API stub: {stub.endpoint}", flush=True)
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
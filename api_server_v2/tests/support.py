@@ -0,0 +1,31 @@
+"""서비스 테스트 공통 준비: 임시 SQLite 저장소를 `memory.repository`로 끼운 MemoryService와 워크스페이스 하나."""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from api_server_v2.app.db import MemoryRepository
+from api_server_v2.app.services import memory
+from api_server_v2.app.storage import SQLiteBackend
+
+
+class ServiceTestCase(unittest.TestCase):
+    doc_personal_id = "doc-1"
+    team_map: dict = {}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.backend = SQLiteBackend(Path(tmp.name) / "memory.db")
+        self.addCleanup(self.backend.close)
+        self.repo = MemoryRepository(self.backend)
+        self.repo.init_db()
+        self.patch(memory, "repository", self.repo)
+        self.service = memory.MemoryService()
+        self.workspace = self.repo.create_workspace("demo", self.doc_personal_id, dict(self.team_map))
+
+    def patch(self, target, attribute, value):
+        """테스트가 끝나면 되돌리는 `mock.patch.object`."""
+        patcher = mock.patch.object(target, attribute, value)
+        patcher.start()
+        self.addCleanup(patcher.stop)
@@ -0,0 +1,124 @@
+import gzip
+import json
+import unittest
+import zlib
+
+try:
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+
+    from api_server_v2.app import compression
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+HANDOFF = "[HANDOFF]\n## 진행 상황\n- 배포 스크립트 정리 (deploy script cleanup)\n" * 200
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(compression.CompressionMiddleware, minimum_size=1024, max_request_bytes=64 * 1024)
+
+    @app.get("/big")
+    def big():
+        return {"content": HANDOFF}
+
+    @app.get("/small")
+    def small():
+        return {"content": "ok"}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((json.dumps({"n": i, "content": HANDOFF}) + "\n" for i in range(3)), media_type="application/x-ndjson")
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        payload = await request.json()
+        return {"length": len(payload["content"]), "content_length": request.headers["content-length"]}
+
+    return app
+
+
+class CompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(make_app())
+
+    def test_negotiation_follows_q_values(self):
+        self.assertEqual(compression.negotiate("gzip"), "gzip")
+        self.assertIsNone(compression.negotiate("identity"))
+        self.assertIsNone(compression.negotiate("gzip;q=0, br;q=0"))
+        self.assertEqual(compression.negotiate("gzip;q=1.0, br;q=0.5"), "gzip")
+        if compression.brotli is not None:
+            self.assertEqual(compression.negotiate("gzip, br"), "br")
+            self.assertEqual(compression.negotiate("*"), "br")
+
+    def test_large_responses_are_compressed_above_threshold(self):
+        response = self.client.get("/big", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertLess(int(response.headers["content-length"]), len(HANDOFF) // 10)
+        self.assertEqual(response.json()["content"], HANDOFF)
+        # 같은 GET 응답은 압축 결과를 재사용해도 같은 본문입니다.
+        self.assertEqual(self.client.get("/big", headers={"Accept-Encoding": "gzip"}).json()["content"], HANDOFF)
+
+        self.assertNotIn("content-encoding", self.client.get("/small", headers={"Accept-Encoding": "gzip"}).headers)
+        self.assertNotIn("content-encoding", self.client.get("/big", headers={"Accept-Encoding": "identity"}).headers)
+
+    @unittest.skipIf(compression.brotli is None, "brotli가 설치되어 있지 않음")
+    def test_brotli_is_preferred_when_available(self):
+        response = self.client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(response.headers["content-encoding"], "br")
+        self.assertEqual(response.json()["content"], HANDOFF)
+
+    def test_streaming_responses_are_compressed_per_chunk(self):
+        with self.client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            self.assertEqual(response.headers["content-encoding"], "gzip")
+            self.assertNotIn("content-length", response.headers)
+            lines = [json.loads(line) for line in response.iter_lines() if line]
+        self.assertEqual([line["n"] for line in lines], [0, 1, 2])
+
+    def test_compressed_request_bodies_are_decoded(self):
+        raw = json.dumps({"content": HANDOFF}).encode("utf-8")
+        for coding, body in [("gzip", gzip.compress(raw)), ("deflate", zlib.compress(raw))]:
+            with self.subTest(coding=coding):
+                response = self.client.post(
+                    "/echo", content=body, headers={"Content-Encoding": coding, "Content-Type": "application/json"}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), {"length": len(HANDOFF), "content_length": str(len(raw))})
+
+    def test_rejects_bad_or_oversized_request_bodies(self):
+        bomb = gzip.compress(b"{" + b" " * (128 * 1024) + b"}")  # 풀면 상한(64KB) 초과
+        cases = [
+            ("gzip", bomb, 413),
+            ("gzip", b"not gzip", 400),
+            ("gzip", gzip.compress(b'{"content": "x"}')[:-8], 400),  # 잘린 스트림
+            ("zstd", b"whatever", 415),
+        ]
+        for coding, body, status in cases:
+            with self.subTest(coding=coding, status=status):
+                response = self.client.post("/echo", content=body, headers={"Content-Encoding": coding})
+                self.assertEqual(response.status_code, status)
+
+    @unittest.skipIf(not compression.BROTLI_STREAMING, "brotli >= 1.2가 설치되어 있지 않음")
+    def test_streamed_brotli_body_is_inflated_in_bounded_pieces(self):
+        raw = b'{"content": "' + b"x" * (8 * 1024 * 1024) + b'"}\n'
+        body = compression.brotli.compress(raw)
+        self.assertLess(len(body), 64 * 1024)
+        for coding, data in [("br", body), ("gzip", gzip.compress(raw))]:
+            with self.subTest(coding=coding):
+                decompressor = compression._StreamDecompressor(coding, 64 * 1024)
+                decompressor.feed(data)
+                pieces = []
+                while True:
+                    piece = decompressor.read()
+                    if not piece:
+                        break
+                    pieces.append(len(piece))
+                self.assertTrue(decompressor.finished)
+                self.assertEqual(sum(pieces), len(raw))
+                self.assertLess(max(pieces), 2 * 64 * 1024)  # brotli 상한은 출력 버퍼 단위
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    from api_server_v2.app import context
+    from api_server_v2.tests.support import ServiceTestCase
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+EXAMPLE = Path(__file__).resolve().parents[2] / "examples" / "handoff_2025-11-14_232435.md"
+
+
+def session(revision: str, content: str) -> context.SessionText:
+    return context.SessionText(revision, "2025-09-14T18:33:00", content)
+
+
+class BuildBundleTests(unittest.TestCase):
+    def test_split_sections_understands_both_handoff_formats(self):
+        tagged = context.split_sections("[HANDOFF]\n[TL;DR] 배포 정리\n[Next Actions] 롤백 점검\n- 스테이징")
+        self.assertEqual(
+            [(s.title, s.body) for s in tagged],
+            [("", "[HANDOFF]"), ("TL;DR", "배포 정리"), ("Next Actions", "롤백 점검\n- 스테이징")],
+        )
+        titles = [s.title for s in context.split_sections(EXAMPLE.read_text(encoding="utf-8"))]
+        self.assertEqual(titles[1:4], ["Startup Decisions", "Personal Learnings", "Next Actions"])
+
+    def test_bundle_fits_budget_and_skips_repeated_sections(self):
+        latest = EXAMPLE.read_text(encoding="utf-8")
+        older = latest.replace("IRIS 명령 5개", "IRIS 명령 7개")
+        for budget in (64, 200, 600, 2000):
+            with self.subTest(budget=budget):
+                content, parts, truncated = context.build_bundle([session("new", latest), session("old", older)], budget)
+                self.assertLessEqual(context.estimate_tokens(content), budget)
+                self.assertTrue(parts and parts[0].revision_id == "new")
+
+        content, parts, truncated = context.build_bundle([session("new", latest), session("old", older)], 2000)
+        self.assertFalse(truncated)
+        self.assertEqual([(p.revision_id, p.section) for p in parts], [("new", "ALL"), ("old", "Next Actions")])
+        self.assertIn("IRIS 명령 7개", content)
+
+
+class ContextBundleServiceTests(ServiceTestCase):
+    def test_bundles_are_cached_until_the_revision_changes(self):
+        self.assertIsNone(self.service.context_bundle(self.workspace.id, 500, None, None, None))
+        self.repo.insert_session(self.workspace.id, "personal", None, "rev-1", "[TL;DR] 첫 번째", ["GENERAL"])
+        first = self.service.context_bundle(self.workspace.id, 500, None, None, None)
+        with mock.patch.object(self.repo, "recent_sessions") as recent:
+            self.assertIs(self.service.context_bundle(self.workspace.id, 500, None, None, None), first)
+            recent.assert_not_called()
+
+        self.repo.insert_session(self.workspace.id, "team", "alpha", "rev-2", "[TL;DR] 두 번째", ["MEETING"])
+        self.assertEqual(json.loads(self.service.context_bundle(self.workspace.id, 500, None, None, None))["revision_id"], "rev-2")
+        filtered = json.loads(self.service.context_bundle(self.workspace.id, 500, "personal", None, "general"))
+        self.assertEqual(filtered["revision_id"], "rev-1")
+        self.assertEqual(self.service.cache_stats()["context_bundle"]["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
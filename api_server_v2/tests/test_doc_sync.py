@@ -0,0 +1,95 @@
+import json
+import unittest
+
+try:
+    import googleapiclient  # noqa: F401
+
+    from api_server_v2.app import doc_blocks
+    from api_server_v2.app.config import settings
+    from api_server_v2.app.schemas import SessionCreateRequest
+    from api_server_v2.app.services.doc_sync import DocSyncService
+    from api_server_v2.benchmarks.google_stub import GoogleApiStub, stub_token_json
+    from api_server_v2.tests.support import ServiceTestCase
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+DOC = "[HANDOFF] 2025-09-01 KST\n[TL;DR] 배포 정리\n---\n[HANDOFF] 2025-09-02 KST\n[TL;DR] 회의 메모\n"
+
+
+class SplitBlocksTests(unittest.TestCase):
+    def test_matches_apps_script_separator(self):
+        self.assertEqual(
+            doc_blocks.split_blocks("\n첫 블록  \r\n---\n\n---\n둘째\x0b줄\n"),
+            ["첫 블록", "둘째\n줄"],
+        )
+        self.assertEqual(doc_blocks.block_hash(" 첫 블록\n"), doc_blocks.block_hash("첫 블록"))
+
+
+class DocSyncTests(ServiceTestCase):
+    doc_personal_id = "doc-personal"
+    team_map = {"alpha": "doc-alpha"}
+
+    def setUp(self):
+        super().setUp()
+        self.stub = GoogleApiStub().start()
+        self.addCleanup(self.stub.stop)
+        self.patch(settings, "google_api_endpoint", self.stub.endpoint)
+        self.patch(settings, "idempotency_ttl_seconds", 0)
+        self.sync = DocSyncService(self.repo, self.service)
+        self.repo.save_google_token(self.workspace.id, stub_token_json())
+        self.stub.edit("doc-personal", DOC)
+        self.stub.edit("doc-alpha", "")
+
+    def latest(self, scope="personal", team_key=None):
+        return self.repo.recent_sessions(self.workspace.id, 1, scope, team_key)[0]
+
+    def test_imports_only_new_blocks_after_baseline(self):
+        self.assertEqual(self.sync.run_once(), {"imported_sessions": 0, "failed_workspaces": 0})
+        self.assertIsNone(self.repo.get_latest_session(self.workspace.id))
+
+        edited = DOC.replace("회의 메모", "회의 메모 (수정)") + "---\n[HANDOFF] 손으로 추가\n"
+        self.stub.edit("doc-personal", edited)
+        self.stub.edit("doc-alpha", "[TL;DR] 팀 알파 bug 정리\n")
+        with self.assertLogs("api_server_v2.app.services.doc_sync", "INFO"):
+            self.assertEqual(self.sync.run_once()["imported_sessions"], 3)
+        self.assertEqual(self.repo.session_content(self.latest()), "[HANDOFF] 손으로 추가")
+        team = self.latest("team", "alpha")
+        self.assertEqual(team["categories"], '["BUG"]')
+
+        # 바뀐 것이 없으면 문서를 다시 읽지 않습니다.
+        requests = self.stub.requests
+        self.assertEqual(self.sync.run_once()["imported_sessions"], 0)
+        self.assertEqual(self.stub.requests - requests, 1)  # changes.list 한 번
+
+    def test_pushed_blocks_are_not_imported_back(self):
+        self.sync.run_once()
+        payload = SessionCreateRequest(workspace_id=self.workspace.id, scope="personal", content="[TL;DR] API로 보낸 핸드오프")
+        revision = self.service.create_session(payload).revision_id
+        self.assertIn("---\n[TL;DR] API로 보낸 핸드오프\n", self.stub.document("doc-personal").text)
+        self.assertEqual(self.sync.run_once()["imported_sessions"], 0)
+        self.assertEqual(self.latest()["revision_id"], revision)
+
+    def test_pushed_content_with_separators_is_not_imported_back(self):
+        self.sync.run_once()
+        content = "[TL;DR] 앞부분\n---\n[TL;DR] 구분선 뒤"
+        self.service.create_session(SessionCreateRequest(workspace_id=self.workspace.id, scope="personal", content=content))
+        self.assertEqual(self.sync.run_once()["imported_sessions"], 0)
+
+    def test_team_doc_added_later_is_baselined(self):
+        self.sync.run_once()
+        self.stub.edit("doc-beta", "[TL;DR] 팀 베타 기존 블록\n")
+        with self.backend.transaction() as tx:
+            tx.execute(
+                "UPDATE workspaces SET team_map = ? WHERE id = ?",
+                (json.dumps({"alpha": "doc-alpha", "beta": "doc-beta"}), self.workspace.id),
+            )
+        self.assertEqual(self.sync.run_once()["imported_sessions"], 0)
+
+        self.stub.edit("doc-beta", "[TL;DR] 팀 베타 기존 블록\n---\n[TL;DR] 새 블록\n")
+        with self.assertLogs("api_server_v2.app.services.doc_sync", "INFO"):
+            self.assertEqual(self.sync.run_once()["imported_sessions"], 1)
+        self.assertEqual(self.repo.session_content(self.latest("team", "beta")), "[TL;DR] 새 블록")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+try:
+    from api_server_v2.app.idempotency import IdempotencyError, IdempotentReplay
+    from api_server_v2.app.schemas import ConflictResponse, SessionCreateRequest, SessionResponse
+    from api_server_v2.app.services import memory
+    from api_server_v2.tests.support import ServiceTestCase
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+
+class IdempotentPushTests(ServiceTestCase):
+    """Google 토큰이 없는 워크스페이스로 로컬 저장 경로만 확인합니다."""
+
+    def push(self, content: str, revision=None, key=None):
+        payload = SessionCreateRequest(workspace_id=self.workspace.id, scope="personal", revision=revision, content=content)
+        with self.assertLogs(memory.logger, "INFO"):
+            return self.service.create_session(payload, key)
+
+    def test_retry_replays_first_response_without_writing(self):
+        first = self.push("[HANDOFF] 배포 정리", revision="init")
+        self.assertIsInstance(first, SessionResponse)
+
+        # 타임아웃 뒤 같은 본문/기준 리비전으로 재전송: 기준 리비전이 이미 바뀌었어도 충돌이 아닙니다.
+        retry = self.push("[HANDOFF] 배포 정리", revision="init")
+        self.assertIsInstance(retry, IdempotentReplay)
+        self.assertEqual(retry.body, first.model_dump_json())
+        self.assertEqual(len(self.repo.list_sessions(self.workspace.id)), 1)
+        self.assertEqual(self.repo.current_revision(self.workspace.id), first.revision_id)
+
+    def test_explicit_key_must_match_the_request(self):
+        self.push("첫 번째", key="client-key-1")
+        with self.assertRaises(IdempotencyError) as ctx:
+            self.push("다른 본문", key="client-key-1")
+        self.assertEqual(ctx.exception.status_code, 422)
+
+    def test_conflicts_release_the_key(self):
+        self.push("기준", revision="init")
+        for _ in range(2):  # 충돌은 저장되지 않으므로 재시도해도 다시 충돌로 판단합니다.
+            payload = SessionCreateRequest(workspace_id=self.workspace.id, scope="personal", revision="init", content="늦은 본문")
+            self.assertIsInstance(self.service.create_session(payload), ConflictResponse)
+        self.assertEqual(len(self.repo.list_sessions(self.workspace.id)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import json
+import logging
+import logging.handlers
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api_server_v2.app import logging_config
+    from api_server_v2.app.logging_config import PACKAGE
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+
+class LoggingConfigTests(unittest.TestCase):
+    def setUp(self):
+        logging_config.shutdown_logging()
+        root = logging.getLogger(PACKAGE)
+        saved = (root.handlers[:], root.level, root.propagate)
+        touched = [logging.getLogger(f"{PACKAGE}.{name}") for name in ("db", "adapters.google_docs")]
+        levels = [logger.level for logger in touched]
+
+        def restore():
+            logging_config.shutdown_logging()
+            root.handlers[:], root.level, root.propagate = saved
+            for logger, level in zip(touched, levels):
+                logger.setLevel(level)
+
+        self.addCleanup(restore)
+        self.output = io.StringIO()
+
+    def configure(self, log_format="json", log_levels=""):
+        with mock.patch("sys.stdout", self.output):
+            logging_config.configure_logging(SimpleNamespace(log_format=log_format, log_level="INFO", log_levels=log_levels))
+
+    def records(self):
+        logging_config.shutdown_logging()  # 리스너가 남은 레코드를 모두 내보냅니다.
+        return [json.loads(line) for line in self.output.getvalue().splitlines()]
+
+    def test_parse_levels_prefixes_package(self):
+        self.assertEqual(
+            logging_config.parse_levels(f"db=debug, ,cache=, adapters.google_docs = warning,{PACKAGE}.routes=ERROR"),
+            {f"{PACKAGE}.db": "DEBUG", f"{PACKAGE}.adapters.google_docs": "WARNING", f"{PACKAGE}.routes": "ERROR"},
+        )
+
+    def test_json_records_go_through_the_queue_with_module_levels(self):
+        self.configure(log_levels="db=DEBUG,adapters.google_docs=WARNING")
+        root = logging.getLogger(PACKAGE)
+        self.assertIsInstance(root.handlers[0], logging.handlers.QueueHandler)
+
+        logging.getLogger(f"{PACKAGE}.db").debug("쿼리 %s", "select", extra={"rows": 3})
+        logging.getLogger(f"{PACKAGE}.adapters.google_docs").info("숨김")
+        logging.getLogger(f"{PACKAGE}.adapters.google_docs").warning("토큰 만료")
+        logging.getLogger(f"{PACKAGE}.services").debug("숨김")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger(f"{PACKAGE}.services").exception("실패")
+
+        records = self.records()
+        self.assertEqual([record["msg"] for record in records], ["쿼리 select", "토큰 만료", "실패"])
+        first = records[0]
+        self.assertEqual((first["level"], first["logger"], first["rows"]), ("DEBUG", f"{PACKAGE}.db", 3))
+        self.assertTrue(first["ts"].endswith("+00:00"))
+        self.assertNotIn("request_id", first)  # 요청 밖에서는 상관관계 ID가 없습니다.
+        self.assertIn("ValueError: boom", records[2]["exc_info"])
+
+    def test_request_and_workspace_ids_are_attached(self):
+        self.configure()
+        app = FastAPI()
+        app.add_middleware(logging_config.RequestContextMiddleware)
+
+        @app.get("/work")
+        def work():
+            logging_config.bind_workspace("ws-1")
+            logging.getLogger(f"{PACKAGE}.routes").info("처리")
+            return {}
+
+        client = TestClient(app)
+        given = client.get("/work", headers={"X-Request-ID": "req-1"})
+        generated = client.get("/work")
+        self.assertEqual(given.headers["x-request-id"], "req-1")
+        self.assertEqual(len(generated.headers["x-request-id"]), 32)
+        self.assertIsNone(logging_config.request_id_var.get())
+
+        records = self.records()
+        self.assertEqual((records[0]["request_id"], records[0]["workspace_id"]), ("req-1", "ws-1"))
+        self.assertEqual(records[1]["request_id"], generated.headers["x-request-id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import prometheus_client  # noqa: F401
+
+    import api_server_v2.app.main  # noqa: F401
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise unittest.SkipTest(f"메트릭 의존성이 없습니다: {exc}")
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# 메트릭 활성 여부는 임포트 시점에 결정되므로 별도 프로세스에서 확인합니다.
+SCRIPT = """
+import gzip
+import json
+import prometheus_client
+from fastapi.testclient import TestClient
+from api_server_v2.app import metrics
+from api_server_v2.app.main import app
+
+@metrics.timed("test.timed")
+def work():
+    return 1
+
+with TestClient(app) as client:
+    if not metrics.ENABLED:
+        print(json.dumps({
+            "timed_is_plain": not hasattr(work, "__wrapped__"),
+            "stage_is_noop": metrics.stage("test.stage") is metrics._NOOP,
+            "metrics_status": client.get("/metrics").status_code,
+        }))
+        raise SystemExit
+    workspace = client.post("/workspaces", json={"name": "demo", "doc_personal_id": "doc-1"}).json()
+    client.get("/sessions/latest", params={"workspace_id": workspace["id"], "scope": "personal"})
+    client.get("/no-such-route")
+    related = json.dumps({"workspace_id": workspace["id"], "text": "배포"}).encode()
+    client.post("/sessions/related", content=gzip.compress(related),
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    work()
+    with metrics.stage("test.stage"):
+        pass
+    metrics.record_conflict()
+    metrics.record_cache("test", True)
+    metrics.record_cache("test", False)
+    metrics.record_cache("test", False)
+    metrics.record_google_error("docs.get")
+    exposition = client.get("/metrics")
+
+sample = prometheus_client.REGISTRY.get_sample_value
+print(json.dumps({
+    "latest": sample("memoryhub_request_seconds_count", {"method": "GET", "route": "/sessions/latest", "status": "404"}),
+    "gzip_post": sample("memoryhub_request_seconds_count", {"method": "POST", "route": "/sessions/related", "status": "200"}),
+    "unmatched": sample("memoryhub_request_seconds_count", {"method": "GET", "route": "unmatched", "status": "404"}),
+    "db_stage": sample("memoryhub_stage_seconds_count", {"stage": "db.get_latest_session"}),
+    "timed": sample("memoryhub_stage_seconds_count", {"stage": "test.timed"}),
+    "stage": sample("memoryhub_stage_seconds_count", {"stage": "test.stage"}),
+    "conflicts": sample("memoryhub_conflicts_total", {}),
+    "cache_hit": sample("memoryhub_cache_events_total", {"cache": "test", "result": "hit"}),
+    "cache_miss": sample("memoryhub_cache_events_total", {"cache": "test", "result": "miss"}),
+    "google_errors": sample("memoryhub_google_errors_total", {"operation": "docs.get"}),
+    "content_type": exposition.headers["content-type"],
+    "exposition": exposition.text,
+}))
+"""
+
+
+class MetricsTests(unittest.TestCase):
+    def run_script(self, **env):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run(
+                [sys.executable, "-c", SCRIPT],
+                cwd=ROOT,
+                env={**os.environ, "SQLITE_PATH": str(Path(tmp) / "app.db"), "RUN_DIR": tmp, **env},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_routes_stages_and_counters_are_recorded(self):
+        result = self.run_script(METRICS_ENABLED="true")
+
+        self.assertEqual(result["latest"], 1.0)
+        self.assertEqual(result["unmatched"], 1.0)
+        # 압축된 요청 본문도 라우트 템플릿으로 기록됩니다 (CompressionMiddleware가 scope를 복사하지 않음).
+        self.assertEqual(result["gzip_post"], 1.0)
+        self.assertEqual(result["db_stage"], 1.0)
+        self.assertEqual((result["timed"], result["stage"]), (1.0, 1.0))
+        self.assertEqual(result["conflicts"], 1.0)
+        self.assertEqual((result["cache_hit"], result["cache_miss"]), (1.0, 2.0))
+        self.assertEqual(result["google_errors"], 1.0)
+        self.assertTrue(result["content_type"].startswith("text/plain"))
+        self.assertIn('memoryhub_request_seconds_count{method="GET",route="/sessions/latest",status="404"} 1.0', result["exposition"])
+        self.assertIn('memoryhub_stage_seconds_bucket{le="0.0005",stage="test.stage"}', result["exposition"])
+
+    def test_disabled_metrics_are_no_ops(self):
+        result = self.run_script(METRICS_ENABLED="false")
+        self.assertEqual(result, {"timed_is_plain": True, "stage_is_noop": True, "metrics_status": 404})
+
+
+if __name__ == "__main__":
+    unittest.main()
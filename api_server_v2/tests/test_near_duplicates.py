@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+try:
+    from api_server_v2.app.config import settings
+    from api_server_v2.app.schemas import SessionCreateRequest
+    from api_server_v2.app.services import memory
+    from api_server_v2.app.storage.simhash import distance, simhash
+    from api_server_v2.tests.support import ServiceTestCase
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+HANDOFF = """[HANDOFF]
+[TL;DR] 배포 스크립트 정리와 push 재시도 버그 수정.
+[Startup Decisions] 팀 문서 매핑(TEAM_MAP)을 alpha/beta로 나누기로 결정.
+[Next Actions] Benchmark p99 latency for /sessions/latest before the deploy.
+[Open Questions] should category filters be case-insensitive?
+타임스탬프: 2025-09-01 10:32 KST
+"""
+
+
+class SimHashTests(unittest.TestCase):
+    def test_trivial_edits_are_near_and_unrelated_text_is_far(self):
+        signature = simhash(HANDOFF)
+        reformatted = HANDOFF.replace("\n", "\n\n").replace("10:32", "11:05")
+        self.assertEqual(distance(signature, simhash(reformatted)), 0)
+        self.assertLessEqual(distance(signature, simhash(HANDOFF + "#IRIS\n")), 3)
+        self.assertGreater(distance(signature, simhash("완전히 다른 회의 메모: 예산 검토와 채용 일정 조율.")), 10)
+        self.assertEqual(simhash(""), 0)
+
+
+class NearDuplicatePushTests(ServiceTestCase):
+    """Google 토큰이 없는 워크스페이스로 로컬 저장 경로만 확인합니다."""
+
+    def setUp(self):
+        super().setUp()
+        self.patch(settings, "idempotency_ttl_seconds", 0)
+
+    def push(self, content: str):
+        payload = SessionCreateRequest(workspace_id=self.workspace.id, scope="personal", content=content)
+        with self.assertLogs(memory.logger, "INFO"):
+            return self.service.create_session(payload)
+
+    def test_merge_mode_folds_near_duplicate_into_latest_session(self):
+        with mock.patch.object(settings, "near_duplicate_mode", "merge"):
+            first = self.push(HANDOFF)
+            edited = HANDOFF.replace("10:32", "11:05")
+            merged = self.push(edited)
+
+        self.assertEqual(merged.status, "OK_MERGED_NEAR_DUPLICATE")
+        sessions = self.repo.list_sessions(self.workspace.id)
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(sessions[0]["revision_id"], merged.revision_id)
+        self.assertNotEqual(merged.revision_id, first.revision_id)
+        self.assertEqual(self.repo.session_content(sessions[0]), edited)
+        self.assertEqual(self.repo.current_revision(self.workspace.id), merged.revision_id)
+        self.assertEqual(self.service.latest_session(self.workspace.id, "personal", None, None).content, edited)
+
+    def test_delta_mode_stores_against_the_closest_recent_body(self):
+        self.push(HANDOFF)
+        self.push("완전히 다른 회의 메모: 예산 검토와 채용 일정 조율.\n" * 5)
+        self.push(HANDOFF.replace("10:32", "11:05"))
+
+        sessions = self.repo.list_sessions(self.workspace.id)
+        self.assertEqual(len(sessions), 3)
+        blob = self.backend.fetchone("SELECT base_hash FROM blobs WHERE hash = ?", (sessions[2]["content_hash"],))
+        self.assertEqual(blob["base_hash"], sessions[0]["content_hash"])
+
+
+if __name__ == "__main__":
+    unittest.main()
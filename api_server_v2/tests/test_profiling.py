@@ -0,0 +1,82 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+try:
+    from api_server_v2.app.profiling import Capture, ProfileStore, to_speedscope
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+
+def busy(duration: float) -> int:
+    total, deadline = 0, time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = ProfileStore(Path(tmp.name), max_captures=2)
+
+    def capture(self, mode: str) -> Capture:
+        capture = Capture(mode, interval=0.001)
+        capture.begin()
+        busy(0.03)
+        capture.end()
+        return capture
+
+    def test_store_keeps_only_the_newest_captures(self):
+        saved = []
+        for i in range(3):
+            capture = self.capture("cprofile")
+            capture.id = f"20250101T00000{i}-0000000{i}"
+            saved.append(self.store.save(capture, {"method": "GET", "path": "/sessions/latest"}))
+
+        self.assertEqual([item["id"] for item in self.store.list()], [saved[2]["id"], saved[1]["id"]])
+        self.assertIsNone(self.store.get(saved[0]["id"]))
+        path, meta = self.store.get(saved[2]["id"])
+        self.assertEqual(path.suffix, ".pstats")
+        self.assertEqual(len(list(self.store.root.iterdir())), 4)
+        self.assertIsNone(self.store.get("../../etc/passwd"))
+
+    def test_sampling_capture_writes_speedscope(self):
+        meta = self.store.save(self.capture("sampling"), {"method": "POST", "path": "/sessions"})
+        path, _ = self.store.get(meta["id"])
+        profile = json.loads(path.read_text(encoding="utf-8"))
+
+        sampled = profile["profiles"][0]
+        self.assertEqual(sampled["type"], "sampled")
+        self.assertGreater(len(sampled["samples"]), 0)
+        names = {frame["name"] for frame in profile["shared"]["frames"]}
+        self.assertIn("busy", names)
+
+    def test_unstarted_capture_is_not_stored(self):
+        self.assertIsNone(self.store.save(Capture("cprofile", 0.001), {"method": "GET", "path": "/missing"}))
+        self.assertEqual(self.store.list(), [])
+
+    def test_overlapping_cprofile_capture_is_skipped(self):
+        first, second = Capture("cprofile", 0.001), Capture("cprofile", 0.001)
+        self.assertTrue(first.begin())
+        try:
+            self.assertFalse(second.begin())
+        finally:
+            second.end()
+            first.end()
+        self.assertIsNone(self.store.save(second, {"method": "GET", "path": "/sessions/latest"}))
+        self.assertIsNotNone(self.store.save(first, {"method": "GET", "path": "/sessions/latest"}))
+        self.assertTrue(self.capture("cprofile").profiler)  # 끝난 뒤에는 다시 켤 수 있습니다.
+
+    def test_speedscope_shares_frames(self):
+        frame_a, frame_b = ("a", "x.py", 1), ("b", "x.py", 5)
+        profile = to_speedscope([(frame_a, frame_b), (frame_a,)], 0.01, "req")
+        self.assertEqual(len(profile["shared"]["frames"]), 2)
+        self.assertEqual(profile["profiles"][0]["samples"], [[0, 1], [0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api_server_v2.app import related
+    from api_server_v2.app.migrations import MIGRATIONS, migrate
+    from api_server_v2.app.routes import sessions
+    from api_server_v2.app.schemas import RelatedSessionsRequest
+    from api_server_v2.tests.support import ServiceTestCase
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+# sessions.seq를 채우는 마이그레이션 (버전 번호 대신 이름으로 찾습니다)
+SEQ_BACKFILL = next(m.version for m in MIGRATIONS if m.name == "session sequence numbers")
+
+HANDOFFS = {
+    "rev-deploy": "[HANDOFF] 배포 스크립트 정리. deploy script rollback 절차와 스테이징 서버 점검.",
+    "rev-meeting": "[HANDOFF] 회의에서 팀 문서 매핑(TEAM_MAP)을 alpha/beta로 나누기로 결정.",
+    "rev-bug": "[HANDOFF] push_memory 재시도 버그 수정. revision conflict 처리와 타임아웃 재전송.",
+}
+
+
+@unittest.skipIf(related.np is None, "numpy가 설치되어 있지 않음")
+class RelatedSessionsTests(ServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        for revision, text in HANDOFFS.items():
+            self.repo.insert_session(self.workspace.id, "personal", None, revision, text, ["GENERAL"])
+
+    def related(self, text: str, limit: int = 3):
+        payload = RelatedSessionsRequest(workspace_id=self.workspace.id, text=text, limit=limit)
+        return self.service.related_sessions(payload)
+
+    def test_ranks_relevant_sessions_first_and_updates_incrementally(self):
+        results = self.related("배포 롤백 절차를 다시 확인하고 싶어요 (deploy rollback)")
+        self.assertEqual(results[0].revision_id, "rev-deploy")
+        self.assertEqual(results[0].content, HANDOFFS["rev-deploy"])
+
+        # 색인 후에 들어온 세션은 다음 질의에서 반영됩니다.
+        self.repo.insert_session(self.workspace.id, "personal", None, "rev-cache", "Drive 메타데이터 캐시 TTL 조정", [])
+        self.assertEqual(self.related("메타데이터 캐시 TTL", limit=1)[0].revision_id, "rev-cache")
+
+    def test_deleted_sessions_are_dropped(self):
+        self.related("revision conflict 재전송")
+        bug = self.repo.get_session_by_revision(self.workspace.id, "rev-bug")
+        self.repo.delete_sessions([bug["id"]])
+        revisions = [result.revision_id for result in self.related("revision conflict 재전송")]
+        self.assertNotIn("rev-bug", revisions)
+
+    def test_backfilled_legacy_sessions_are_indexed(self):
+        # 마이그레이션 5 이전 행 (seq 없음, 본문은 content 컬럼). 백필하면 seq가 0 이하가 됩니다.
+        with self.backend.transaction() as tx:
+            tx.execute(
+                "INSERT INTO sessions (id, workspace_id, scope, revision_id, content, categories, last_updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ("legacy", self.workspace.id, "personal", "rev-legacy", "[HANDOFF] Slack 알림 webhook 교체", "[]", "2024-01-01"),
+            )
+            tx.execute("DELETE FROM schema_version WHERE version = ?", (SEQ_BACKFILL,))
+        self.assertEqual(migrate(self.backend), [SEQ_BACKFILL])
+        self.assertLessEqual(self.repo.get_session_by_revision(self.workspace.id, "rev-legacy")["seq"], 0)
+
+        app = FastAPI()
+        app.include_router(sessions.router)
+        with mock.patch.object(sessions, "memory_service", self.service):
+            response = TestClient(app).post(
+                "/sessions/related", json={"workspace_id": self.workspace.id, "text": "Slack webhook 알림", "limit": 1}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["revision_id"], "rev-legacy")
+
+
+if __name__ == "__main__":
+    unittest.main()
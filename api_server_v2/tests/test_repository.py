@@ -0,0 +1,279 @@
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    from api_server_v2.app.db import MemoryRepository
+    from api_server_v2.app.migrations import LATEST_VERSION, MIGRATIONS, applied_versions, migrate
+    from api_server_v2.app.storage import SQLiteBackend
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+# sessions.seq를 채우는 마이그레이션 (버전 번호 대신 이름으로 찾습니다)
+SEQ_BACKFILL = next(m.version for m in MIGRATIONS if m.name == "session sequence numbers")
+
+TABLES = [
+    "workspaces",
+    "sessions",
+    "tokens",
+    "revisions",
+    "google_tokens",
+    "blobs",
+    "retention_policies",
+    "idempotency_keys",
+    "doc_sync_state",
+    "doc_blocks",
+    "schema_version",
+]
+
+
+class RepositoryContract:
+    """모든 StorageBackend가 통과해야 하는 MemoryRepository 동작."""
+
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.backend = self.make_backend()
+        self.repo = MemoryRepository(self.backend)
+        self.repo.init_db()
+
+    def tearDown(self):
+        self.backend.close()
+
+    def test_workspace_roundtrip(self):
+        created = self.repo.create_workspace("demo", "doc-1", {"alpha": "doc-a"})
+        fetched = self.repo.get_workspace(created.id)
+        self.assertEqual(fetched, created)
+        self.assertEqual([w.id for w in self.repo.list_workspaces()], [created.id])
+        self.assertEqual(self.repo.current_revision(created.id), "init")
+        self.assertIsNone(self.repo.get_workspace("missing"))
+
+    def test_insert_session_updates_revision_and_latest(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        self.repo.insert_session(ws.id, "personal", None, "rev-1", "first", ["GENERAL"])
+        self.repo.insert_session(ws.id, "team", "alpha", "rev-2", "second bug", ["BUG"])
+
+        latest = self.repo.get_latest_session(ws.id)
+        self.assertEqual(latest["revision_id"], "rev-2")
+        self.assertEqual(latest["team_key"], "alpha")
+        rows = self.repo.list_sessions(ws.id)
+        self.assertEqual([self.repo.session_content(row) for row in rows], ["first", "second bug"])
+        self.assertEqual(self.repo.current_revision(ws.id), "rev-2")
+
+    def test_identical_bodies_share_one_blob(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        body = "[HANDOFF]\n[TL;DR] 한국어 and English 본문\n" * 20
+        self.repo.insert_session(ws.id, "personal", None, "rev-1", body, ["GENERAL"])
+        self.repo.insert_session(ws.id, "personal", None, "rev-2", body, ["GENERAL"])
+
+        rows = self.repo.list_sessions(ws.id)
+        self.assertEqual(rows[0]["content_hash"], rows[1]["content_hash"])
+        self.assertEqual(self.backend.fetchone("SELECT COUNT(*) AS n FROM blobs")["n"], 1)
+        self.assertEqual(self.repo.session_content(rows[1]), body)
+
+    def test_revision_chain_stored_as_deltas_with_snapshots(self):
+        self.repo.snapshot_interval = 4
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        template = "\n".join(f"[Section {i}] 반복되는 템플릿 줄 {i}" for i in range(40))
+        bodies = [f"{template}\n타임스탬프: 2025-09-14 18:{i:02d} KST\n" for i in range(10)]
+        for i, body in enumerate(bodies):
+            self.repo.insert_session(ws.id, "team", "alpha", f"rev-{i}", body, ["GENERAL"])
+
+        depths = [row["depth"] for row in self.backend.fetchall("SELECT depth FROM blobs ORDER BY depth")]
+        self.assertEqual(depths.count(0), 3)  # 0, 4, 8번째 본문은 전체 스냅샷
+        self.assertEqual(max(depths), 3)
+
+        fresh = MemoryRepository(self.backend)  # 복원 캐시 없이 읽기
+        rows = fresh.list_sessions(ws.id)
+        self.assertEqual([fresh.session_content(row) for row in rows], bodies)
+        self.assertEqual(fresh.get_session_by_revision(ws.id, "rev-7")["revision_id"], "rev-7")
+
+    def test_bulk_insert_sessions_in_chunks(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        bodies = ["회의 본문", "bug 본문", "일반 본문"]
+        seeds = [
+            (ws.id, "personal", None, f"seed-{i}", bodies[i % 3], ["GENERAL"], f"2025-01-01T00:00:{i:02d}")
+            for i in range(7)
+        ]
+
+        self.assertEqual(self.repo.bulk_insert_sessions(seeds, chunk_size=3), 7)
+
+        rows = self.repo.list_sessions(ws.id)
+        self.assertEqual([row["revision_id"] for row in rows], [f"seed-{i}" for i in range(7)])
+        self.assertEqual(self.repo.session_content(rows[4]), "bug 본문")
+        self.assertEqual(self.backend.fetchone("SELECT COUNT(*) AS n FROM blobs")["n"], 3)
+        self.assertEqual(self.repo.current_revision(ws.id), "seed-6")
+
+    def test_sequence_backfill_keeps_history_order(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        # 마이그레이션 5 이전에 저장된 행 (seq 없음)
+        with self.backend.transaction() as tx:
+            tx.executemany(
+                "INSERT INTO sessions (id, workspace_id, scope, revision_id, categories, last_updated) VALUES (?, ?, ?, ?, ?, ?)",
+                [(f"s{i}", ws.id, "personal", f"old-{i}", "[]", f"2025-01-01T00:00:{i:02d}") for i in (3, 0, 4, 1, 2)],
+            )
+            tx.execute("DELETE FROM schema_version WHERE version = ?", (SEQ_BACKFILL,))
+        self.repo.insert_session(ws.id, "personal", None, "new", "본문", ["GENERAL"])  # 백필 전에 들어온 세션
+
+        self.assertEqual(migrate(self.backend, batch_size=2), [SEQ_BACKFILL])
+        self.assertEqual(migrate(self.backend), [])
+        self.assertEqual(applied_versions(self.backend), list(range(1, LATEST_VERSION + 1)))
+
+        rows = self.repo.list_sessions(ws.id)
+        self.assertEqual([row["revision_id"] for row in rows], [f"old-{i}" for i in range(5)] + ["new"])
+        self.assertEqual(len({row["seq"] for row in rows}), 6)
+        self.assertEqual(self.repo.get_latest_session(ws.id)["revision_id"], "new")
+
+    def test_concurrent_pushes_get_distinct_seq(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+
+        def push(worker):
+            for i in range(5):
+                self.repo.insert_session(ws.id, "personal", None, f"rev-{worker}-{i}", f"본문 {worker} {i}", ["GENERAL"])
+
+        threads = [threading.Thread(target=push, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        rows = self.repo.sessions_since(ws.id, None, 100)
+        self.assertEqual(len(rows), 20)
+        self.assertEqual([row["seq"] for row in rows], list(range(1, 21)))
+
+    def test_duplicate_seq_migration_moves_later_rows_to_the_end(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        for i in range(3):
+            self.repo.insert_session(ws.id, "personal", None, f"rev-{i}", f"본문 {i}", ["GENERAL"])
+        # 잠금 없이 동시에 저장되어 seq가 겹친 DB (마이그레이션 9 이전)
+        with self.backend.transaction() as tx:
+            tx.execute("DROP INDEX idx_sessions_seq_unique")
+            tx.execute("UPDATE sessions SET seq = 2 WHERE revision_id = 'rev-2'")
+            tx.execute("DELETE FROM schema_version WHERE version >= 9")
+
+        self.assertEqual(migrate(self.backend), list(range(9, LATEST_VERSION + 1)))
+        rows = self.repo.sessions_since(ws.id, 1, 100)
+        self.assertEqual([(row["revision_id"], row["seq"]) for row in rows], [("rev-1", 2), ("rev-2", 3)])
+        with self.assertRaises(Exception):
+            with self.backend.transaction() as tx:
+                tx.execute("UPDATE sessions SET seq = 2 WHERE revision_id = 'rev-2'")
+
+    def test_doc_baseline_migration_marks_synced_docs(self):
+        synced = self.repo.create_workspace("synced", "doc-1", {})
+        pushed_only = self.repo.create_workspace("pushed", "doc-2", {})
+        self.repo.save_doc_sync_token(synced.id, "7")
+        self.repo.remember_doc_blocks(synced.id, "doc-1", ["h1", "h2"])
+        self.repo.remember_doc_blocks(pushed_only.id, "doc-2", ["h3"])
+        with self.backend.transaction() as tx:
+            tx.execute("DELETE FROM schema_version WHERE version >= 13")
+
+        self.assertEqual(migrate(self.backend), [13])
+        self.assertEqual(self.repo.baselined_docs(synced.id), {"doc-1"})
+        self.assertEqual(self.repo.baselined_docs(pushed_only.id), set())
+
+    def test_idempotency_key_lifecycle(self):
+        now = datetime(2025, 1, 2, 12, 0, 0)
+        day_ago, minute_ago = now - timedelta(days=1), now - timedelta(minutes=1)
+
+        self.assertEqual(self.repo.claim_idempotency_key("ws", "k", "h1", now, day_ago, minute_ago), (True, None))
+        claimed, existing = self.repo.claim_idempotency_key("ws", "k", "h1", now, day_ago, minute_ago)
+        self.assertFalse(claimed)
+        self.assertEqual((existing["request_hash"], existing["response"]), ("h1", None))  # 처리 중
+
+        self.repo.complete_idempotency_key("ws", "k", '{"status": "OK"}')
+        self.repo.release_idempotency_key("ws", "k")  # 완료된 키는 풀리지 않음
+        self.assertEqual(self.repo.claim_idempotency_key("ws", "k", "h1", now, day_ago, minute_ago)[1]["response"], '{"status": "OK"}')
+
+        # 하루가 지나면 같은 키를 다시 선점하고, 보관 작업은 만료된 키를 지웁니다.
+        later = now + timedelta(days=1, seconds=1)
+        self.assertTrue(self.repo.claim_idempotency_key("ws", "k", "h2", later, later - timedelta(days=1), later)[0])
+        self.assertEqual(self.repo.purge_idempotency_keys(later + timedelta(days=2)), 1)
+
+    def test_google_token_upsert(self):
+        self.assertIsNone(self.repo.get_google_token("ws"))
+        self.repo.save_google_token("ws", '{"token": "a"}')
+        self.repo.update_google_token("ws", '{"token": "b"}')
+        self.assertEqual(self.repo.get_google_token("ws"), '{"token": "b"}')
+
+    def test_create_token(self):
+        ws = self.repo.create_workspace("demo", "doc-1", {})
+        token = self.repo.create_token(ws.id, ["read"])
+        self.assertEqual(len(token.token), 32)
+
+
+class SQLiteRepositoryTests(RepositoryContract, unittest.TestCase):
+    def make_backend(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        return SQLiteBackend(Path(self.tmpdir.name) / "memory.db")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_temp_cluster():
+    """PATH에 initdb/pg_ctl이 있으면 임시 클러스터를 띄우고 (dsn, 정리 함수)를 반환합니다."""
+    if not (shutil.which("initdb") and shutil.which("pg_ctl")) or os.geteuid() == 0:
+        return None, None
+    datadir = tempfile.mkdtemp(prefix="memoryhub-pg-")
+    port = _free_port()
+    subprocess.run(["initdb", "-D", datadir, "-U", "postgres", "-A", "trust"], check=True, capture_output=True)
+    subprocess.run(
+        ["pg_ctl", "-D", datadir, "-o", f"-p {port} -k {datadir}", "-w", "start"],
+        check=True,
+        capture_output=True,
+    )
+
+    def stop():
+        subprocess.run(["pg_ctl", "-D", datadir, "-m", "fast", "stop"], capture_output=True)
+        shutil.rmtree(datadir, ignore_errors=True)
+
+    time.sleep(0.2)
+    return f"postgresql://postgres@localhost:{port}/postgres?host={datadir}", stop
+
+
+class PostgresRepositoryTests(RepositoryContract, unittest.TestCase):
+    """MEMORYHUB_TEST_POSTGRES_DSN 또는 PATH의 pg_ctl 임시 클러스터로 실행합니다."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from api_server_v2.app.storage.postgres import ConnectionPool
+        except ImportError:
+            ConnectionPool = None
+        if ConnectionPool is None:
+            raise unittest.SkipTest("psycopg / psycopg_pool이 설치되지 않았습니다.")
+        cls.dsn = os.getenv("MEMORYHUB_TEST_POSTGRES_DSN")
+        cls.stop_cluster = None
+        if not cls.dsn:
+            cls.dsn, cls.stop_cluster = _start_temp_cluster()
+        if not cls.dsn:
+            raise unittest.SkipTest("PostgreSQL 테스트 환경이 없습니다.")
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.stop_cluster:
+            cls.stop_cluster()
+
+    def make_backend(self):
+        from api_server_v2.app.storage.postgres import PostgresBackend
+
+        backend = PostgresBackend(self.dsn, min_size=1, max_size=2)
+        with backend.transaction() as tx:
+            for table in TABLES:
+                tx.execute(f"DROP TABLE IF EXISTS {table}")
+        return backend
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from datetime import datetime
+
+try:
+    from api_server_v2.app import responses
+    from api_server_v2.app.schemas import SessionResponse
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+TIMESTAMPS = [
+    "2024-01-02T03:04:05",  # DB last_updated (utcnow, 마이크로초 0)
+    "2024-01-02T03:04:05.120000",
+    "2024-01-02T03:04:05.123Z",  # Drive modifiedTime
+    "2024-01-02T03:04:05+09:00",
+]
+
+
+class SessionBodyTests(unittest.TestCase):
+    def encode_both(self, values):
+        """(빠른 경로 bytes, pydantic 모델 직렬화 bytes)"""
+        fast = responses.dump_fields(SessionResponse, {**values, "last_updated": responses.json_datetime(values["last_updated"])})
+        model = SessionResponse(**{**values, "last_updated": datetime.fromisoformat(values["last_updated"])})
+        return fast, model.model_dump_json().encode("utf-8")
+
+    def assert_matches_model(self):
+        for timestamp in TIMESTAMPS:
+            values = {
+                "revision_id": "rev-1",
+                "last_updated": timestamp,
+                "categories": ["MEETING"],
+                "scope": "personal",
+                "team_key": None,
+                "content": "[HANDOFF] 회의록 \"따옴표\"\n\t\x00 😀",
+                "doc_url": "https://docs.google.com/document/d/doc-1/edit",
+                "status": "OK_PULLED",
+            }
+            with self.subTest(timestamp=timestamp):
+                fast, model = self.encode_both(values)
+                self.assertEqual(fast, model)
+
+    def test_fast_body_matches_model_serialization(self):
+        self.assert_matches_model()
+
+    def test_pydantic_fallback_matches_model_serialization(self):
+        orjson, responses.orjson = responses.orjson, None
+        self.addCleanup(setattr, responses, "orjson", orjson)
+        self.assert_matches_model()
+
+    def test_missing_required_field_is_an_error(self):
+        with self.assertRaises(KeyError):
+            responses.dump_fields(SessionResponse, {"revision_id": "rev-1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    from api_server_v2.app.db import MemoryRepository
+    from api_server_v2.app.schemas import RetentionPolicy
+    from api_server_v2.app.services.retention import RetentionService
+    from api_server_v2.app.storage import SQLiteBackend
+    from api_server_v2.app.storage.archive import SessionArchive
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+
+class RetentionServiceTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.backend = SQLiteBackend(Path(tmp.name) / "memory.db")
+        self.addCleanup(self.backend.close)
+        self.repo = MemoryRepository(self.backend)
+        self.repo.init_db()
+        self.service = RetentionService(self.repo, SessionArchive(Path(tmp.name) / "archive"), RetentionPolicy())
+        self.ws = self.repo.create_workspace("demo", "doc-1", {})
+
+    def insert(self, revision, content, category):
+        self.repo.insert_session(self.ws.id, "personal", None, revision, content, [category])
+
+    def test_keep_last_per_category_archives_older_sessions(self):
+        template = "\n".join(f"[Section {i}] 공통 템플릿" for i in range(20))
+        for i in range(4):
+            self.insert(f"bug-{i}", f"{template}\nbug report {i}", "BUG")
+        self.insert("meeting-0", f"{template}\nmeeting notes", "MEETING")
+        self.service.set_policy(self.ws.id, RetentionPolicy(keep_last_per_category=1))
+
+        result = self.service.compact_workspace(self.ws.id)
+
+        self.assertEqual((result.archived, result.kept), (3, 2))
+        remaining = self.repo.list_sessions(self.ws.id)
+        self.assertEqual([row["revision_id"] for row in remaining], ["bug-3", "meeting-0"])
+        self.repo.collect_garbage_blobs()
+        fresh = MemoryRepository(self.backend)
+        self.assertTrue(fresh.session_content(remaining[0]).endswith("bug report 3"))
+
+        found = self.service.search_archive(self.ws.id, "BUG REPORT 1")
+        self.assertEqual([item.revision_id for item in found], ["bug-1"])
+        self.assertEqual(len(self.service.search_archive(self.ws.id)), 3)
+
+    def test_max_age_keeps_recent_and_current_revision(self):
+        self.insert("rev-0", "old", "GENERAL")
+        self.insert("rev-1", "new", "GENERAL")
+        self.service.set_policy(self.ws.id, RetentionPolicy(max_age_days=7))
+
+        self.assertEqual(self.service.compact_workspace(self.ws.id).archived, 0)
+        later = datetime.utcnow() + timedelta(days=30)
+        result = self.service.compact_workspace(self.ws.id, now=later)
+        self.assertEqual(result.archived, 1)
+        self.assertEqual(self.repo.current_revision(self.ws.id), "rev-1")
+
+    def test_run_once_purges_expired_tokens(self):
+        self.repo.create_token(self.ws.id, ["read"])
+        summary = self.service.run_once(now=datetime.utcnow() + timedelta(days=31))
+        self.assertEqual(summary["expired_tokens"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
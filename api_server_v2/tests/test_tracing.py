@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import opentelemetry.sdk  # noqa: F401
+
+    import api_server_v2.app.config  # noqa: F401
+except ImportError as exc:  # pragma: no cover - optional dependency
+    raise unittest.SkipTest(f"트레이싱 의존성이 없습니다: {exc}")
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# 트레이싱 활성 여부는 임포트 시점에 결정되므로 별도 프로세스에서 확인합니다.
+SCRIPT = """
+import json, sys
+from pathlib import Path
+from api_server_v2.app import metrics, tracing
+from api_server_v2.app.db import MemoryRepository
+from api_server_v2.app.storage import SQLiteBackend
+
+repo = MemoryRepository(SQLiteBackend(Path(sys.argv[1]) / "memory.db"))
+repo.init_db()
+ws = repo.create_workspace("demo", "doc-1", {})
+tracing.clear_spans()
+with tracing.span("request"):
+    repo.insert_session(ws.id, "team", "alpha", "rev-1", "본문 payload", ["GENERAL"])
+    with metrics.stage("google.docs.get", doc_id="doc-1"):
+        pass
+print(json.dumps([
+    {"name": s.name, "parent": s.parent.span_id if s.parent else None, "id": s.context.span_id,
+     "attributes": dict(s.attributes)}
+    for s in tracing.finished_spans()
+]))
+"""
+
+
+class TracingTests(unittest.TestCase):
+    def run_script(self, **env):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run(
+                [sys.executable, "-c", SCRIPT, tmp],
+                cwd=ROOT,
+                env={**os.environ, "SQLITE_PATH": str(Path(tmp) / "app.db"), **env},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_spans_are_tagged_and_nested(self):
+        spans = {span["name"]: span for span in self.run_script(TRACING_ENABLED="true", TRACING_EXPORTER="memory")}
+
+        insert = spans["db.insert_session"]
+        self.assertEqual(insert["attributes"]["memoryhub.scope"], "team")
+        self.assertEqual(insert["attributes"]["memoryhub.team_key"], "alpha")
+        self.assertEqual(insert["attributes"]["memoryhub.payload_bytes"], len("본문 payload".encode("utf-8")))
+        self.assertEqual(spans["google.docs.get"]["attributes"], {"memoryhub.doc_id": "doc-1"})
+        self.assertEqual(insert["parent"], spans["request"]["id"])
+        self.assertEqual(spans["google.docs.get"]["parent"], spans["request"]["id"])
+
+    def test_disabled_tracing_records_nothing(self):
+        self.assertEqual(self.run_script(TRACING_ENABLED="false"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
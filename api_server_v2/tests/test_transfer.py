@@ -0,0 +1,99 @@
+import gzip
+import json
+import unittest
+
+try:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api_server_v2.app import compression, transfer
+    from api_server_v2.app.routes import workspaces
+    from api_server_v2.tests.support import ServiceTestCase
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+class TransferTests(ServiceTestCase):
+    team_map = {"alpha": "doc-2"}
+
+    def setUp(self):
+        super().setUp()
+        self.patch(workspaces, "repository", self.repo)
+        self.patch(workspaces, "memory_service", self.service)
+        self.patch(transfer, "EXPORT_BATCH", 2)
+        self.patch(transfer, "IMPORT_BATCH", 2)
+        app = FastAPI()
+        app.add_middleware(compression.CompressionMiddleware, minimum_size=256, max_request_bytes=4096)
+        app.include_router(workspaces.router)
+        self.client = TestClient(app)
+        self.source = self.workspace
+        self.target = self.repo.create_workspace("target", "doc-3", {})
+
+    def test_round_trip_preserves_order_and_skips_existing_revisions(self):
+        base = "[TL;DR] 배포 스크립트 정리\n" * 100
+        self.repo.insert_session(self.source.id, "personal", None, "rev-1", base, ["GENERAL"])
+        self.repo.insert_session(self.source.id, "team", "alpha", "rev-2", "[TL;DR] 회의 메모", ["MEETING"])
+        content_hash = self.repo.get_session_by_revision(self.source.id, "rev-1")["content_hash"]
+        self.repo.insert_session(self.source.id, "personal", None, "rev-3", base + "추가", ["GENERAL"], base_hash=content_hash)
+
+        response = self.client.get(f"/workspaces/{self.source.id}/export", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        lines = response.content.splitlines()
+        self.assertEqual(json.loads(lines[0])["workspace"]["team_map"], {"alpha": "doc-2"})
+        self.assertEqual([json.loads(line)["revision_id"] for line in lines[1:]], ["rev-1", "rev-2", "rev-3"])
+
+        # 압축한 NDJSON 본문은 MAX_REQUEST_BODY_BYTES(여기서는 4KB)보다 커도 조각마다 풀어서 읽습니다.
+        body = gzip.compress(response.content)
+        headers = {**NDJSON, "Content-Encoding": "gzip"}
+        imported = self.client.post(f"/workspaces/{self.target.id}/import", content=body, headers=headers)
+        self.assertEqual(imported.json(), {"workspace_id": self.target.id, "imported": 3, "skipped": 0})
+        rows = self.repo.list_sessions(self.target.id)
+        self.assertEqual([row["revision_id"] for row in rows], ["rev-1", "rev-2", "rev-3"])
+        self.assertEqual(self.repo.session_contents(rows)[2], base + "추가")
+        self.assertEqual(rows[1]["team_key"], "alpha")
+        self.assertEqual(self.repo.current_revision(self.target.id), "rev-3")
+
+        again = self.client.post(f"/workspaces/{self.target.id}/import", content=body, headers=headers)
+        self.assertEqual(again.json()["skipped"], 3)
+
+        if compression.BROTLI_STREAMING:
+            other = self.repo.create_workspace("br", "doc-3", {})
+            br = compression.brotli.compress(response.content)
+            imported = self.client.post(f"/workspaces/{other.id}/import", content=br, headers={**NDJSON, "Content-Encoding": "br"})
+            self.assertEqual(imported.json()["imported"], 3)
+
+    def test_import_into_workspace_with_sessions_keeps_latest(self):
+        self.repo.insert_session(self.target.id, "personal", None, "current", "[TL;DR] 지금 작업", ["GENERAL"])
+        lines = [
+            {"revision_id": f"old-{i}", "scope": "personal", "content": f"백업 {i}", "last_updated": f"2020-01-0{i + 1}T00:00:00"}
+            for i in range(3)
+        ]
+        body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+        response = self.client.post(f"/workspaces/{self.target.id}/import", content=body.encode(), headers=NDJSON)
+        self.assertEqual(response.json()["imported"], 3)
+
+        self.assertEqual(self.repo.current_revision(self.target.id), "current")
+        self.assertEqual(self.repo.get_latest_session(self.target.id)["revision_id"], "current")
+        rows = self.repo.list_sessions(self.target.id)
+        self.assertEqual([row["revision_id"] for row in rows], ["old-0", "old-1", "old-2", "current"])
+
+        # 가져온 세션이 더 새로우면 리비전을 옮깁니다.
+        line = {"revision_id": "newer", "scope": "personal", "content": "새 본문", "last_updated": "2099-01-01T00:00:00"}
+        self.client.post(f"/workspaces/{self.target.id}/import", content=json.dumps(line).encode(), headers=NDJSON)
+        self.assertEqual(self.repo.current_revision(self.target.id), "newer")
+
+    def test_invalid_line_reports_position_after_storing_earlier_batches(self):
+        lines = [{"scope": "personal", "content": f"세션 {i}"} for i in range(3)] + [{"scope": "nobody"}]
+        body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+        response = self.client.post(f"/workspaces/{self.target.id}/import", content=body.encode(), headers=NDJSON)
+        self.assertEqual(response.status_code, 422)
+        detail = response.json()["detail"]
+        self.assertEqual((detail["code"], detail["line"], detail["imported"]), ("INVALID_IMPORT_LINE", 4, 2))
+        self.assertEqual(len(self.repo.list_sessions(self.target.id)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+try:
+    from api_server_v2.app.cache import LRUCache, SQLiteCache
+    from api_server_v2.app.workers import LeaderLock, fcntl
+except ImportError as exc:  # pragma: no cover - server dependencies not installed
+    raise unittest.SkipTest(f"api_server_v2 의존성이 없습니다: {exc}")
+
+
+class SharedCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "cache.db"
+
+    def open_cache(self) -> SQLiteCache:
+        cache = SQLiteCache(self.path)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_entries_are_visible_to_other_connections(self):
+        writer, reader = self.open_cache(), self.open_cache()  # 워커 두 개
+        writer.set("doc_meta", "doc-1", {"doc_id": "doc-1", "name": "회의록"}, ttl=60)
+
+        self.assertEqual(reader.get("doc_meta", "doc-1"), {"doc_id": "doc-1", "name": "회의록"})
+        self.assertIsNone(reader.get("google_token", "doc-1"))
+
+        writer.delete("doc_meta", "doc-1")
+        self.assertIsNone(reader.get("doc_meta", "doc-1"))
+
+    def test_expired_entries_are_misses(self):
+        cache = self.open_cache()
+        cache.set("google_token", "ws", '{"token": "a"}', ttl=0.05)
+        cache.set("google_token", "other", '{"token": "b"}', ttl=0)  # ttl 0은 저장하지 않음
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get("google_token", "ws"))
+        self.assertIsNone(cache.get("google_token", "other"))
+        self.assertEqual(cache.purge_expired(), 1)
+
+
+class LRUCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_and_counts_hits(self):
+        cache = LRUCache("workspace", maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # a가 최근 사용 → b가 밀려남
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        cache.delete("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(
+            cache.stats(), {"size": 1, "maxsize": 2, "hits": 3, "misses": 2, "hit_rate": 0.6}
+        )
+
+    def test_ttl_and_disabled_cache(self):
+        cache = LRUCache("google_token", maxsize=4, ttl=0.05)
+        cache.set("ws", '{"token": "a"}')
+        self.assertEqual(cache.get("ws"), '{"token": "a"}')
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("ws"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+        disabled = LRUCache("workspace", maxsize=0)
+        disabled.set("a", 1)
+        self.assertIsNone(disabled.get("a"))
+
+
+@unittest.skipIf(fcntl is None, "fcntl이 없는 플랫폼")
+class LeaderLockTests(unittest.TestCase):
+    def test_only_one_holder_until_release(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "run" / "compaction.lock"
+            first, second = LeaderLock(path), LeaderLock(path)
+
+            self.assertTrue(first.acquire())
+            self.assertFalse(second.acquire())
+            first.release()
+            self.assertTrue(second.acquire())
+            second.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
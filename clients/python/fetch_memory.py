@@ -1,9 +1,14 @@
 import os
+import sys
 import json
+import argparse
 import datetime
+import http.client
 import pathlib
+import threading
 import urllib.request
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from dotenv import load_dotenv
@@ -11,12 +16,23 @@ except ImportError:  # pragma: no cover - fallback when python-dotenv is absent
     def load_dotenv():
         return False
 
+try:
+    from .http_body import ACCEPT_ENCODING, read_body
+except ImportError:  # python clients/python/fetch_memory.py 로 직접 실행할 때
+    from http_body import ACCEPT_ENCODING, read_body
+
 # 1. .env 파일 로드
 load_dotenv()
 WEBAPP_URL = os.getenv("WEBAPP_URL")
 API_TOKEN = os.getenv("API_TOKEN")
 REVISION_CACHE_PATH = pathlib.Path("clients/python/.revision_cache")
+# --targets 모드: 대상별 마지막 리비전 {"team:alpha": "rev-..."}
+TARGET_CACHE_PATH = pathlib.Path("clients/python/.revision_cache.json")
+OUTPUT_DIR = pathlib.Path("examples")
 DEFAULT_SCOPE = "personal"
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 30
+MAX_REDIRECTS = 5  # Apps Script 웹 앱은 script.googleusercontent.com으로 한 번 리다이렉트합니다.
 SKIP_KEYS = {
     "parsed_at",
     "revision_id",
@@ -34,23 +50,104 @@ def sanitize_scope(value: str) -> str:
     return scope if scope in {"personal", "team"} else DEFAULT_SCOPE
 
 
-def request_handoff_json(webapp_url, token, scope, team_key, category_filter):
+class KeepAlivePool:
+    """호스트별 http.client 연결을 재사용하는 GET 클라이언트 (스레드 안전).
+
+    --targets 모드에서 대상마다 새 TLS 연결을 맺지 않도록 요청이 끝난 연결을 돌려받아 다음 요청에 씁니다.
+    동시에 진행 중인 요청 수만큼만 연결이 생기며, 리다이렉트(Apps Script → googleusercontent)도 따라갑니다.
+    """
+
+    def __init__(self, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle = {}  # (scheme, host, port) → [연결]
+        self._lock = threading.Lock()
+
+    def get(self, url, headers):
+        """응답 본문(압축 해제)을 반환합니다. 4xx/5xx는 RuntimeError."""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = self._request(url, headers)
+            if status in (301, 302, 303, 307, 308) and response_headers.get("Location"):
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            if status >= 400:
+                raise RuntimeError(f"HTTP {status}")
+            return body
+        raise RuntimeError("리다이렉트가 너무 많습니다.")
+
+    def _request(self, url, headers):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        reused, conn = self._checkout(key)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = read_body(response)
+        except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionError):
+            conn.close()
+            if not reused:
+                raise
+            # 서버가 닫은 유휴 연결이면 새 연결로 한 번 더 보냅니다.
+            _, conn = self._checkout(key, fresh=True)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = read_body(response)
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.setdefault(key, []).append(conn)
+        return response.status, response.headers, body
+
+    def _checkout(self, key, fresh=False):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle and not fresh:
+                return True, idle.pop()
+            self.connections_opened += 1
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return False, connection_class(host, port, timeout=self.timeout)
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+
+
+def request_handoff_json(webapp_url, token, scope, team_key, category_filter, pool=None):
     params = {'mode': 'json', 'key': token, 'scope': scope}
     if team_key:
         params['team'] = team_key
     if category_filter:
         params['category'] = category_filter
     url = f"{webapp_url}?{urllib.parse.urlencode(params)}"
+    request = urllib.request.Request(url, headers={"Accept-Encoding": ACCEPT_ENCODING})
 
     try:
-        with urllib.request.urlopen(url) as r:
-            response_text = r.read().decode("utf-8")
-            if not response_text.startswith('{'):
-                raise json.JSONDecodeError("Response was not JSON", response_text, 0)
-            data = json.loads(response_text)
-            if data.get("error"):
-                raise RuntimeError(f"API 오류: {data['error']}")
-            return data
+        if pool is not None:
+            response_text = pool.get(url, {"Accept-Encoding": ACCEPT_ENCODING}).decode("utf-8")
+        else:
+            with urllib.request.urlopen(request) as r:
+                response_text = read_body(r).decode("utf-8")
+        if not response_text.startswith('{'):
+            raise json.JSONDecodeError("Response was not JSON", response_text, 0)
+        data = json.loads(response_text)
+        if data.get("error"):
+            raise RuntimeError(f"API 오류: {data['error']}")
+        return data
     except json.JSONDecodeError as e:
         raise RuntimeError(f"API 호출 실패(JSON 오류): {e}") from e
     except Exception as e:
@@ -124,10 +221,115 @@ def describe_revision_change(previous, current):
     return f"새 리비전 감지: {current} (이전: {previous})"
 
 
-def main():
+def parse_targets(spec):
+    """"personal,team:alpha,team:beta:BUG" → [(scope, team_key, category), ...] (중복은 한 번만).
+
+    항목 형식: personal[:카테고리] 또는 team[:팀키[:카테고리]].
+    """
+    targets = []
+    for item in (spec or "").split(","):
+        parts = [part.strip() for part in item.strip().split(":")]
+        if not parts[0]:
+            continue
+        scope = parts[0].lower()
+        if scope == "personal" and len(parts) <= 2:
+            target = ("personal", "", parts[1] if len(parts) > 1 else "")
+        elif scope == "team" and len(parts) <= 3:
+            target = ("team", parts[1] if len(parts) > 1 else "", parts[2] if len(parts) > 2 else "")
+        else:
+            raise ValueError(f"잘못된 대상입니다: {item.strip()!r} (personal[:카테고리] 또는 team[:팀키[:카테고리]])")
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def target_label(target):
+    return ":".join(part for part in target if part)
+
+
+def read_target_cache():
+    try:
+        return json.loads(TARGET_CACHE_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_target_cache(cache):
+    TARGET_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    TARGET_CACHE_PATH.write_text(json.dumps(cache, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def fetch_targets(webapp_url, token, targets, max_workers=MAX_WORKERS):
+    """대상들을 동시에 가져옵니다. 결과는 입력 순서의 (대상, 데이터 또는 None, 오류 또는 None) 목록.
+
+    연결은 KeepAlivePool 하나를 공유하므로 전체 시간은 합이 아니라 가장 느린 대상 하나에 가깝습니다.
+    """
+    pool = KeepAlivePool()
+
+    def fetch(target):
+        scope, team_key, category = target
+        try:
+            return target, request_handoff_json(webapp_url, token, scope, team_key, category, pool=pool), None
+        except RuntimeError as e:
+            return target, None, e
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+            return list(executor.map(fetch, targets))
+    finally:
+        pool.close()
+
+
+def refresh_targets(webapp_url, token, targets):
+    """여러 대상을 한 번에 새로 고칩니다. 리비전이 바뀐 대상만 파일로 쓰고 캐시는 마지막에 한 번 저장합니다.
+
+    반환값은 실패한 대상 수입니다.
+    """
+    results = fetch_targets(webapp_url, token, targets)
+    cache = read_target_cache()
+    ts = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    failed = 0
+    for target, data, error in results:
+        label = target_label(target)
+        if error is not None:
+            failed += 1
+            print(f"[{label}] 실패: {error}")
+            continue
+        revision_id = data.get("revision_id")
+        previous = cache.get(label, "")
+        print(f"[{label}] {describe_revision_change(previous, revision_id)}")
+        if revision_id and revision_id == previous:
+            continue
+        out_path = OUTPUT_DIR / f"handoff_{ts}_{label.replace(':', '_')}.md"
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(build_markdown(data, ts), encoding="utf-8")
+        print(f"[{label}] '{out_path}' 파일에 저장했습니다.")
+        if revision_id:
+            cache[label] = revision_id
+    write_target_cache(cache)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API 서버에서 최신 핸드오프를 가져와 Markdown으로 저장합니다.")
+    parser.add_argument(
+        "--targets",
+        default=os.getenv("TARGETS", ""),
+        help="쉼표로 구분한 대상 (예: personal,team:alpha,team:beta:BUG). 없으면 SCOPE/TEAM_KEY/CATEGORY_FILTER 하나만 가져옵니다.",
+    )
+    args = parser.parse_args(argv)
+
     if not all([WEBAPP_URL, API_TOKEN]):
         print("오류: .env 파일에 WEBAPP_URL, API_TOKEN이 모두 설정되어야 합니다.")
-        return
+        return 1
+
+    if args.targets:
+        try:
+            targets = parse_targets(args.targets)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"v2.2 API 서버(JSON 모드)에서 대상 {len(targets)}개를 동시에 가져오는 중...")
+        return 1 if refresh_targets(WEBAPP_URL, API_TOKEN, targets) else 0
 
     scope = sanitize_scope(os.getenv("SCOPE", DEFAULT_SCOPE))
     team_key = (os.getenv("TEAM_KEY") or "").strip()
@@ -143,13 +345,14 @@ def main():
     print(revision_message)
 
     ts = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    out_path = pathlib.Path(f"examples/handoff_{ts}.md")
+    out_path = OUTPUT_DIR / f"handoff_{ts}.md"
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(build_markdown(data, ts), encoding="utf-8")
 
     write_cached_revision(data.get("revision_id"))
     print(f"성공! '{out_path}' 파일에 최신 핸드오프가 저장되었습니다.")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""fetch_memory / push_memory가 함께 쓰는 응답 본문 처리 (Accept-Encoding 협상과 압축 해제)."""
+
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency (gzip만 사용)
+    brotli = None
+
+# 서버가 압축해서 보낼 수 있는 인코딩 (v2 API는 1KB 이상 응답을 압축)
+ACCEPT_ENCODING = "br, gzip" if brotli else "gzip"
+
+
+def read_body(resp) -> bytes:
+    """Content-Encoding(gzip/deflate/br)에 따라 응답 본문을 풀어서 반환합니다."""
+    data = resp.read()
+    encoding = (resp.headers.get("Content-Encoding") or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        return zlib.decompress(data)
+    if encoding == "br" and brotli:
+        return brotli.decompress(data)
+    return data
@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
 import sys
 import textwrap
+import time
+import urllib.error
 import urllib.request
 import urllib.parse
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 
 try:
     import pyperclip
 except Exception:  # pragma: no cover - clipboard optional
     pyperclip = None
 
+try:
+    from .http_body import ACCEPT_ENCODING, read_body
+except ImportError:  # python clients/python/push_memory.py 로 직접 실행할 때
+    from http_body import ACCEPT_ENCODING, read_body
+
 try:
     from dotenv import load_dotenv
 except ImportError:  # pragma: no cover
@@ -24,6 +39,22 @@ except ImportError:  # pragma: no cover
 
 
 DEFAULT_SCOPE = "personal"
+# 서버에 닿지 못한 핸드오프를 보관하는 오프라인 큐 (한 줄에 하나, 추가만 하고 --flush 때 다시 씀)
+QUEUE_PATH = Path(__file__).resolve().with_name(".push_queue.jsonl")
+EXIT_QUEUED = 75  # EX_TEMPFAIL: 보내지 못하고 큐에 저장함
+EXIT_BLOCKED = 65  # EX_DATAERR: 큐의 거절된(CONFLICT 등) 항목이 같은 대상을 막고 있어 그 뒤에 저장함
+# 잠시 뒤 다시 보내면 되는 서버 응답 (Apps Script 문서 락 대기 초과)
+RETRY_STATUSES = {"LOCK_TIMEOUT"}
+
+
+class OfflineError(RuntimeError):
+    """서버에 닿지 못함 (연결 실패, 타임아웃, 5xx/429). 큐에 넣었다가 나중에 다시 보냅니다."""
+
+
+def is_offline_error(exc: BaseException) -> bool:
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code >= 500 or exc.code == 429
+    return isinstance(exc, (urllib.error.URLError, OSError))
 
 
 def sanitize_scope(value: str) -> str:
@@ -43,6 +74,11 @@ def read_clipboard() -> str:
     return data
 
 
+def idempotency_key(scope: str, team: str, revision: str, text: str) -> str:
+    """같은 본문/대상/기준 리비전이면 같은 키가 됩니다 (오프라인 큐의 중복 판별용)."""
+    return hashlib.sha256("\n".join([scope, team or "", revision or "", text]).encode("utf-8")).hexdigest()
+
+
 def build_post_url(base_url: str, token: str, scope: str, team: str, revision: str) -> str:
     params = {"key": token, "scope": scope}
     if scope == "team":
@@ -61,9 +97,14 @@ def fetch_revision(base_url: str, token: str, scope: str, team: str) -> str:
     if scope == "team":
         params["team"] = team or ""
     url = f"{base_url}?{urllib.parse.urlencode(params)}"
-    with urllib.request.urlopen(url) as resp:
-        body = resp.read().decode("utf-8")
-    import json
+    request = urllib.request.Request(url, headers={"Accept-Encoding": ACCEPT_ENCODING})
+    try:
+        with urllib.request.urlopen(request) as resp:
+            body = read_body(resp).decode("utf-8")
+    except OSError as exc:
+        if is_offline_error(exc):
+            raise OfflineError(f"Revision 조회 실패: {exc}") from exc
+        raise
 
     data = json.loads(body)
     if data.get("error"):
@@ -72,20 +113,219 @@ def fetch_revision(base_url: str, token: str, scope: str, team: str) -> str:
 
 
 def post_handoff(base_url: str, token: str, scope: str, team: str, revision: str, text: str) -> dict:
+    """본문을 Apps Script 웹 앱에 업로드합니다.
+
+    doPost는 `e.postData.contents`를 그대로 문서에 붙이므로 본문은 압축하지 않고 text/plain으로 보냅니다.
+    """
     url = build_post_url(base_url, token, scope, team, revision)
-    data = text.encode("utf-8")
-    request = urllib.request.Request(url, data=data, method="POST")
+    request = urllib.request.Request(url, data=text.encode("utf-8"), method="POST")
     request.add_header("Content-Type", "text/plain; charset=utf-8")
+    request.add_header("Accept-Encoding", ACCEPT_ENCODING)
     try:
         with urllib.request.urlopen(request) as resp:
-            body = resp.read().decode("utf-8")
+            body = read_body(resp).decode("utf-8")
     except urllib.error.HTTPError as exc:
+        if is_offline_error(exc):
+            raise OfflineError(f"POST 실패: HTTP {exc.code}") from exc
         raise RuntimeError(f"POST 실패: HTTP {exc.code}") from exc
-    import json
+    except OSError as exc:
+        raise OfflineError(f"POST 실패: {exc}") from exc
 
     return json.loads(body)
 
 
+# === 오프라인 큐 ===
+
+@contextmanager
+def queue_lock() -> Iterator[None]:
+    """큐 옆의 락 파일(.push_queue.lock)에 배타적 락을 잡습니다.
+
+    rewrite_queue가 큐 파일을 os.replace로 바꾸므로 큐 파일 자체가 아니라 별도 파일을 잠급니다.
+    fcntl이 없는 플랫폼(Windows)에서는 락 없이 실행합니다.
+    """
+    if fcntl is None:
+        yield
+        return
+    QUEUE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(QUEUE_PATH.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def enqueue(scope: str, team: str, revision: Optional[str], text: str) -> bool:
+    """큐 끝에 핸드오프를 추가합니다 (fsync까지). 같은 본문/대상/기준 리비전이 이미 있으면 False.
+
+    revision이 None이면 리비전을 조회하지 못한 것이므로 --flush 때 조회합니다.
+    """
+    key = idempotency_key(scope, team, revision or "", text)
+    entry = {
+        "id": key,
+        "queued_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "scope": scope,
+        "team": team or "",
+        "revision": revision,
+        "text": text,
+    }
+    # 락 안에서 열어야 rewrite_queue가 바꾼 새 파일에 추가합니다 (옛 파일에 쓰면 그 줄은 사라짐).
+    with queue_lock():
+        entries, _ = read_queue()
+        if any(isinstance(item, dict) and item.get("id") == key for item in entries):
+            return False
+        with QUEUE_PATH.open("ab") as queue:
+            queue.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+            queue.flush()
+            os.fsync(queue.fileno())
+    return True
+
+
+def read_queue() -> tuple[list, int]:
+    """(항목 목록, 읽은 바이트 수). 끝의 덜 쓰인 줄은 읽지 않고, 깨진 줄은 원문 문자열로 남겨 둡니다."""
+    try:
+        data = QUEUE_PATH.read_bytes()
+    except FileNotFoundError:
+        return [], 0
+    end = data.rfind(b"\n") + 1
+    entries: list = []
+    for line in data[:end].decode("utf-8", errors="replace").splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            entries.append(line)
+    return entries, end
+
+
+def rewrite_queue(entries: list, offset: int) -> None:
+    """남은 항목으로 큐를 바꿔 씁니다. 읽은 뒤(offset 이후) 다른 프로세스가 추가한 줄은 뒤에 그대로 붙입니다."""
+    lines = [
+        (entry if isinstance(entry, str) else json.dumps(entry, ensure_ascii=False)).encode("utf-8") + b"\n"
+        for entry in entries
+    ]
+    with queue_lock():
+        with QUEUE_PATH.open("rb") as queue:
+            queue.seek(offset)
+            tail = queue.read()
+        if not lines and not tail:
+            QUEUE_PATH.unlink()
+            return
+        temp = QUEUE_PATH.with_suffix(".tmp")
+        with temp.open("wb") as out:
+            out.write(b"".join(lines) + tail)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temp, QUEUE_PATH)
+
+
+def is_rejected(entry) -> bool:
+    """서버가 거절한(CONFLICT 등) 항목. 같은 리비전으로 다시 보내도 또 거절되므로 사용자가 확인해야 합니다."""
+    return isinstance(entry, dict) and entry.get("last_status") not in (None, *RETRY_STATUSES)
+
+
+def held_targets(entries: list) -> set:
+    """거절된 항목에 막힌 대상들 (거절된 항목은 늘 그 대상의 맨 앞 항목입니다)."""
+    return {(entry["scope"], entry.get("team") or "") for entry in entries if is_rejected(entry)}
+
+
+def has_pending() -> bool:
+    """자동 전송할 항목이 있는지 (거절된 항목에 막힌 대상은 빼고)."""
+    entries, _ = read_queue()
+    held = held_targets(entries)
+    return any(
+        isinstance(entry, dict) and (entry["scope"], entry.get("team") or "") not in held for entry in entries
+    )
+
+
+def flush_queue(base_url: str, token: str, force: bool = False, skip_rejected: bool = False) -> dict:
+    """큐를 오래된 순서대로 보냅니다.
+
+    - 같은 대상의 연속 항목은 앞 항목 응답의 새 리비전을 기준으로 이어서 보내므로 리비전 조회는 대상마다 최대 한 번이고,
+      이 큐가 보낸 핸드오프끼리는 충돌로 보지 않습니다.
+    - CONFLICT 등 거절된 항목은 남겨 두고, 순서를 지키기 위해 같은 대상의 뒤 항목도 보내지 않습니다.
+      skip_rejected=True(자동 전송)이면 이미 거절된 항목은 다시 보내지 않고 그 대상을 건너뜁니다 (held).
+      force=True(--no-revision)이면 리비전 확인 없이 보냅니다.
+    - 서버에 닿지 못하면(OfflineError, LOCK_TIMEOUT) 그 자리에서 멈추고 나머지를 모두 남깁니다.
+    """
+    entries, offset = read_queue()
+    summary = {"sent": 0, "remaining": 0, "rejected": 0, "held": 0, "offline": False}
+    if not entries:
+        return summary
+    kept: list = []
+    blocked: set = set()
+    chained: dict = {}  # 대상 → (큐에 기록된 기준 리비전, 직전 전송으로 바뀐 리비전)
+    for entry in entries:
+        if isinstance(entry, str):
+            kept.append(entry)
+            continue
+        target = (entry["scope"], entry.get("team") or "")
+        if summary["offline"] or target in blocked:
+            kept.append(entry)
+            continue
+        if skip_rejected and is_rejected(entry):
+            summary["held"] += 1
+            blocked.add(target)
+            kept.append(entry)
+            continue
+        queued_revision = entry.get("revision")
+        try:
+            if force:
+                revision = ""
+            elif target in chained and chained[target][0] == queued_revision:
+                revision = chained[target][1]
+            elif queued_revision is None:
+                revision = fetch_revision(base_url, token, *target)
+            else:
+                revision = queued_revision
+            result = post_handoff(base_url, token, *target, revision, entry["text"])
+        except OfflineError as exc:
+            summary["offline"] = True
+            kept.append(entry)
+            print(f"[queue] 서버에 연결할 수 없습니다: {exc}", file=sys.stderr)
+            continue
+        except (RuntimeError, ValueError, urllib.error.HTTPError) as exc:
+            result = {"status": "ERROR", "error": str(exc)}
+        status = result.get("status")
+        if status == "OK":
+            summary["sent"] += 1
+            new_revision = result.get("revisionId") or result.get("revision_id")
+            if new_revision:
+                chained[target] = (queued_revision, new_revision)
+            else:
+                chained.pop(target, None)
+            continue
+        kept.append({**entry, "last_status": status, "last_error": result.get("error")})
+        if status in RETRY_STATUSES:
+            summary["offline"] = True
+        else:
+            summary["rejected"] += 1
+            blocked.add(target)
+            print(f"[queue] {target[0]}/{target[1] or '-'} 전송 거절: {status} {result.get('error') or ''}".rstrip(), file=sys.stderr)
+    rewrite_queue(kept, offset)
+    summary["remaining"] = len(kept)
+    return summary
+
+
+def queued_targets() -> set:
+    entries, _ = read_queue()
+    return {(entry["scope"], entry.get("team") or "") for entry in entries if isinstance(entry, dict)}
+
+
+def report_flush(summary: dict) -> int:
+    print(f"[queue] 전송 {summary['sent']}건, 남음 {summary['remaining']}건")
+    if summary["rejected"]:
+        print("⚠️ 거절된 항목이 있습니다. 최신 상태를 확인한 뒤 --flush --no-revision으로 강제 전송하거나 큐 파일에서 지우세요.")
+        return 1
+    if summary["held"]:
+        print(f"[queue] 거절된 항목 {summary['held']}건은 자동으로 다시 보내지 않습니다. 확인 후 --flush로 보내세요.")
+    if summary["remaining"]:
+        return EXIT_QUEUED
+    return 0
+
+
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="클립보드 또는 파일에서 [HANDOFF] 텍스트를 읽어 API로 업로드합니다.",
@@ -95,11 +335,18 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
             예시:
               python push_memory.py --clipboard
               python push_memory.py --file handoff.txt --scope team --team alpha
+              python push_memory.py --flush   # 오프라인 큐에 쌓인 핸드오프 보내기
             """
         ),
     )
     parser.add_argument("--clipboard", action="store_true", help="클립보드에서 텍스트 읽기")
     parser.add_argument("--file", type=str, help="업로드할 파일 경로")
+    parser.add_argument("--flush", action="store_true", help="오프라인 큐에 쌓인 핸드오프를 순서대로 보냅니다")
+    parser.add_argument(
+        "--skip-rejected",
+        action="store_true",
+        help="--flush에서 거절된(CONFLICT 등) 항목과 그 대상은 다시 보내지 않습니다 (워처의 자동 전송)",
+    )
     parser.add_argument("--scope", type=str, default=os.getenv("SCOPE", DEFAULT_SCOPE), help="personal | team")
     parser.add_argument("--team", type=str, default=os.getenv("TEAM_KEY", ""))  # 팀 스코프에서 사용
     parser.add_argument("--no-revision", action="store_true", help="사전 리비전 조회를 건너뜁니다 (충돌 가능성 주의)")
@@ -163,6 +410,14 @@ def ensure_team_key(scope: str, team_key: str) -> str:
     return team_key
 
 
+def queue_handoff(scope: str, team: str, revision: Optional[str], text: str) -> int:
+    if enqueue(scope, team, revision, text):
+        print(f"📥 서버에 보내지 못해 오프라인 큐에 저장했습니다 ({QUEUE_PATH}). 연결되면 --flush로 보냅니다.")
+    else:
+        print("📥 같은 핸드오프가 이미 오프라인 큐에 있습니다.")
+    return EXIT_QUEUED
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     load_dotenv()
     args = parse_args(argv)
@@ -174,6 +429,9 @@ def main(argv: Optional[list[str]] = None) -> int:
         print(f"오류: {exc}", file=sys.stderr)
         return 1
 
+    if args.flush:
+        return report_flush(flush_queue(base_url, token, force=args.no_revision, skip_rejected=args.skip_rejected))
+
     scope = sanitize_scope(args.scope)
     team_key = ensure_team_key(scope, (args.team or "").strip())
 
@@ -185,12 +443,38 @@ def main(argv: Optional[list[str]] = None) -> int:
         print("오류: --clipboard 또는 --file 중 하나를 지정하세요.", file=sys.stderr)
         return 1
 
+    # 큐에 먼저 들어온 핸드오프가 있으면 그것부터 보내고, 같은 대상이 아직 밀려 있으면 순서를 지켜 뒤에 줄 세웁니다.
+    # 거절된 항목은 다시 보내도 또 거절되므로 자동으로는 보내지 않습니다 (--flush로만).
+    if QUEUE_PATH.exists():
+        report_flush(flush_queue(base_url, token, skip_rejected=True))
+    entries, _ = read_queue()
+    if (scope, team_key) in held_targets(entries):
+        enqueue(scope, team_key, None if not args.no_revision else "", text)
+        print(
+            f"⛔ {scope}/{team_key or '-'} 대상은 큐의 거절된(CONFLICT 등) 핸드오프에 막혀 있어 그 뒤에 저장했습니다 ({QUEUE_PATH}).\n"
+            "   최신 문서를 확인한 뒤 --flush(강제: --flush --no-revision)로 보내거나 큐 파일에서 해당 줄을 지우세요.",
+            file=sys.stderr,
+        )
+        return EXIT_BLOCKED
+    if (scope, team_key) in queued_targets():
+        return queue_handoff(scope, team_key, None if not args.no_revision else "", text)
+
     revision = ""
     if not args.no_revision:
-        revision = fetch_revision(base_url, token, scope, team_key)
+        try:
+            revision = fetch_revision(base_url, token, scope, team_key)
+        except OfflineError as exc:
+            print(f"⚠️ {exc}", file=sys.stderr)
+            return queue_handoff(scope, team_key, None, text)
         if not revision:
             print("⚠️ 리비전 정보를 가져오지 못했습니다. --no-revision 옵션으로 강제 전송 가능.", file=sys.stderr)
-    result = post_handoff(base_url, token, scope, team_key, revision, text)
+    try:
+        result = post_handoff(base_url, token, scope, team_key, revision, text)
+    except OfflineError as exc:
+        print(f"⚠️ {exc}", file=sys.stderr)
+        return queue_handoff(scope, team_key, revision, text)
+    if result.get("status") in RETRY_STATUSES:
+        return queue_handoff(scope, team_key, revision, text)
     status = result.get("status")
     print(f"서버 응답: {status}")
     if result.get("error"):
@@ -0,0 +1,13 @@
+"""클라이언트 테스트가 함께 쓰는 가짜 urlopen 응답."""
+
+import json
+from unittest import mock
+
+
+def fake_response(body, encoding: str = ""):
+    """`with urlopen(...) as resp:`로 쓸 수 있는 응답. bytes가 아니면 JSON으로 직렬화합니다."""
+    response = mock.MagicMock()
+    response.read.return_value = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    response.headers = {"Content-Encoding": encoding} if encoding else {}
+    response.__enter__.return_value = response
+    return response
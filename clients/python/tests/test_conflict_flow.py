@@ -1,8 +1,9 @@
-import json
 import unittest
 from unittest import mock
 
 from clients.python import fetch_memory as fm
+from clients.python import push_memory as pm
+from clients.python.tests.fakes import fake_response
 
 
 class SyncFlowTests(unittest.TestCase):
@@ -17,28 +18,34 @@ class SyncFlowTests(unittest.TestCase):
     @mock.patch("clients.python.fetch_memory.urllib.request.urlopen")
     def test_request_handoff_json_success(self, mock_urlopen):
         payload = {"demo": "ok"}
-        fake_response = mock.MagicMock()
-        fake_response.read.return_value = json.dumps(payload).encode("utf-8")
-        fake_response.__enter__.return_value = fake_response
-        mock_urlopen.return_value = fake_response
+        mock_urlopen.return_value = fake_response(payload)
 
         data = fm.request_handoff_json("https://example.com/api", "token", "team", "alpha", "bug")
         self.assertEqual(data, payload)
-        called_url = mock_urlopen.call_args[0][0]
+        request = mock_urlopen.call_args[0][0]
+        called_url = request.full_url
+        self.assertIn("gzip", request.get_header("Accept-encoding"))
         self.assertIn("scope=team", called_url)
         self.assertIn("team=alpha", called_url)
         self.assertIn("category=bug", called_url)
 
     @mock.patch("clients.python.fetch_memory.urllib.request.urlopen")
     def test_request_handoff_json_invalid_payload(self, mock_urlopen):
-        fake_response = mock.MagicMock()
-        fake_response.read.return_value = b"<html>"
-        fake_response.__enter__.return_value = fake_response
-        mock_urlopen.return_value = fake_response
+        mock_urlopen.return_value = fake_response(b"<html>")
 
         with self.assertRaises(RuntimeError):
             fm.request_handoff_json("https://example.com", "token", "personal", "", "")
 
+    @mock.patch("clients.python.push_memory.urllib.request.urlopen")
+    def test_handoff_post_sends_no_idempotency_key(self, mock_urlopen):
+        # Apps Script 웹 앱은 키를 읽지 않으므로 중복 제거를 약속하는 헤더를 보내지 않습니다.
+        mock_urlopen.return_value = fake_response({"status": "OK"})
+
+        pm.post_handoff("https://example.com/api", "token", "personal", "", "rev-1", "본문")
+        request = mock_urlopen.call_args[0][0]
+        self.assertIsNone(request.get_header("Idempotency-key"))
+        self.assertIn("revision=rev-1", request.full_url)
+
     def test_sanitize_scope_defaults(self):
         self.assertEqual(fm.sanitize_scope("TEAM"), "team")
         self.assertEqual(fm.sanitize_scope("unknown"), "personal")
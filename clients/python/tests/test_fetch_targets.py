@@ -0,0 +1,112 @@
+import http.client
+import json
+import pathlib
+import tempfile
+import threading
+import time
+import unittest
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from clients.python import fetch_memory as fm
+
+DELAY = {"personal": 0.3, "alpha": 0.3, "beta": 0.3}
+
+
+class FakeWebApp(BaseHTTPRequestHandler):
+    """Apps Script처럼 /exec → /echo 로 리다이렉트한 뒤 대상별로 늦게 응답합니다."""
+
+    protocol_version = "HTTP/1.1"
+    revisions = {}
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path == "/exec":
+            self.send_response(302)
+            self.send_header("Location", f"/echo?{parts.query}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        key = query.get("team") or query["scope"]
+        time.sleep(DELAY[key])
+        body = json.dumps({"revision_id": self.revisions[key], "scope": query["scope"], "TL;DR": key}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchTargetsTests(unittest.TestCase):
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWebApp)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_port}/exec"
+        FakeWebApp.revisions = {"personal": "rev-p1", "alpha": "rev-a1", "beta": "rev-b1"}
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out = pathlib.Path(tmp.name)
+        for patcher in (
+            mock.patch.object(fm, "OUTPUT_DIR", self.out / "examples"),
+            mock.patch.object(fm, "TARGET_CACHE_PATH", self.out / ".revision_cache.json"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_parse_targets(self):
+        self.assertEqual(
+            fm.parse_targets("personal, team:alpha,team:beta:BUG,team:alpha"),
+            [("personal", "", ""), ("team", "alpha", ""), ("team", "beta", "BUG")],
+        )
+        with self.assertRaises(ValueError):
+            fm.parse_targets("teams:alpha")
+
+    def test_fetches_concurrently_and_skips_unchanged_targets(self):
+        targets = fm.parse_targets("personal,team:alpha,team:beta:BUG")
+        started = time.perf_counter()
+        with mock.patch("builtins.print"):
+            self.assertEqual(fm.refresh_targets(self.url, "token", targets), 0)
+        # 순차라면 0.9초 이상, 동시라면 가장 느린 대상 하나(0.3초)에 가깝습니다.
+        self.assertLess(time.perf_counter() - started, 0.75)
+        self.assertEqual(len(list((self.out / "examples").iterdir())), 3)
+        cache = json.loads((self.out / ".revision_cache.json").read_text(encoding="utf-8"))
+        self.assertEqual(cache, {"personal": "rev-p1", "team:alpha": "rev-a1", "team:beta:BUG": "rev-b1"})
+
+        FakeWebApp.revisions["alpha"] = "rev-a2"
+        with mock.patch.object(fm, "OUTPUT_DIR", self.out / "second"), mock.patch("builtins.print"):
+            fm.refresh_targets(self.url, "token", targets)
+        written = [path.name for path in (self.out / "second").iterdir()]
+        self.assertEqual(len(written), 1)
+        self.assertTrue(written[0].endswith("_team_alpha.md"))
+
+    def test_pool_reuses_connections(self):
+        pool = fm.KeepAlivePool()
+        self.addCleanup(pool.close)
+        for _ in range(3):
+            fm.request_handoff_json(self.url, "token", "personal", "", "", pool=pool)
+        self.assertEqual(pool.connections_opened, 1)
+
+    def test_failed_retry_closes_fresh_connection(self):
+        pool = fm.KeepAlivePool()
+        stale, fresh = mock.MagicMock(), mock.MagicMock()
+        stale.getresponse.side_effect = http.client.RemoteDisconnected("idle connection closed")
+        fresh.request.side_effect = ConnectionRefusedError("server down")
+        pool._idle[("http", "example.com", None)] = [stale]
+        with mock.patch.object(fm.http.client, "HTTPConnection", return_value=fresh):
+            with self.assertRaises(ConnectionRefusedError):
+                pool.get("http://example.com/exec", {})
+        stale.close.assert_called_once()
+        fresh.close.assert_called_once()
+        self.assertEqual(pool._idle, {("http", "example.com", None): []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import gzip
+import json
+import unittest
+from unittest import mock
+
+from clients.python import fetch_memory as fm
+from clients.python import push_memory as pm
+from clients.python.tests.fakes import fake_response
+
+HANDOFF = "[HANDOFF]\n## 진행 상황\n- 배포 스크립트 정리\n" * 100
+
+
+class CompressionTests(unittest.TestCase):
+    @mock.patch("clients.python.fetch_memory.urllib.request.urlopen")
+    def test_fetch_decodes_gzip_responses(self, mock_urlopen):
+        payload = {"revision_id": "rev-1", "content": HANDOFF}
+        mock_urlopen.return_value = fake_response(gzip.compress(json.dumps(payload).encode("utf-8")), "gzip")
+
+        self.assertEqual(fm.request_handoff_json("https://example.com/api", "token", "personal", "", ""), payload)
+
+    @mock.patch("clients.python.push_memory.urllib.request.urlopen")
+    def test_apps_script_push_is_never_content_encoded(self, mock_urlopen):
+        # doPost는 e.postData.contents를 그대로 문서에 붙이므로 압축 본문을 보내면 안 됩니다.
+        mock_urlopen.return_value = fake_response(b'{"status": "OK"}')
+
+        for text in (HANDOFF, "짧은 본문"):
+            pm.post_handoff("https://example.com/api", "token", "personal", "", "rev-1", text)
+            request = mock_urlopen.call_args[0][0]
+            self.assertIsNone(request.get_header("Content-encoding"))
+            self.assertEqual(request.data, text.encode("utf-8"))
+        self.assertFalse(hasattr(pm.parse_args([]), "compress"))
+
+
+if __name__ == "__main__":
+    unittest.main()
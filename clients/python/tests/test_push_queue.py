@@ -0,0 +1,114 @@
+import os
+import pathlib
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.parse
+from unittest import mock
+
+from clients.python import push_memory as pm
+from clients.python.tests.fakes import fake_response
+
+
+class OfflineQueueTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+        for patcher in (
+            mock.patch.object(pm, "QUEUE_PATH", self.dir / ".push_queue.jsonl"),
+            mock.patch.object(pm, "load_dotenv", lambda: False),
+            mock.patch.dict(os.environ, {"WEBAPP_URL": "https://example.com/exec", "API_TOKEN": "token"}),
+            mock.patch("builtins.print"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def push(self, text, *args):
+        path = self.dir / "handoff.txt"
+        path.write_text(text, encoding="utf-8")
+        return pm.main(["--file", str(path), *args])
+
+    @mock.patch("clients.python.push_memory.urllib.request.urlopen")
+    def test_offline_push_is_queued_once_and_keeps_order(self, mock_urlopen):
+        mock_urlopen.side_effect = urllib.error.URLError("network is unreachable")
+        self.assertEqual(self.push("[HANDOFF] 첫 번째"), pm.EXIT_QUEUED)
+        self.assertEqual(self.push("[HANDOFF] 첫 번째"), pm.EXIT_QUEUED)
+
+        # 연결이 돌아와도 같은 대상이 큐에 밀려 있으면 새 핸드오프는 그 뒤에 섭니다.
+        mock_urlopen.side_effect = [urllib.error.URLError("timed out")]
+        self.assertEqual(self.push("[HANDOFF] 두 번째", "--scope", "personal"), pm.EXIT_QUEUED)
+        entries, _ = pm.read_queue()
+        self.assertEqual([entry["text"] for entry in entries], ["[HANDOFF] 첫 번째", "[HANDOFF] 두 번째"])
+        self.assertIsNone(entries[0]["revision"])
+
+    @mock.patch("clients.python.push_memory.urllib.request.urlopen")
+    def test_flush_chains_revisions_and_holds_conflicting_target(self, mock_urlopen):
+        pm.enqueue("personal", "", "rev-1", "[HANDOFF] a")
+        pm.enqueue("team", "alpha", "rev-old", "[HANDOFF] 팀")
+        pm.enqueue("personal", "", "rev-1", "[HANDOFF] b")
+        pm.enqueue("team", "alpha", "rev-old", "[HANDOFF] 팀 2")
+        posted = []
+
+        def respond(request):
+            params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.full_url).query))
+            posted.append((params.get("team"), params.get("revision")))
+            if params.get("team") == "alpha":
+                return fake_response({"status": "CONFLICT", "revisionId": "rev-new"})
+            return fake_response({"status": "OK", "revisionId": f"rev-{len(posted) + 1}"})
+
+        mock_urlopen.side_effect = respond
+        self.assertEqual(pm.main(["--flush"]), 1)
+        # 같은 대상의 두 번째 항목은 첫 전송이 만든 리비전으로 보내고, 충돌한 팀 항목 뒤는 보내지 않습니다.
+        self.assertEqual(posted, [(None, "rev-1"), ("alpha", "rev-old"), (None, "rev-2")])
+        entries, _ = pm.read_queue()
+        self.assertEqual([(entry["text"], entry.get("last_status")) for entry in entries],
+                         [("[HANDOFF] 팀", "CONFLICT"), ("[HANDOFF] 팀 2", None)])
+
+    @mock.patch("clients.python.push_memory.urllib.request.urlopen")
+    def test_conflicting_entry_is_retried_only_on_explicit_flush(self, mock_urlopen):
+        pm.enqueue("personal", "", "rev-old", "[HANDOFF] 오래된 것")
+        pm.enqueue("team", "alpha", "rev-a", "[HANDOFF] 팀")
+        posted = []
+
+        def respond(request):
+            params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.full_url).query))
+            if params.get("mode") == "json":
+                return fake_response({"revision_id": "rev-new"})
+            posted.append((params.get("team"), params.get("revision")))
+            if params.get("revision") == "rev-old":
+                return fake_response({"status": "CONFLICT", "revisionId": "rev-new"})
+            return fake_response({"status": "OK", "revisionId": f"rev-{len(posted) + 1}"})
+
+        mock_urlopen.side_effect = respond
+        self.assertEqual(self.push("[HANDOFF] 새 것 1"), pm.EXIT_BLOCKED)
+        self.assertEqual(self.push("[HANDOFF] 새 것 2"), pm.EXIT_BLOCKED)
+        # 자동 전송은 거절된 항목을 한 번만 보내고, 다른 대상의 항목은 그대로 보냅니다.
+        self.assertEqual(posted, [(None, "rev-old"), ("alpha", "rev-a")])
+        self.assertFalse(pm.has_pending())
+        entries, _ = pm.read_queue()
+        self.assertEqual([entry["text"] for entry in entries], ["[HANDOFF] 오래된 것", "[HANDOFF] 새 것 1", "[HANDOFF] 새 것 2"])
+
+        posted.clear()
+        self.assertEqual(pm.main(["--flush", "--no-revision"]), 0)
+        self.assertEqual(posted, [(None, None), (None, None), (None, None)])
+        self.assertEqual(pm.read_queue(), ([], 0))
+
+    @unittest.skipIf(pm.fcntl is None, "fcntl이 없는 플랫폼")
+    def test_append_waits_for_rewrite_and_lands_in_new_file(self):
+        pm.enqueue("personal", "", "rev-1", "[HANDOFF] a")
+        entries, offset = pm.read_queue()
+        appender = threading.Thread(target=pm.enqueue, args=("personal", "", "rev-1", "[HANDOFF] b"))
+        with pm.queue_lock():  # 다른 프로세스의 rewrite_queue가 꼬리를 읽고 파일을 바꾸는 중
+            appender.start()
+            appender.join(0.2)
+            self.assertTrue(appender.is_alive())
+            self.assertEqual(pm.read_queue()[0], entries)
+        appender.join()
+        pm.rewrite_queue([], offset)
+        self.assertEqual([entry["text"] for entry in pm.read_queue()[0]], ["[HANDOFF] b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
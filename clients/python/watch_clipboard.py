@@ -20,6 +20,7 @@ except ImportError as exc:  # pragma: no cover
 
 
 DEFAULT_MARKER = "[HANDOFF]"
+DEFAULT_FLUSH_INTERVAL = 30.0
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -35,6 +36,12 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--scope", type=str, help="push_memory에 전달할 scope (personal/team)")
     parser.add_argument("--team", type=str, help="팀 스코프에서 사용할 팀 키")
     parser.add_argument("--no-revision", action="store_true", help="push_memory에 --no-revision 전달")
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help=f"오프라인 큐가 남아 있으면 이 주기(초)마다 push_memory --flush 실행 (기본: {DEFAULT_FLUSH_INTERVAL:g}, 0이면 끔)",
+    )
     parser.add_argument(
         "--once",
         action="store_true",
@@ -84,8 +91,18 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print("[watcher] once 모드: 업로드 1회 후 종료합니다.")
 
     uploads = 0
+    last_flush = time.monotonic()
     try:
         while True:
+            if (
+                args.flush_interval > 0
+                and time.monotonic() - last_flush >= args.flush_interval
+                and push_memory.has_pending()
+            ):
+                last_flush = time.monotonic()
+                print("[watcher] 오프라인 큐 전송 시도...")
+                push_memory.main(["--flush", "--skip-rejected"])
+
             try:
                 current = read_clipboard_text()
             except RuntimeError as exc:
@@ -97,12 +114,22 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             if digest and digest != last_hash and matches_marker(current, args.marker):
                 print("[watcher] 트리거 감지. push_memory 실행 중...")
                 code = push_memory.main(push_args)
+                last_flush = time.monotonic()  # push_memory가 보내기 전에 큐도 비웁니다.
                 if code == 0:
                     uploads += 1
                     last_hash = digest
                     print(f"[watcher] 업로드 완료({uploads}회).")
                     if args.once:
                         break
+                elif code == push_memory.EXIT_QUEUED:
+                    last_hash = digest
+                    print("[watcher] 오프라인 큐에 저장했습니다. 연결되면 자동으로 보냅니다.")
+                elif code == push_memory.EXIT_BLOCKED:
+                    last_hash = digest
+                    print(
+                        "[watcher] 충돌로 거절된 큐 항목에 막혀 있습니다. 자동으로 보내지 않으니 확인 후 push_memory.py --flush를 실행하세요.",
+                        file=sys.stderr,
+                    )
                 else:
                     print("[watcher] push_memory 실패. 재시도하려면 텍스트를 다시 복사하세요.", file=sys.stderr)
             time.sleep(args.interval)